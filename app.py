@@ -6,6 +6,7 @@ Version: 1.0
 # Import necessary modules
 import sys
 from models.data import Datas
+from controllers.appService import AppService
 from views.mainView import MainWindow
 
 db_name = "db_gestionnaire_password.db"
@@ -33,7 +34,8 @@ def main()->None:
     """
     try:
         data_base = Datas(db_name)
-        MainWindow("Easy Password", data_base)
+        with AppService(data_base) as service:
+            MainWindow("Easy Password", service)
     except FileNotFoundError as e:
         print(f"An error occurred while creating the database file: {e}", file=sys.stderr)
         raise
@@ -43,6 +45,10 @@ def main()->None:
 
 # Main entry point of the script
 if __name__ == '__main__':
+    if getattr(sys, "frozen", False):
+        # The processes parsing large CSV files re-run the executable on Windows
+        import multiprocessing
+        multiprocessing.freeze_support()
     try:
         main()
     except Exception as e:
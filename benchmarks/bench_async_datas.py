@@ -0,0 +1,87 @@
+"""
+__author__ = "Adrien Mertens"
+__version__ = "1.0"
+
+Measures how the read throughput of AsyncDatas scales with the number of concurrent
+readers on a file-backed vault, with and without a writer running at the same time.
+Reads only overlap when SQLite runs on several cores, so the number of CPUs is printed.
+
+Usage (from the root of the project):
+    python -m benchmarks.bench_async_datas --entries 5000 --reads 2000
+"""
+import argparse
+import asyncio
+import os
+import random
+import tempfile
+import time
+
+from models.asyncDatas import AsyncDatas
+from models.data import Data, Datas
+
+CONCURRENCY = [1, 2, 4, 8, 16]
+
+
+async def read_throughput(path: str, readers: int, reads: int, entries: int, with_writer: bool) -> float:
+    """
+    Runs `reads` lookups and as many searches, split between `readers` concurrent
+    tasks, and returns the number of reads per second. Searches are the slowest reads
+    of the data layer, so they show best whether reads overlap.
+
+    :param path: The path of the vault.
+    :param readers: The number of concurrent readers.
+    :param reads: The total number of reads.
+    :param entries: The number of entries in the vault.
+    :param with_writer: Whether a task keeps adding entries meanwhile.
+    :return: The throughput in reads per second.
+    """
+    datas = Datas(path_db=path, pool_size=readers + 1)
+    rng = random.Random(readers)
+    queries = [f"entry {rng.randrange(entries)}" for _ in range(reads)]
+    stop = asyncio.Event()
+    async with AsyncDatas(datas, max_readers=readers) as async_datas:
+        async def reader(share):
+            for query in share:
+                await async_datas.get_one_data_in_db(rng.randrange(1, entries + 1))
+                await async_datas.search(query, limit=20)
+
+        async def writer():
+            index = 0
+            while not stop.is_set():
+                await async_datas.register_data(Data(name=f"new {readers}-{index}", username="u", password="p",
+                                                     source="bench"))
+                index += 1
+
+        writing = asyncio.create_task(writer()) if with_writer else None
+        start = time.perf_counter()
+        await asyncio.gather(*(reader(queries[i::readers]) for i in range(readers)))
+        elapsed = time.perf_counter() - start
+        stop.set()
+        if writing is not None:
+            await writing
+    datas.close()
+    return 2 * reads / elapsed
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--entries", type=int, default=5000, help="number of entries in the vault")
+    parser.add_argument("--reads", type=int, default=2000, help="number of reads per measure")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, "bench.db")
+        with Datas(path_db=path) as datas:
+            datas.register_many(Data(name=f"entry {i}", username="user", password="password", source=f"site{i % 50}.com")
+                                for i in range(args.entries))
+
+        print(f"cpus: {os.cpu_count()}")
+        print(f"{'readers':>8}{'reads only':>16}{'with a writer':>18}")
+        for readers in CONCURRENCY:
+            alone = asyncio.run(read_throughput(path, readers, args.reads, args.entries, False))
+            mixed = asyncio.run(read_throughput(path, readers, args.reads, args.entries, True))
+            print(f"{readers:>8}{alone:>14.0f}/s{mixed:>16.0f}/s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,74 @@
+"""
+__author__ = "Adrien Mertens"
+__version__ = "1.0"
+
+Compares the throughput of the data layer with and without the connection pool
+on a file-backed vault.
+
+Usage (from the root of the project):
+    python -m benchmarks.bench_connection_pool --entries 2000
+"""
+import argparse
+import os
+import tempfile
+import time
+from typing import Callable, Dict
+
+from models.data import Data, Datas
+
+
+def measure(operation: Callable[[int], object], count: int) -> float:
+    """
+    Runs `operation` `count` times and returns the number of operations per second.
+
+    :param operation: The callable to benchmark, called with the iteration index.
+    :param count: The number of iterations.
+    :return: The measured throughput in operations per second.
+    """
+    start = time.perf_counter()
+    for index in range(count):
+        operation(index)
+    elapsed = time.perf_counter() - start
+    return count / elapsed if elapsed else float("inf")
+
+
+def run(pool_size: int, entries: int) -> Dict[str, float]:
+    """
+    Measures add/modify/get/remove throughput on a fresh file-backed vault.
+
+    :param pool_size: The pool size given to `Datas` (0 means connect per call).
+    :param entries: The number of entries used for each operation.
+    :return: A mapping of operation name to operations per second.
+    """
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, "bench.db")
+        with Datas(path_db=path, pool_size=pool_size) as datas:
+            results = {
+                "add": measure(lambda i: datas.register_data(
+                    Data(name=f"entry-{i}", username="user", password="password", source="bench")), entries),
+            }
+            ids = [data.id for data in datas.get_all_Data_in_db()]
+            results["modify"] = measure(lambda i: datas.modify_data(
+                ids[i], Data(name=f"entry-{i}-bis", username="user", password="secret", source="bench")), entries)
+            results["get"] = measure(lambda i: datas.get_one_data_in_db(ids[i]), entries)
+            results["remove"] = measure(lambda i: datas.remove_data(ids[i]), entries)
+    return results
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--entries", type=int, default=1000, help="number of entries per operation")
+    parser.add_argument("--pool-size", type=int, default=5, help="pool size of the pooled run")
+    args = parser.parse_args()
+
+    before = run(pool_size=0, entries=args.entries)
+    after = run(pool_size=args.pool_size, entries=args.entries)
+
+    print(f"{'operation':<10}{'connect/call':>16}{'pooled':>16}{'speedup':>10}")
+    for operation in before:
+        print(f"{operation:<10}{before[operation]:>14.0f}/s{after[operation]:>14.0f}/s"
+              f"{after[operation] / before[operation]:>9.1f}x")
+
+
+if __name__ == "__main__":
+    main()
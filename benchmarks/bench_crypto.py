@@ -0,0 +1,98 @@
+"""
+__author__ = "Adrien Mertens"
+__version__ = "1.0"
+
+Measures the cost of encryption at rest: unlock latency for several key derivation
+parameters, and per-row decryption throughput, alone and through the data layer.
+Reading entries from an encrypted vault decrypts nothing until a password is revealed.
+
+Usage (from the root of the project):
+    python -m benchmarks.bench_crypto --entries 10000
+"""
+import argparse
+import os
+import tempfile
+import time
+
+from models.crypto import Cipher, KdfParams, SALT_SIZE, reveal
+from models.data import Data, Datas
+
+KDF_GRID = [KdfParams(n=2 ** 14), KdfParams(n=2 ** 15), KdfParams(n=2 ** 16), KdfParams(n=2 ** 17),
+            KdfParams(n=2 ** 15, p=2)]
+
+
+def unlock_latency(params: KdfParams, repeat: int = 3) -> float:
+    """
+    Measures the best time, in milliseconds, to derive the key and build the cipher.
+
+    :param params: The key derivation parameters.
+    :param repeat: The number of measures.
+    :return: The best latency in milliseconds.
+    """
+    salt = os.urandom(SALT_SIZE)
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        Cipher.from_master_password("correct horse battery staple", salt, params)
+        best = min(best, time.perf_counter() - start)
+    return best * 1000
+
+
+def decrypt_throughput(count: int) -> float:
+    """
+    Measures the number of password fields decrypted per second by the cipher alone.
+
+    :param count: The number of fields.
+    :return: The throughput in fields per second.
+    """
+    cipher = Cipher(os.urandom(32))
+    tokens = [cipher.encrypt(f"password-{i}", b"password") for i in range(count)]
+    start = time.perf_counter()
+    for token in tokens:
+        cipher.decrypt(token, b"password")
+    return count / (time.perf_counter() - start)
+
+
+def read_throughput(count: int, encrypted: bool, reveal_passwords: bool = False) -> float:
+    """
+    Measures the number of full entries read per second by `get_all_Data_in_db` on a
+    file-backed vault, with or without encryption.
+
+    :param count: The number of entries in the vault.
+    :param encrypted: Whether the vault has a master password.
+    :param reveal_passwords: Whether every password is also revealed.
+    :return: The throughput in entries per second.
+    """
+    with tempfile.TemporaryDirectory() as directory:
+        with Datas(path_db=os.path.join(directory, "bench.db")) as datas:
+            if encrypted:
+                datas.set_master_password("master", KdfParams(n=2 ** 14))
+            datas.register_many(Data(name=f"entry-{i}", username="user", password=f"password-{i}", source="bench")
+                                for i in range(count))
+            start = time.perf_counter()
+            for data in datas.get_all_Data_in_db():
+                if reveal_passwords:
+                    reveal(data.password)
+            return count / (time.perf_counter() - start)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--entries", type=int, default=10000, help="number of entries for throughput measures")
+    args = parser.parse_args()
+
+    print(f"{'n':>8}{'r':>4}{'p':>4}{'memory':>10}{'unlock':>12}")
+    for params in KDF_GRID:
+        memory = 128 * params.n * params.r / 2 ** 20
+        print(f"{params.n:>8}{params.r:>4}{params.p:>4}{memory:>7.0f} MiB{unlock_latency(params):>9.1f} ms")
+
+    print(f"\ndecrypt (cipher only): {decrypt_throughput(args.entries):,.0f} fields/s")
+    plain, encrypted = read_throughput(args.entries, False), read_throughput(args.entries, True)
+    print(f"get_all_Data_in_db plain text: {plain:,.0f} entries/s")
+    revealed = read_throughput(args.entries, True, reveal_passwords=True)
+    print(f"get_all_Data_in_db encrypted:  {encrypted:,.0f} entries/s")
+    print(f"get_all_Data_in_db + reveal:   {revealed:,.0f} entries/s")
+
+
+if __name__ == "__main__":
+    main()
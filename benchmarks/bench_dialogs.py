@@ -0,0 +1,88 @@
+"""
+__author__ = "Adrien Mertens"
+__version__ = "1.0"
+
+Measures the latency of opening the add, change and show windows: building the window
+on every click, as the menu did before, against showing again the window built on
+first use. Each open is timed until Tk has laid out the window. The cost of defining
+the named styles, which every window used to repeat, is measured apart. Needs a display.
+
+Usage (from the root of the project):
+    python -m benchmarks.bench_dialogs --opens 50
+"""
+import argparse
+import statistics
+import sys
+import time
+import tkinter
+from types import SimpleNamespace
+from typing import Callable, List
+
+import ttkbootstrap as ttk
+
+from controllers.controllersDatas import ControllersDatas
+from models.data import Data, Datas
+from views.addDataView import AddDataView
+from views.changeDataView import ChangeDataView
+from views.showDataView import ShowDataView
+from views.styles import configure_styles
+
+
+def timed_opens(window: ttk.Window, open_dialog: Callable[[], object], close_dialog: Callable[[object], None],
+                opens: int) -> List[float]:
+    """
+    Opens and closes a window `opens` times.
+
+    :param window: The main window.
+    :param open_dialog: Opens the window and returns it.
+    :param close_dialog: Closes the window returned by `open_dialog`.
+    :param opens: The number of opens.
+    :return: The time of each open, in milliseconds, until the window is laid out.
+    """
+    durations = []
+    for _ in range(opens):
+        start = time.perf_counter()
+        dialog = open_dialog()
+        window.update_idletasks()
+        durations.append((time.perf_counter() - start) * 1000)
+        close_dialog(dialog)
+        window.update()
+    return durations
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--opens", type=int, default=50, help="number of opens of each window")
+    args = parser.parse_args()
+
+    try:
+        window = ttk.Window(themename="superhero")
+    except tkinter.TclError as e:
+        print(f"No display available: {e}", file=sys.stderr)
+        sys.exit(1)
+
+    with Datas() as datas:
+        controller = ControllersDatas(datas)
+        datas.register_data(Data(name="gmail", username="jdoe", password="secret", source="google.com"))
+        board = SimpleNamespace(board=SimpleNamespace(selection=lambda: ("1",)))
+        dialogs = {
+            "add": (AddDataView, {"controller": controller, "board": board}),
+            "change": (ChangeDataView, {"data_id": 1, "board": board, "controller": controller}),
+            "show": (ShowDataView, {"board": board, "controller": controller}),
+        }
+
+        style = ttk.Style()
+        styles = timed_opens(window, lambda: configure_styles(style), lambda _: None, args.opens)
+        print(f"{'styles defined':<16}{statistics.median(styles):>10.2f} ms")
+        print(f"{'window':<16}{'rebuilt ms':>10}{'reused ms':>11}{'speed-up':>10}")
+        for name, (view, kwargs) in dialogs.items():
+            rebuilt = timed_opens(window, lambda: view(window, **kwargs), lambda dialog: dialog.destroy(), args.opens)
+            reused = timed_opens(window, lambda: view.open(window, **kwargs), lambda dialog: dialog.close(),
+                                 args.opens)
+            rebuilt_ms, reused_ms = statistics.median(rebuilt), statistics.median(reused)
+            print(f"{name:<16}{rebuilt_ms:>10.2f}{reused_ms:>11.2f}{rebuilt_ms / reused_ms:>9.1f}x")
+    window.destroy()
+
+
+if __name__ == "__main__":
+    main()
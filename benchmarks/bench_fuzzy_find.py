@@ -0,0 +1,69 @@
+"""
+__author__ = "Adrien Mertens"
+__version__ = "1.0"
+
+Measures the build time of the trigram index and the latency of typo-tolerant
+queries on a synthetic vault of random names.
+
+Usage (from the root of the project):
+    python -m benchmarks.bench_fuzzy_find --entries 1000000
+"""
+import argparse
+import random
+import statistics
+import string
+import time
+
+from models.trigramIndex import TrigramIndex
+
+SOURCES = ["google.com", "github.com", "outlook.com", "belfius.be", "amazon.fr", "netflix.com"]
+
+
+def synthetic_entries(count: int, seed: int = 42):
+    """
+    Generates `(id, name, source)` entries with random names of 6 to 12 letters.
+
+    :param count: The number of entries.
+    :param seed: The seed of the random generator, for reproducible vaults.
+    :return: A generator of entries.
+    """
+    rng = random.Random(seed)
+    for data_id in range(1, count + 1):
+        name = "".join(rng.choice(string.ascii_lowercase) for _ in range(rng.randint(6, 12)))
+        yield data_id, name, rng.choice(SOURCES)
+
+
+def misspell(name: str, rng: random.Random) -> str:
+    """Swaps two neighbouring letters of `name`, like a typing mistake."""
+    position = rng.randrange(len(name) - 1)
+    return name[:position] + name[position + 1] + name[position] + name[position + 2:]
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--entries", type=int, default=1_000_000, help="number of names in the vault")
+    parser.add_argument("--queries", type=int, default=200, help="number of misspelt queries")
+    args = parser.parse_args()
+
+    entries = list(synthetic_entries(args.entries))
+    index = TrigramIndex()
+    start = time.perf_counter()
+    index.add_many(entries)
+    print(f"build: {time.perf_counter() - start:.2f} s for {len(index)} entries")
+
+    rng = random.Random(7)
+    latencies, found = [], 0
+    for data_id, name, _ in rng.sample(entries, args.queries):
+        start = time.perf_counter()
+        results = index.search(misspell(name, rng), limit=10)
+        latencies.append((time.perf_counter() - start) * 1000)
+        found += any(result[0] == data_id for result in results)
+
+    latencies.sort()
+    print(f"query: median {statistics.median(latencies):.2f} ms, "
+          f"p95 {latencies[int(len(latencies) * 0.95) - 1]:.2f} ms, max {latencies[-1]:.2f} ms")
+    print(f"recall@10: {found / args.queries:.0%}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,75 @@
+"""
+__author__ = "Adrien Mertens"
+__version__ = "1.0"
+
+Measures the import of a synthetic CSV export of Chrome into an empty vault, parsed in
+the calling process and by pools of processes, and the time spent parsing alone. A
+quarter of the rows repeat a name, to exercise the detection of duplicates.
+
+Usage (from the root of the project):
+    python -m benchmarks.bench_import --rows 1000000 --processes 1 2 4
+"""
+import argparse
+import csv
+import os
+import tempfile
+import time
+
+from benchmarks.bench_suite import synthetic_entries
+from models.csvImport import CHUNK_BYTES, import_csv, map_columns, parse_chunk, split_records
+from models.data import Datas
+
+
+def write_export(path: str, rows: int, seed: int) -> None:
+    """
+    Writes a CSV file laid out like an export of Chrome.
+
+    :param path: The path of the file.
+    :param rows: The number of rows, a quarter of them repeating the name of another.
+    :param seed: The seed of the entries.
+    :return: None
+    """
+    with open(path, "w", newline="", encoding="utf-8") as file:
+        writer = csv.writer(file)
+        writer.writerow(["name", "url", "username", "password", "note"])
+        for index, data in enumerate(synthetic_entries(rows, seed)):
+            name = f"entry-{index // 2:07d}" if index % 4 == 3 else data.name
+            url = f"https://www.{data.source}/login" if data.source else ""
+            writer.writerow([name, url, data.username, data.password, "note\non two lines" if index % 10 == 0 else ""])
+
+
+def parse_only(path: str) -> float:
+    """Returns the time taken to split and parse the file in the calling process, without the database."""
+    start = time.perf_counter()
+    with open(path, "rb") as file:
+        columns = map_columns(next(csv.reader([file.readline().decode("utf-8")])))
+        for chunk in split_records(file, CHUNK_BYTES):
+            parse_chunk(chunk, columns, "utf-8")
+    return time.perf_counter() - start
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, default=200000, help="number of rows of the CSV file")
+    parser.add_argument("--processes", type=int, nargs="+", default=[1, os.cpu_count() or 1],
+                        help="numbers of processes parsing the file")
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, "export.csv")
+        write_export(path, args.rows, args.seed)
+        size_mb = os.path.getsize(path) / 1e6
+        print(f"{args.rows} rows, {size_mb:.1f} MB, {os.cpu_count()} CPUs")
+        seconds = parse_only(path)
+        print(f"{'parse only':<16}{seconds:>8.2f} s{size_mb / seconds:>10.1f} MB/s")
+        for processes in args.processes:
+            with Datas(path_db=os.path.join(directory, f"import-{processes}.db")) as datas:
+                stats = import_csv(datas, path, processes=processes)
+            print(f"{f'{processes} process(es)':<16}{stats.seconds:>8.2f} s{stats.mb_per_second:>10.1f} MB/s"
+                  f"{stats.rows / stats.seconds:>12.0f} rows/s  {stats.inserted} inserted, "
+                  f"{stats.duplicates} duplicates")
+
+
+if __name__ == "__main__":
+    main()
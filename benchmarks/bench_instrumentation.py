@@ -0,0 +1,69 @@
+"""
+__author__ = "Adrien Mertens"
+__version__ = "1.0"
+
+Measures the overhead of the instrumentation of the data layer on its hottest path,
+reading one entry by id: the undecorated method, the method with instrumentation
+disabled, and with instrumentation enabled.
+
+Usage (from the root of the project):
+    python -m benchmarks.bench_instrumentation --calls 100000
+"""
+import argparse
+import os
+import tempfile
+import time
+
+from controllers.controllersDatas import ControllersDatas
+from models.data import Data, Datas
+
+
+def per_call(call, calls: int, repeat: int = 5) -> float:
+    """
+    Measures the best time, in microseconds, taken by one call of `call`.
+
+    :param call: The callable to measure, called without argument.
+    :param calls: The number of calls per measure.
+    :param repeat: The number of measures.
+    :return: The best time per call in microseconds.
+    """
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for _ in range(calls):
+            call()
+        best = min(best, time.perf_counter() - start)
+    return best / calls * 1e6
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--calls", type=int, default=100000, help="number of reads per measure")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as directory:
+        with Datas(path_db=os.path.join(directory, "bench.db")) as datas:
+            datas.register_data(Data(name="gmail", username="jdoe", password="p", source="google.com"))
+            controller = ControllersDatas(datas)
+            sql = "SELECT id, name, username, password, source FROM data WHERE id = ?"
+            undecorated_fetch = Datas.fetch_one.__wrapped__
+            undecorated_get = ControllersDatas.get_one_data.__wrapped__
+
+            print(f"{'path':<34}{'undecorated µs':>16}{'disabled µs':>14}{'enabled µs':>13}")
+            rows = []
+            for label, raw, decorated in (
+                    ("Datas.fetch_one", lambda: undecorated_fetch(datas, sql, (1,)), lambda: datas.fetch_one(sql, (1,))),
+                    ("ControllersDatas.get_one_data", lambda: undecorated_get(controller, 1),
+                     lambda: controller.get_one_data(1))):
+                datas.disable_instrumentation()
+                baseline = per_call(raw, args.calls)
+                disabled = per_call(decorated, args.calls)
+                datas.enable_instrumentation(slow_query_seconds=60)
+                enabled = per_call(decorated, args.calls)
+                rows.append((label, baseline, disabled, enabled))
+            for label, baseline, disabled, enabled in rows:
+                print(f"{label:<34}{baseline:>16.2f}{disabled:>14.2f}{enabled:>13.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,88 @@
+"""
+__author__ = "Adrien Mertens"
+__version__ = "1.0"
+
+Measures with tracemalloc the memory held by a listing of the vault in each of its
+representations: the former `Data` dataclass with a `__dict__`, the slotted `Data`,
+plain tuples and the columnar `DataTable`. Rows are generated like SQLite returns
+them, with a new string object for every value, so sources are not shared.
+
+Usage (from the root of the project):
+    python -m benchmarks.bench_memory --entries 100000 1000000
+"""
+import argparse
+import gc
+import random
+import tracemalloc
+from dataclasses import dataclass, field
+from typing import Callable, Iterator, List, Tuple
+
+from models.data import Data
+from models.dataTable import DataTable
+
+SOURCES = ["google.com", "github.com", "outlook.com", "belfius.be", "amazon.fr", "netflix.com"]
+
+
+@dataclass
+class DictData:
+    """`Data` as it was before it got slots, as a baseline."""
+    name: str = field(default=None)
+    username: str = field(default=None)
+    password: str = field(default=None)
+    source: str = field(default=None)
+    id: int = field(default=-1)
+
+
+def rows(count: int, seed: int = 42) -> Iterator[Tuple[int, str, str]]:
+    """
+    Generates `(id, name, source)` rows with a fresh string for every value.
+
+    :param count: The number of rows.
+    :param seed: The seed of the random generator.
+    :return: A generator of rows.
+    """
+    rng = random.Random(seed)
+    for data_id in range(1, count + 1):
+        yield data_id, f"entry-{data_id:08d}", "".join(rng.choice(SOURCES))
+
+
+def measure(build: Callable[[], object]) -> Tuple[float, float]:
+    """
+    Builds a representation and returns the memory it holds and the peak reached
+    while building it, in MiB.
+
+    :param build: The callable building the representation.
+    :return: The held and peak memory.
+    """
+    gc.collect()
+    tracemalloc.start()
+    built = build()
+    held, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del built
+    return held / 2 ** 20, peak / 2 ** 20
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--entries", type=int, nargs="+", default=[100_000, 1_000_000], help="sizes of the vault")
+    args = parser.parse_args()
+
+    representations: List[Tuple[str, Callable[[int], object]]] = [
+        ("dataclass with __dict__", lambda count: [DictData(name=name, source=source, id=data_id)
+                                                   for data_id, name, source in rows(count)]),
+        ("slotted Data", lambda count: [Data(name=name, source=source, id=data_id)
+                                        for data_id, name, source in rows(count)]),
+        ("tuples", lambda count: list(rows(count))),
+        ("DataTable", lambda count: DataTable.from_rows(rows(count))),
+    ]
+    for count in args.entries:
+        print(f"\n{count:,} entries")
+        print(f"{'representation':<26}{'held':>12}{'peak':>12}{'per entry':>12}")
+        for label, build in representations:
+            held, peak = measure(lambda: build(count))
+            print(f"{label:<26}{held:>8.1f} MiB{peak:>8.1f} MiB{held * 2 ** 20 / count:>10.0f} B")
+
+
+if __name__ == "__main__":
+    main()
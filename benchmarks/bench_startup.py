@@ -0,0 +1,146 @@
+"""
+__author__ = "Adrien Mertens"
+__version__ = "1.0"
+
+Measures the start of the application in fresh interpreters: the import time of the
+entry points, read from `python -X importtime` with the heaviest imports of each, and
+the time until the main window is first drawn and until its board shows the first
+rows. The first paint needs a display; without one it is reported as unavailable.
+
+Usage (from the root of the project):
+    python -m benchmarks.bench_startup --runs 5 --json startup.json
+"""
+import argparse
+import json
+import os
+import subprocess
+import sys
+import tempfile
+from typing import Dict, List, Optional
+
+from benchmarks.bench_suite import environment
+from models.data import Data, Datas
+
+# Modules whose import is measured: the graphical application, the command line and the controller
+TARGETS = ["views.mainView", "cli", "controllers.controllersDatas"]
+
+# Run in a fresh interpreter: builds the main window as MainWindow does, on a vault of
+# a few hundred entries, and prints when it is first drawn and when its board is filled
+FIRST_PAINT_PROBE = """
+import time
+start = time.perf_counter()
+import json, sys
+import ttkbootstrap as ttk
+from models.data import Datas
+from controllers.appService import AppService
+from views.boardView import BoardView
+from views.menu import Menu
+from views.searchBar import SearchBar
+imported = time.perf_counter()
+datas = Datas(sys.argv[1])
+times = {"import": imported - start}
+with AppService(datas) as service:
+    window = ttk.Window(themename="superhero")
+    board = BoardView(window)
+    board.controller = service.controller
+    board.grid(row=2, column=0)
+    menu = Menu(window, board)
+    menu.controller = service.controller
+    menu.grid(row=0, column=0)
+    SearchBar(window, board).grid(row=1, column=0)
+    window.after_idle(board.refresh_data_board_from_db)
+
+    def on_expose(event):
+        times.setdefault("first_paint", time.perf_counter() - start)
+
+    def poll():
+        if board.board.get_children():
+            times["board_filled"] = time.perf_counter() - start
+            window.destroy()
+        else:
+            window.after(5, poll)
+
+    window.bind("<Expose>", on_expose, add="+")
+    window.after(5, poll)
+    window.mainloop()
+print(json.dumps(times))
+"""
+
+
+def import_time(module: str) -> Dict[str, object]:
+    """
+    Imports `module` in a fresh interpreter with `-X importtime`.
+
+    :param module: The module to import.
+    :return: The total import time in milliseconds, and the five heaviest modules it
+        imports directly, with their cumulative time.
+    """
+    result = subprocess.run([sys.executable, "-X", "importtime", "-c", f"import {module}"], capture_output=True,
+                            text=True, check=True)
+    children = []
+    total = 0.0
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "|" not in line or "self [us]" in line:
+            continue
+        _, cumulative, name = line.split("|")
+        depth = (len(name) - len(name.lstrip())) // 2
+        if name.strip() == module:
+            total = int(cumulative) / 1000
+        elif depth == 1:
+            children.append((name.strip(), int(cumulative) / 1000))
+    children.sort(key=lambda child: child[1], reverse=True)
+    return {"total_ms": total, "heaviest": dict(children[:5])}
+
+
+def first_paint(path_db: str) -> Optional[Dict[str, float]]:
+    """
+    Runs the first paint probe in a fresh interpreter.
+
+    :param path_db: The vault shown by the probe.
+    :return: The times, in milliseconds, of the end of the imports, of the first paint and
+        of the first rows of the board, or None when no display is available.
+    """
+    result = subprocess.run([sys.executable, "-c", FIRST_PAINT_PROBE, path_db], capture_output=True, text=True)
+    if result.returncode != 0:
+        return None
+    return {name: seconds * 1000 for name, seconds in json.loads(result.stdout.splitlines()[-1]).items()}
+
+
+def best(runs: List[Dict[str, float]]) -> Dict[str, float]:
+    """Returns the best time of each measure over several runs."""
+    return {name: min(run[name] for run in runs if name in run) for name in runs[0]}
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--runs", type=int, default=5, help="number of fresh interpreters per measure")
+    parser.add_argument("--json", metavar="PATH", help="write the results as JSON to PATH")
+    args = parser.parse_args()
+
+    results = {"environment": environment(), "imports": {}, "first_paint": None}
+    print(f"{'module':<32}{'import ms':>10}  heaviest direct imports (ms)")
+    for module in TARGETS:
+        runs = [import_time(module) for _ in range(args.runs)]
+        fastest = min(runs, key=lambda run: run["total_ms"])
+        results["imports"][module] = fastest
+        heaviest = ", ".join(f"{name} {ms:.0f}" for name, ms in fastest["heaviest"].items())
+        print(f"{module:<32}{fastest['total_ms']:>10.1f}  {heaviest}")
+
+    with tempfile.TemporaryDirectory() as directory:
+        path_db = os.path.join(directory, "startup.db")
+        with Datas(path_db) as datas:
+            datas.register_many(Data(name=f"entry-{i}", username="user", password="password") for i in range(500))
+        paints = [first_paint(path_db) for _ in range(args.runs)]
+    if None in paints:
+        print("first paint: unavailable (no display)")
+    else:
+        results["first_paint"] = best(paints)
+        print("first paint: " + ", ".join(f"{name} {ms:.0f} ms" for name, ms in results["first_paint"].items()))
+
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as file:
+            json.dump(results, file, indent=2, sort_keys=True)
+
+
+if __name__ == "__main__":
+    main()
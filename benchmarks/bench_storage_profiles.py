@@ -0,0 +1,76 @@
+"""
+__author__ = "Adrien Mertens"
+__version__ = "1.0"
+
+Compares the write and read throughput of the storage profiles of the data layer
+on a file-backed vault. Writes are single-entry commits, as done by the views.
+Profiles are run in turn for several rounds and the best throughput of each is kept,
+so that the order of the runs does not favour one of them.
+
+Usage (from the root of the project):
+    python -m benchmarks.bench_storage_profiles --entries 2000
+"""
+import argparse
+import os
+import random
+import tempfile
+import time
+from typing import Dict
+
+from models.data import Data, Datas, STORAGE_PROFILES
+
+
+def run(profile: str, entries: int) -> Dict[str, float]:
+    """
+    Measures add/modify/get/list throughput on a fresh file-backed vault.
+
+    :param profile: The storage profile given to `Datas`.
+    :param entries: The number of entries used for each operation.
+    :return: A mapping of operation name to operations per second.
+    """
+    ids = list(range(1, entries + 1))
+    random.Random(42).shuffle(ids)
+    results = {}
+    with tempfile.TemporaryDirectory() as directory:
+        with Datas(path_db=os.path.join(directory, "bench.db"), storage_profile=profile) as datas:
+            start = time.perf_counter()
+            for i in range(entries):
+                datas.register_data(Data(name=f"entry-{i}", username="user", password="password", source="bench"))
+            results["add"] = entries / (time.perf_counter() - start)
+
+            start = time.perf_counter()
+            for data_id in ids:
+                datas.modify_data(data_id, Data(name=f"entry-{data_id}-bis", username="user", password="secret",
+                                                source="bench"))
+            results["modify"] = entries / (time.perf_counter() - start)
+
+            start = time.perf_counter()
+            for data_id in ids:
+                datas.get_one_data_in_db(data_id)
+            results["get"] = entries / (time.perf_counter() - start)
+
+            start = time.perf_counter()
+            for _ in range(10):
+                datas.get_all_Data_in_db()
+            results["get all"] = 10 * entries / (time.perf_counter() - start)
+    return results
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--entries", type=int, default=2000, help="number of entries per operation")
+    parser.add_argument("--rounds", type=int, default=3, help="number of runs of each profile")
+    args = parser.parse_args()
+
+    results = {profile: {} for profile in STORAGE_PROFILES}
+    for _ in range(args.rounds):
+        for profile, best in results.items():
+            for operation, throughput in run(profile, args.entries).items():
+                best[operation] = max(best.get(operation, 0.0), throughput)
+    print(f"{'operation':<10}" + "".join(f"{profile:>14}" for profile in results))
+    for operation in results["safe"]:
+        print(f"{operation:<10}" + "".join(f"{results[profile][operation]:>12.0f}/s" for profile in results))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,235 @@
+"""
+__author__ = "Adrien Mertens"
+__version__ = "1.0"
+
+Reproducible benchmark suite of the data layer and its controller. For each vault size
+and each backend (in-memory or file-backed), a synthetic vault is generated from a
+fixed seed, then the latency of every operation is measured over the same sequence of
+calls: register_data, modify_data, remove_data, get_one_data_in_db, get_all_Data_in_db,
+duplicate detection, and the cached reads of the controller. The throughput of an
+encrypted backup of the vault and of its restore into an empty vault is measured too,
+with a cheap key derivation so that it does not hide the cost of the streaming.
+
+Results are written as JSON with stable keys, so that the runs of two commits can be
+diffed, or compared with --compare, which prints the ratio of the median latencies.
+
+Usage (from the root of the project):
+    python -m benchmarks.bench_suite --sizes 1000 100000 1000000 --json results.json
+    python -m benchmarks.bench_suite --sizes 1000 --compare results.json
+"""
+import argparse
+import json
+import os
+import platform
+import random
+import sqlite3
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from typing import Callable, Dict, Iterator, List, Optional
+
+from controllers.controllersDatas import ControllersDatas
+from models.backup import export_backup, import_backup
+from models.crypto import KdfParams
+from models.data import Data, Datas
+
+# Version of the layout of the JSON results, incremented when it changes
+FORMAT_VERSION = 2
+
+# Cheap key derivation of the measured backups, whose cost is the same for every size
+BACKUP_KDF = KdfParams(n=2 ** 10, r=8, p=1)
+
+SOURCES = ["google.com", "github.com", "amazon.fr", "bank.be", "mail.example.org", None]
+
+
+def synthetic_entries(count: int, seed: int = 42, prefix: str = "entry") -> Iterator[Data]:
+    """
+    Generates the entries of a synthetic vault. The same count and seed always give
+    the same entries, so that every run measures the same vault.
+
+    :param count: The number of entries.
+    :param seed: The seed of the generator.
+    :param prefix: The prefix of the names, which are unique.
+    :return: A generator of entries without id.
+    """
+    rng = random.Random(seed)
+    for i in range(count):
+        yield Data(name=f"{prefix}-{i:07d}", username=f"user{rng.randrange(count)}@example.org",
+                   password="".join(rng.choices("abcdefghijkmnopqrstuvwxyz0123456789", k=16)),
+                   source=rng.choice(SOURCES))
+
+
+def latencies(call: Callable[[int], object], arguments: List[int]) -> List[float]:
+    """
+    Times `call` once for each argument.
+
+    :param call: The operation to measure, given one argument.
+    :param arguments: The arguments, in the order they are used.
+    :return: The duration of each call, in seconds.
+    """
+    durations = []
+    for argument in arguments:
+        start = time.perf_counter()
+        call(argument)
+        durations.append(time.perf_counter() - start)
+    return durations
+
+
+def summarize(durations: List[float]) -> Dict[str, float]:
+    """
+    Summarizes the durations of an operation, in microseconds.
+
+    :param durations: The duration of each call, in seconds.
+    :return: The number of calls, their mean, median, 95th percentile, minimum and maximum, and the calls per second.
+    """
+    ordered = sorted(durations)
+    return {
+        "calls": len(ordered),
+        "mean_us": statistics.fmean(ordered) * 1e6,
+        "p50_us": ordered[len(ordered) // 2] * 1e6,
+        "p95_us": ordered[min(len(ordered) - 1, int(len(ordered) * 0.95))] * 1e6,
+        "min_us": ordered[0] * 1e6,
+        "max_us": ordered[-1] * 1e6,
+        "ops_per_s": len(ordered) / sum(ordered) if sum(ordered) else 0.0,
+    }
+
+
+def run(backend: str, size: int, calls: int, full_reads: int, seed: int, directory: str) -> Dict[str, object]:
+    """
+    Generates a vault of `size` entries and measures every operation on it.
+
+    :param backend: ``"memory"`` or ``"file"``.
+    :param size: The number of entries of the vault.
+    :param calls: The number of calls of each single-entry operation.
+    :param full_reads: The number of calls of the operations reading the whole vault.
+    :param seed: The seed of the vault and of the order of the calls.
+    :param directory: The directory holding the file-backed vault.
+    :return: The time taken to generate the vault, the summary of each operation and the
+        throughput of a backup and of its restore.
+    """
+    path = ":memory:" if backend == "memory" else os.path.join(directory, f"bench-{size}.db")
+    rng = random.Random(seed)
+    operations = {}
+    with Datas(path_db=path) as datas:
+        start = time.perf_counter()
+        datas.register_many(synthetic_entries(size, seed), batch_size=5000)
+        populate_seconds = time.perf_counter() - start
+        controller = ControllersDatas(datas, cache=True)
+
+        existing_ids = rng.sample(range(1, size + 1), min(calls, size))
+        existing = [datas.get_one_data_in_db(data_id) for data_id in existing_ids]
+        new_entries = list(synthetic_entries(calls, seed + 1, prefix="new"))
+
+        operations["get_one_data_in_db"] = latencies(datas.get_one_data_in_db, existing_ids)
+        operations["check_if_user_data_exists"] = latencies(
+            lambda i: datas.check_if_user_data_exists(existing[i]), range(len(existing)))
+        operations["register_data (duplicate)"] = latencies(
+            lambda i: datas.register_data(existing[i]), range(len(existing)))
+        operations["register_data"] = latencies(lambda i: datas.register_data(new_entries[i]), range(calls))
+        operations["modify_data"] = latencies(
+            lambda i: datas.modify_data(existing_ids[i], Data(name=f"{existing[i].name}-bis", username="user",
+                                                             password="secret", source=existing[i].source)),
+            range(len(existing_ids)))
+        new_ids = [data_id for data_id, _ in datas.list_names(after_id=size)]
+        operations["remove_data"] = latencies(datas.remove_data, new_ids)
+
+        operations["get_all_Data_in_db"] = latencies(lambda _: datas.get_all_Data_in_db(), range(full_reads))
+        controller.get_all_datas()
+        operations["controller.get_one_data (cached)"] = latencies(controller.get_one_data, existing_ids)
+        operations["controller.get_all_datas (cached)"] = latencies(lambda _: controller.get_all_datas(),
+                                                                    range(full_reads))
+
+        backup_path = os.path.join(directory, f"bench-{size}.epbk")
+        with open(backup_path, "wb") as file:
+            exported = export_backup(datas, file, "passphrase", params=BACKUP_KDF)
+    with Datas(path_db=":memory:") as datas, open(backup_path, "rb") as file:
+        imported = import_backup(datas, file, "passphrase")
+    os.remove(backup_path)
+    return {"populate_seconds": populate_seconds,
+            "operations": {name: summarize(durations) for name, durations in operations.items()},
+            "backup": {"bytes": exported.bytes, "export_mb_per_s": exported.mb_per_second,
+                       "import_mb_per_s": imported.mb_per_second}}
+
+
+def environment() -> Dict[str, Optional[str]]:
+    """
+    Describes where the results were measured.
+
+    :return: The commit of the project, if known, and the versions of Python, SQLite and the platform.
+    """
+    try:
+        commit = subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True,
+                                check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        commit = None
+    return {"commit": commit, "python": platform.python_version(), "sqlite": sqlite3.sqlite_version,
+            "platform": platform.platform(), "cpus": str(os.cpu_count())}
+
+
+def compare(results: Dict[str, object], baseline: Dict[str, object]) -> None:
+    """
+    Prints the ratio of the median latency of every operation to the one of a baseline
+    run. Ratios above 1 are slowdowns.
+
+    :param results: The results of this run.
+    :param baseline: The results of the baseline run, as written by --json.
+    :return: None
+    """
+    print(f"{'backend':<8}{'size':>9}  {'operation':<36}{'base p50 µs':>13}{'p50 µs':>10}{'ratio':>8}")
+    for key, run_results in results["runs"].items():
+        base_run = baseline.get("runs", {}).get(key)
+        if base_run is None:
+            continue
+        backend, size = key.split(":")
+        for name, summary in run_results["operations"].items():
+            base = base_run["operations"].get(name)
+            if base is None or not base["p50_us"]:
+                continue
+            print(f"{backend:<8}{size:>9}  {name:<36}{base['p50_us']:>13.1f}{summary['p50_us']:>10.1f}"
+                  f"{summary['p50_us'] / base['p50_us']:>8.2f}")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1000, 100000, 1000000],
+                        help="number of entries of each synthetic vault")
+    parser.add_argument("--backends", nargs="+", choices=["memory", "file"], default=["memory", "file"])
+    parser.add_argument("--calls", type=int, default=500, help="number of calls of each single-entry operation")
+    parser.add_argument("--full-reads", type=int, default=3, help="number of reads of the whole vault")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--json", metavar="PATH", help="write the results as JSON to PATH, '-' for stdout")
+    parser.add_argument("--compare", metavar="PATH", help="compare the results with a previous JSON run")
+    args = parser.parse_args()
+
+    results = {"format": FORMAT_VERSION, "environment": environment(),
+               "parameters": {"calls": args.calls, "full_reads": args.full_reads, "seed": args.seed}, "runs": {}}
+    table = sys.stderr if args.json == "-" else sys.stdout
+    print(f"{'backend':<8}{'size':>9}  {'operation':<36}{'p50 µs':>10}{'p95 µs':>10}{'ops/s':>12}", file=table)
+    with tempfile.TemporaryDirectory() as directory:
+        for size in args.sizes:
+            for backend in args.backends:
+                run_results = results["runs"][f"{backend}:{size}"] = run(backend, size, args.calls, args.full_reads,
+                                                                         args.seed, directory)
+                print(f"{backend:<8}{size:>9}  vault generated in {run_results['populate_seconds']:.2f} s", file=table)
+                for name, summary in run_results["operations"].items():
+                    print(f"{backend:<8}{size:>9}  {name:<36}{summary['p50_us']:>10.1f}{summary['p95_us']:>10.1f}"
+                          f"{summary['ops_per_s']:>12.0f}", file=table)
+                backup = run_results["backup"]
+                print(f"{backend:<8}{size:>9}  backup of {backup['bytes'] / 1e6:.1f} MB: export "
+                      f"{backup['export_mb_per_s']:.1f} MB/s, restore {backup['import_mb_per_s']:.1f} MB/s", file=table)
+
+    if args.json == "-":
+        json.dump(results, sys.stdout, indent=2, sort_keys=True)
+        print()
+    elif args.json:
+        with open(args.json, "w", encoding="utf-8") as file:
+            json.dump(results, file, indent=2, sort_keys=True)
+    if args.compare:
+        with open(args.compare, encoding="utf-8") as file:
+            compare(results, json.load(file))
+
+
+if __name__ == "__main__":
+    main()
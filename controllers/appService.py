@@ -0,0 +1,54 @@
+"""
+__author__ = "Adrien Mertens"
+__version__ = "1.0"
+"""
+from models.data import Datas
+from controllers.controllersDatas import ControllersDatas
+from controllers.dbWorker import DbWorker
+from controllers.compactor import Compactor
+
+
+class AppService:
+    """
+    Groups the objects shared by every view of the application: the data layer, the
+    single controller all views read and write through, and the worker thread running
+    their database calls. Because every view uses the same controller, its cache and
+    its change feed are shared: a write made from the menu reaches the board as one
+    change event, registered with :meth:`ControllersDatas.add_listener`. The entries
+    removed more than `retention_days` days ago are purged in the background.
+
+    :ivar datas: The data layer of the vault.
+    :type datas: Datas
+    :ivar worker: The thread running the database calls submitted by the views.
+    :type worker: DbWorker
+    :ivar controller: The controller shared by every view.
+    :type controller: ControllersDatas
+    :ivar compactor: The thread purging the old tombstones of the vault.
+    :type compactor: Compactor
+    """
+    def __init__(self, datas: Datas, cache: bool = True, retention_days: float = 30) -> None:
+        """
+        :param datas: The data layer of the vault.
+        :param cache: Whether the controller keeps the entries read in memory.
+        :param retention_days: The number of days a removed entry can be restored.
+        """
+        self.datas = datas
+        self.worker = DbWorker()
+        self.controller = ControllersDatas(datas, worker=self.worker, cache=cache)
+        self.compactor = Compactor(datas, retention_days=retention_days)
+
+    def __enter__(self) -> "AppService":
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb) -> None:
+        self.close()
+
+    def close(self) -> None:
+        """
+        Stops the compactor, then the worker once the calls already submitted have run.
+        The data layer is left open, since it belongs to the caller.
+
+        :return: None
+        """
+        self.compactor.close()
+        self.worker.close()
@@ -0,0 +1,112 @@
+"""
+__author__ = "Adrien Mertens"
+__version__ = "1.0"
+"""
+import sys
+import threading
+import time
+from dataclasses import dataclass
+from typing import Optional
+
+from models.data import Datas
+
+
+@dataclass
+class CompactionStats:
+    """
+    Outcome of one compaction.
+
+    :ivar purged: The number of tombstones deleted for good.
+    :type purged: int
+    :ivar batches: The number of transactions the purge took.
+    :type batches: int
+    :ivar pages_freed: The number of pages given back to the file system.
+    :type pages_freed: int
+    :ivar seconds: The duration of the compaction.
+    :type seconds: float
+    """
+    purged: int = 0
+    batches: int = 0
+    pages_freed: int = 0
+    seconds: float = 0.0
+
+
+class Compactor:
+    """
+    Purges old tombstones and gives the freed pages back to the file system, on a
+    thread of its own, every `interval` seconds. It never goes through the database
+    worker, so the calls of the views are not queued behind it: tombstones are purged
+    in short transactions of `batch_size` entries, between which the other writers
+    run, and the pages are then given back by an incremental vacuum. The first
+    compaction of a vault created before tombstones existed rewrites it once to enable
+    incremental vacuums (see :meth:`Datas.incremental_vacuum`).
+    """
+    def __init__(self, datas: Datas, retention_days: float = 30, interval: float = 3600, delay: float = 60,
+                 batch_size: int = 500, vacuum_pages: int = 1000, name: str = "compactor") -> None:
+        """
+        Starts the compaction thread.
+
+        :param datas: The data layer to compact.
+        :param retention_days: The age, in days, from which tombstones are purged.
+        :param interval: The time between two compactions, in seconds.
+        :param delay: The time before the first compaction, in seconds, so that it does
+            not slow down the start of the application.
+        :param batch_size: The number of tombstones purged per transaction.
+        :param vacuum_pages: The maximum number of pages given back per compaction.
+        :param name: The name of the thread, as shown by debuggers.
+        """
+        self.__datas = datas
+        self.retention_days = retention_days
+        self.interval = interval
+        self.batch_size = batch_size
+        self.vacuum_pages = vacuum_pages
+        self.__delay = delay
+        self.__stop = threading.Event()
+        self.__lock = threading.Lock()
+        # Outcome of the last compaction, None before the first one
+        self.last_run: Optional[CompactionStats] = None
+        self.__thread = threading.Thread(target=self._run, name=name, daemon=True)
+        self.__thread.start()
+
+    def compact(self) -> CompactionStats:
+        """
+        Runs one compaction now, on the calling thread, once the one running, if any, has
+        finished. Stops between two batches when the compactor is closed.
+
+        :return: The outcome of the compaction.
+        """
+        with self.__lock:
+            stats = CompactionStats()
+            start = time.perf_counter()
+            while not self.__stop.is_set():
+                purged = self.__datas.purge_deleted(self.retention_days, limit=self.batch_size)
+                if not purged:
+                    break
+                stats.purged += purged
+                stats.batches += 1
+            if not self.__stop.is_set():
+                stats.pages_freed = self.__datas.incremental_vacuum(self.vacuum_pages)
+            stats.seconds = time.perf_counter() - start
+            self.last_run = stats
+            return stats
+
+    def close(self, wait: bool = True) -> None:
+        """
+        Stops the compaction thread, after the current batch if a compaction is running.
+
+        :param wait: Whether to wait for the thread to finish.
+        :return: None
+        """
+        self.__stop.set()
+        if wait and threading.current_thread() is not self.__thread:
+            self.__thread.join()
+
+    def _run(self) -> None:
+        """Compacts every `interval` seconds, after `delay`, until the compactor is closed."""
+        delay = self.__delay
+        while not self.__stop.wait(delay):
+            try:
+                self.compact()
+            except Exception as e:
+                print(f"An error occurred while compacting the database: {e}", file=sys.stderr)
+            delay = self.interval
@@ -2,24 +2,185 @@
 __author__ = "Adrien Mertens"
 __version__ = "1.0"
 """
+from typing import TYPE_CHECKING, Any, BinaryIO, Iterable, Iterator, Callable, Optional
 from models.data import Datas,Data
+from models.instrumentation import Instrumentation, timed
+
+if TYPE_CHECKING:
+    # Only needed by some calls, imported on first use so that scripts start faster
+    from concurrent.futures import Future
+    from threading import Event
+    from controllers.dbWorker import DbWorker
+    from models.backup import BackupStats
+    from models.crypto import KdfParams
+    from models.csvImport import ImportStats
+    from models.dataCache import CacheStats
+    from models.dataTable import DataTable
 
 
 class ControllersDatas:
-    def __init__(self,datas:Datas)->None:
+    def __init__(self,datas:Datas,worker:Optional["DbWorker"]=None,cache:bool=False)->None:
         self.__datas = datas
+        # Entries and names kept in memory between reads, when enabled
+        self.__cache = None
+        if cache:
+            from models.dataCache import DataCache
+            self.__cache = DataCache(datas)
+        # Thread running the calls submitted by the views, started on the first one
+        self.__worker = worker
+        # Built on the first fuzzy search, then kept up to date by the changes of the model
+        self.__fuzzy_index = None
 
+    @timed("controller.add_data")
     def add_data(self,data:Data)->bool:
         return self.__datas.register_data(data)
 
+    @timed("controller.add_many")
+    def add_many(self,datas:Iterable[Data])->list[str]:
+        return self.__datas.register_many(datas)
+
+    @timed("controller.modif_data")
     def modif_data(self,data_id:int ,new_data:Data)->bool:
         return self.__datas.modify_data(data_id=data_id,new_data=new_data)
 
+    @timed("controller.delete_data")
     def delete_data(self,data_id:int)->bool:
         return self.__datas.remove_data(data_id)
 
+    @timed("controller.delete_many")
+    def delete_many(self,data_ids:Iterable[int])->list[int]:
+        return self.__datas.remove_many(data_ids)
+
+    @timed("controller.restore_data")
+    def restore_data(self,data_id:int)->bool:
+        return self.__datas.restore_data(data_id)
+
+    @timed("controller.undo_last_delete")
+    def undo_last_delete(self)->list[int]:
+        return self.__datas.undo_last_delete()
+
+    @timed("controller.list_deleted")
+    def list_deleted(self,limit:int=100)->list[tuple[int,str,float]]:
+        return self.__datas.list_deleted(limit=limit)
+
+    @timed("controller.get_all_datas")
     def get_all_datas(self)->list[Data]:
+        if self.__cache is not None:
+            return self.__cache.get_all()
         return self.__datas.get_all_Data_in_db()
 
+    def iter_all_datas(self,batch_size:int=500)->Iterator[Data]:
+        return self.__datas.iter_all(batch_size=batch_size)
+
+    @timed("controller.export_backup")
+    def export_backup(self,file:BinaryIO,passphrase:str,chunk_size:int=1000,
+                      params:Optional["KdfParams"]=None)->"BackupStats":
+        from models.backup import export_backup
+        return export_backup(self.__datas,file,passphrase,chunk_size=chunk_size,params=params)
+
+    @timed("controller.import_backup")
+    def import_backup(self,file:BinaryIO,passphrase:str,resume:bool=True)->"BackupStats":
+        from models.backup import import_backup
+        return import_backup(self.__datas,file,passphrase,resume=resume)
+
+    @timed("controller.import_csv")
+    def import_csv(self,path:str,processes:Optional[int]=None,progress:Optional[Callable[["ImportStats"],None]]=None,
+                   cancel:Optional["Event"]=None)->"ImportStats":
+        from models.csvImport import import_csv
+        return import_csv(self.__datas,path,processes=processes,progress=progress,cancel=cancel)
+
+    @timed("controller.get_table")
+    def get_table(self)->"DataTable":
+        from models.dataTable import DataTable
+        return DataTable.from_rows(self.__datas.iter_names_and_sources())
+
+    @timed("controller.get_one_data")
     def get_one_data(self,data_id:int)->Data:
-        return self.__datas.get_one_data_in_db(data_id)
\ No newline at end of file
+        if self.__cache is not None:
+            return self.__cache.get(data_id)
+        return self.__datas.get_one_data_in_db(data_id)
+
+    @timed("controller.get_data_by_name")
+    def get_data_by_name(self,name:str)->Optional[Data]:
+        return self.__datas.get_one_data_by_name(name)
+
+    def iter_names_and_sources(self,batch_size:int=500)->Iterator[tuple[int,str,Optional[str]]]:
+        return self.__datas.iter_names_and_sources(batch_size=batch_size)
+
+    @timed("controller.sorted_names")
+    def sorted_names(self)->list[tuple[int,str]]:
+        if self.__cache is not None:
+            return self.__cache.sorted_names()
+        return sorted(self.__datas.list_names(),key=lambda pair:(pair[1].casefold(),pair[0]))
+
+    @property
+    def instrumentation(self)->Optional[Instrumentation]:
+        return self.__datas.instrumentation
+
+    def enable_instrumentation(self,slow_query_seconds:float=0.1)->Instrumentation:
+        return self.__datas.enable_instrumentation(slow_query_seconds=slow_query_seconds)
+
+    def disable_instrumentation(self)->None:
+        self.__datas.disable_instrumentation()
+
+    def stats(self)->dict:
+        return self.__datas.stats()
+
+    def cache_stats(self)->Optional["CacheStats"]:
+        return self.__cache.stats if self.__cache is not None else None
+
+    @timed("controller.list_names")
+    def list_names(self,after_id:int=0,limit:Optional[int]=None)->list[tuple[int,str]]:
+        return self.__datas.list_names(after_id=after_id,limit=limit)
+
+    @timed("controller.search")
+    def search(self,query:str,limit:int=100)->list[tuple[int,str]]:
+        return self.__datas.search(query,limit=limit)
+
+    @timed("controller.fuzzy_find")
+    def fuzzy_find(self,query:str,limit:int=10)->list[tuple[int,str]]:
+        if self.__fuzzy_index is None:
+            from models.trigramIndex import TrigramIndex
+            self.__fuzzy_index = TrigramIndex()
+            self.__datas.add_listener(self.__fuzzy_index.on_data_changed)
+            self.__fuzzy_index.add_many(self.__datas.iter_names_and_sources())
+        elif self.__fuzzy_index.stale:
+            self.__fuzzy_index.clear()
+            self.__fuzzy_index.add_many(self.__datas.iter_names_and_sources())
+        return [(data_id,name) for data_id,name,_ in self.__fuzzy_index.search(query,limit=limit)]
+
+    @timed("controller.get_page")
+    def get_page(self,after_id:int=0,limit:int=100)->list[Data]:
+        return self.__datas.get_page(after_id=after_id,limit=limit)
+
+    def submit_apart(self,call:Callable[...,Any],*args,**kwargs)->"Future":
+        # Long calls, such as imports, run on a thread of their own so that they do not hold up the others
+        from controllers.dbWorker import DbWorker
+        worker = DbWorker(name="db-long-call")
+        future = worker.submit(call,*args,**kwargs)
+        future.add_done_callback(lambda done: worker.close(wait=False))
+        return future
+
+    def add_listener(self,listener:Callable[[str,Data],None])->None:
+        self.__datas.add_listener(listener)
+
+    def remove_listener(self,listener:Callable[[str,Data],None])->None:
+        self.__datas.remove_listener(listener)
+
+    def has_master_password(self)->bool:
+        return self.__datas.is_encrypted
+
+    def is_locked(self)->bool:
+        return self.__datas.is_locked
+
+    def set_master_password(self,master_password:str,params:Optional["KdfParams"]=None)->None:
+        self.__datas.set_master_password(master_password,params=params)
+
+    def unlock(self,master_password:str)->None:
+        self.__datas.unlock(master_password)
+
+    def submit(self,call:Callable[...,Any],*args,**kwargs)->"Future":
+        if self.__worker is None:
+            from controllers.dbWorker import DbWorker
+            self.__worker = DbWorker()
+        return self.__worker.submit(call,*args,**kwargs)
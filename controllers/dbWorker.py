@@ -0,0 +1,74 @@
+"""
+__author__ = "Adrien Mertens"
+__version__ = "1.0"
+"""
+import queue
+import threading
+from concurrent.futures import Future
+from typing import Any, Callable
+
+
+class DbWorker:
+    """
+    Runs calls to the data layer on a dedicated thread, one after the other, in the
+    order they were submitted. The thread submitting them (the Tk main loop) gets a
+    `Future` back immediately and never waits for SQLite.
+
+    Since a single thread serves every request, a write submitted before a read is
+    always seen by that read, and the changes it reports to the listeners of `Datas`
+    are sent from the worker thread.
+    """
+    def __init__(self, name: str = "db-worker") -> None:
+        """
+        Starts the worker thread.
+
+        :param name: The name of the thread, as shown by debuggers.
+        """
+        self.__requests = queue.SimpleQueue()
+        self.__lock = threading.Lock()
+        self.__closed = False
+        self.__thread = threading.Thread(target=self._run, name=name, daemon=True)
+        self.__thread.start()
+
+    def submit(self, call: Callable[..., Any], *args, **kwargs) -> Future:
+        """
+        Queues `call(*args, **kwargs)` to run on the worker thread.
+
+        :param call: The callable to run.
+        :raises RuntimeError: If the worker has been closed.
+        :return: The future receiving the result or the exception of the call.
+        :rtype: Future
+        """
+        future = Future()
+        with self.__lock:
+            if self.__closed:
+                raise RuntimeError("Cannot submit a call to a closed worker")
+            self.__requests.put((future, call, args, kwargs))
+        return future
+
+    def close(self, wait: bool = True) -> None:
+        """
+        Stops the worker once the calls already queued have run.
+
+        :param wait: Whether to wait for the worker thread to finish.
+        :return: None
+        """
+        with self.__lock:
+            if not self.__closed:
+                self.__closed = True
+                self.__requests.put(None)
+        if wait and threading.current_thread() is not self.__thread:
+            self.__thread.join()
+
+    def _run(self) -> None:
+        """Runs the queued calls until the worker is closed."""
+        while (request := self.__requests.get()) is not None:
+            future, call, args, kwargs = request
+            if not future.set_running_or_notify_cancel():
+                continue
+            try:
+                result = call(*args, **kwargs)
+            except BaseException as e:
+                future.set_exception(e)
+            else:
+                future.set_result(result)
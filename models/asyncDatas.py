@@ -0,0 +1,109 @@
+"""
+__author__ = "Adrien Mertens"
+__version__ = "1.0"
+"""
+import asyncio
+import functools
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, AsyncIterator, Callable, Iterable, List, Optional, Tuple
+
+from models.data import Data, Datas
+
+
+class AsyncDatas:
+    """
+    asyncio counterpart of `Datas`, for scripts provisioning many entries at once.
+    Every call runs the matching `Datas` method on a thread, so the event loop is
+    never blocked by SQLite.
+
+    Reads run on a bounded pool of reader threads, one fewer than the pooled
+    connections so that one connection is always left to the writer, and may run
+    concurrently: with write-ahead logging they do not wait for each other nor for the
+    writer. Writes all run on a single writer thread, in the order they were awaited,
+    so they never compete for the write lock of the database. Changes are reported to
+    the listeners of `Datas` from the writer thread. With a pool of a single connection,
+    as for an in-memory database, reads and writes take turns on it.
+
+    :ivar datas: The data layer doing the work.
+    :type datas: Datas
+    """
+    def __init__(self, datas: Datas, max_readers: Optional[int] = None) -> None:
+        """
+        :param datas: The data layer to use.
+        :param max_readers: The maximum number of concurrent reads. Defaults to the pool
+            size of `datas` less one, so that every reader has its own connection and the
+            writer never waits for one. More readers may make the writer wait.
+        """
+        self.datas = datas
+        max_readers = max_readers or max(datas.pool_size - 1, 1)
+        self._readers = ThreadPoolExecutor(max_workers=max_readers, thread_name_prefix="datas-reader")
+        self._writer = ThreadPoolExecutor(max_workers=1, thread_name_prefix="datas-writer")
+
+    async def __aenter__(self) -> "AsyncDatas":
+        return self
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb) -> None:
+        self.close()
+
+    def close(self) -> None:
+        """
+        Stops the reader and writer threads once the pending calls have run. The data
+        layer itself is left open.
+
+        :return: None
+        """
+        self._readers.shutdown(wait=True)
+        self._writer.shutdown(wait=True)
+
+    async def _read(self, call: Callable[..., Any], *args, **kwargs) -> Any:
+        """Runs `call` on a reader thread."""
+        return await asyncio.get_running_loop().run_in_executor(self._readers, functools.partial(call, *args, **kwargs))
+
+    async def _write(self, call: Callable[..., Any], *args, **kwargs) -> Any:
+        """Runs `call` on the writer thread."""
+        return await asyncio.get_running_loop().run_in_executor(self._writer, functools.partial(call, *args, **kwargs))
+
+    async def register_data(self, data: Data) -> bool:
+        """Awaitable :meth:`Datas.register_data`."""
+        return await self._write(self.datas.register_data, data)
+
+    async def register_many(self, datas: Iterable[Data], batch_size: int = 500) -> List[str]:
+        """Awaitable :meth:`Datas.register_many`. A generator is consumed on the writer thread."""
+        return await self._write(self.datas.register_many, datas, batch_size=batch_size)
+
+    async def modify_data(self, data_id: int, new_data: Data) -> bool:
+        """Awaitable :meth:`Datas.modify_data`."""
+        return await self._write(self.datas.modify_data, data_id, new_data)
+
+    async def remove_data(self, data_id: int) -> bool:
+        """Awaitable :meth:`Datas.remove_data`."""
+        return await self._write(self.datas.remove_data, data_id)
+
+    async def get_all_Data_in_db(self) -> List[Data]:
+        """Awaitable :meth:`Datas.get_all_Data_in_db`."""
+        return await self._read(self.datas.get_all_Data_in_db)
+
+    async def get_one_data_in_db(self, data_id: int) -> Optional[Data]:
+        """Awaitable :meth:`Datas.get_one_data_in_db`."""
+        return await self._read(self.datas.get_one_data_in_db, data_id)
+
+    async def search(self, query: str, limit: int = 100) -> List[Tuple[int, str]]:
+        """Awaitable :meth:`Datas.search`."""
+        return await self._read(self.datas.search, query, limit=limit)
+
+    async def stream_all(self, batch_size: int = 500) -> AsyncIterator[Data]:
+        """
+        Yields every entry, ordered by id, reading `batch_size` entries at a time so that
+        memory stays bounded whatever the size of the vault.
+
+        :param batch_size: The number of entries read per query.
+        :return: An async iterator of entries.
+        """
+        after_id = 0
+        while True:
+            page = await self._read(self.datas.get_page, after_id=after_id, limit=batch_size)
+            for data in page:
+                yield data
+            if len(page) < batch_size:
+                return
+            after_id = page[-1].id
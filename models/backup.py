@@ -0,0 +1,256 @@
+"""
+__author__ = "Adrien Mertens"
+__version__ = "1.0"
+
+Streaming, encrypted backups of a vault.
+
+A backup starts with a header holding the format version, the scrypt parameters and a
+random salt, from which the key is derived from the passphrase of the backup. Entries
+follow in chunks of `chunk_size` entries, each one written as its length on four bytes
+and its encrypted content:
+
+    header:  magic "EPBK" | version (1 byte) | n, r, p (4 bytes each) | salt (16 bytes)
+    chunk:   length (4 bytes) | Cipher.encrypt_bytes(flags (1 byte) | count (4 bytes) | zlib(JSON lines))
+
+Chunks are encrypted with AES-256-GCM; the header and the index of the chunk are
+authenticated with each of them, so that a chunk altered, moved, or taken from another
+backup is detected when it is read. The last chunk is flagged, so that a truncated
+backup is detected too. Passwords are written in clear inside the encrypted chunks, so a
+backup can be restored in any vault, whatever its master password.
+
+Export and import hold one chunk in memory at a time. Each chunk is imported in its own
+transaction, which also records its index in the vault; an import interrupted by a
+failure resumes after the last chunk imported when it is run again.
+"""
+import json
+import os
+import struct
+import time
+import zlib
+from dataclasses import dataclass
+from itertools import islice
+from typing import BinaryIO, Iterator, List, Optional, Tuple
+
+from models.crypto import Cipher, KdfParams, SALT_SIZE, reveal
+from models.data import Data, Datas, INSERTED, DUPLICATE, FAILED
+
+MAGIC = b"EPBK"
+VERSION = 1
+HEADER = struct.Struct(">4sBIII")
+LENGTH = struct.Struct(">I")
+CHUNK_HEADER = struct.Struct(">BI")
+# Flag of the last chunk of a backup
+LAST_CHUNK = 0x01
+# Larger chunk lengths can only come from a corrupted file
+MAX_CHUNK_BYTES = 256 * 2 ** 20
+# Larger scrypt costs in a header would exhaust the memory before the passphrase is checked
+MAX_KDF_N = 2 ** 20
+
+
+class BackupError(ValueError):
+    """Raised when a backup is malformed, altered, truncated, or its passphrase is wrong."""
+
+
+@dataclass
+class BackupStats:
+    """
+    Outcome of an export or an import.
+
+    :ivar entries: The number of entries written or read.
+    :type entries: int
+    :ivar chunks: The number of chunks written or read, skipped chunks excluded.
+    :type chunks: int
+    :ivar bytes: The size of the backup data written or read.
+    :type bytes: int
+    :ivar seconds: The duration of the operation, key derivation excluded.
+    :type seconds: float
+    :ivar inserted: The number of entries added to the vault by an import.
+    :type inserted: int
+    :ivar duplicates: The number of entries of an import whose name already existed.
+    :type duplicates: int
+    :ivar failed: The number of entries of an import that could not be added.
+    :type failed: int
+    :ivar skipped_chunks: The number of chunks not read again by a resumed import.
+    :type skipped_chunks: int
+    """
+    entries: int = 0
+    chunks: int = 0
+    bytes: int = 0
+    seconds: float = 0.0
+    inserted: int = 0
+    duplicates: int = 0
+    failed: int = 0
+    skipped_chunks: int = 0
+
+    @property
+    def mb_per_second(self) -> float:
+        """The throughput of the operation, in megabytes of backup per second."""
+        return self.bytes / 1e6 / self.seconds if self.seconds else 0.0
+
+
+def _associated_data(header: bytes, index: int) -> bytes:
+    """Returns the data authenticated with a chunk: the header of the backup and the index of the chunk."""
+    return header + LENGTH.pack(index)
+
+
+def _encode_chunk(cipher: Cipher, header: bytes, index: int, entries: List[Data], last: bool,
+                  compression_level: int) -> bytes:
+    """Compresses and encrypts one chunk, prefixed with its length."""
+    lines = "".join(json.dumps({"name": data.name, "username": data.username, "password": reveal(data.password),
+                                "source": data.source}, ensure_ascii=False) + "\n" for data in entries)
+    plaintext = CHUNK_HEADER.pack(LAST_CHUNK if last else 0, len(entries)) + zlib.compress(lines.encode("utf-8"),
+                                                                                          compression_level)
+    token = cipher.encrypt_bytes(plaintext, _associated_data(header, index))
+    return LENGTH.pack(len(token)) + token
+
+
+def export_backup(datas: Datas, file: BinaryIO, passphrase: str, chunk_size: int = 1000,
+                  params: Optional[KdfParams] = None, compression_level: int = 6) -> BackupStats:
+    """
+    Writes every entry of `datas` to `file`, streamed with :meth:`Datas.iter_all`. An
+    encrypted vault must be unlocked, since passwords are decrypted to be exported.
+
+    :param datas: The vault to back up.
+    :param file: A binary file open for writing.
+    :param passphrase: The passphrase protecting the backup.
+    :param chunk_size: The number of entries per chunk: larger chunks compress better,
+        smaller ones lose less work when an import is interrupted.
+    :param params: The cost parameters of the key derivation. Defaults to `KdfParams()`.
+    :param compression_level: The zlib compression level, from 0 (none) to 9.
+    :raises ValueError: If `chunk_size` is not positive.
+    :return: The statistics of the export.
+    """
+    if chunk_size < 1:
+        raise ValueError("chunk_size must be a positive integer")
+    params = params or KdfParams()
+    salt = os.urandom(SALT_SIZE)
+    header = HEADER.pack(MAGIC, VERSION, params.n, params.r, params.p) + salt
+    cipher = Cipher.from_master_password(passphrase, salt, params)
+    stats = BackupStats()
+    start = time.perf_counter()
+    file.write(header)
+    stats.bytes += len(header)
+    entries = datas.iter_all(batch_size=chunk_size)
+    while True:
+        chunk = list(islice(entries, chunk_size))
+        # A chunk shorter than chunk_size is the last one; a full one is followed by another, possibly empty
+        last = len(chunk) < chunk_size
+        encoded = _encode_chunk(cipher, header, stats.chunks, chunk, last, compression_level)
+        file.write(encoded)
+        stats.bytes += len(encoded)
+        stats.entries += len(chunk)
+        stats.chunks += 1
+        if last:
+            break
+    stats.seconds = time.perf_counter() - start
+    return stats
+
+
+def _read_exactly(file: BinaryIO, size: int) -> bytes:
+    """Reads `size` bytes, raising a `BackupError` if the file ends before."""
+    data = file.read(size)
+    if len(data) != size:
+        raise BackupError("The backup is truncated")
+    return data
+
+
+def _read_header(file: BinaryIO, passphrase: str) -> Tuple[bytes, Cipher]:
+    """Reads the header of a backup and derives its key. Returns the header and the cipher."""
+    header = _read_exactly(file, HEADER.size + SALT_SIZE)
+    magic, version, n, r, p = HEADER.unpack(header[:HEADER.size])
+    if magic != MAGIC:
+        raise BackupError("The file is not a backup")
+    if version != VERSION:
+        raise BackupError(f"Unsupported backup version {version}")
+    try:
+        params = KdfParams(n=n, r=r, p=p)
+    except ValueError as e:
+        raise BackupError(f"The backup header is corrupted: {e}") from None
+    if n * r * p > MAX_KDF_N * 8:
+        raise BackupError("The backup header is corrupted: key derivation too expensive")
+    return header, Cipher.from_master_password(passphrase, header[HEADER.size:], params)
+
+
+def _chunks(file: BinaryIO, header: bytes, cipher: Cipher, skip: int) -> Iterator[Tuple[int, Optional[List[Data]], int]]:
+    """
+    Yields `(index, entries, length)` for each chunk of a backup, after its header. The
+    first `skip` chunks are passed over without being decrypted, and yielded with None.
+    """
+    index = 0
+    while True:
+        prefix = file.read(LENGTH.size)
+        if not prefix and 0 < index <= skip:
+            # Every chunk was imported before: the previous import stopped before forgetting its progress
+            return
+        if len(prefix) != LENGTH.size:
+            raise BackupError("The backup is truncated")
+        length = LENGTH.unpack(prefix)[0]
+        if length > MAX_CHUNK_BYTES:
+            raise BackupError(f"Chunk {index} of the backup is corrupted")
+        token = _read_exactly(file, length)
+        if index < skip:
+            yield index, None, length
+            index += 1
+            continue
+        try:
+            plaintext = cipher.decrypt_bytes(token, _associated_data(header, index))
+        except ValueError:
+            if index == skip:
+                raise BackupError("Wrong passphrase, or the backup is corrupted") from None
+            raise BackupError(f"Chunk {index} of the backup is corrupted") from None
+        # The content is authenticated, so it can only be malformed if written by another program
+        try:
+            flags, count = CHUNK_HEADER.unpack(plaintext[:CHUNK_HEADER.size])
+            rows = zlib.decompress(plaintext[CHUNK_HEADER.size:]).decode("utf-8").splitlines()
+            entries = [Data(**json.loads(row)) for row in rows]
+        except (struct.error, zlib.error, ValueError, TypeError):
+            raise BackupError(f"Chunk {index} of the backup is malformed") from None
+        if len(entries) != count:
+            raise BackupError(f"Chunk {index} of the backup is malformed")
+        yield index, entries, length
+        if flags & LAST_CHUNK:
+            return
+        index += 1
+
+
+def import_backup(datas: Datas, file: BinaryIO, passphrase: str, resume: bool = True) -> BackupStats:
+    """
+    Adds the entries of a backup to `datas`, one chunk per transaction; entries whose
+    name already exists are skipped. An encrypted vault must be unlocked, since the
+    passwords are encrypted with its key as they are added.
+
+    Chunks already imported by an interrupted import of the same backup are skipped
+    when `resume` is set. The progress is forgotten once the import completes.
+
+    :param datas: The vault to restore into.
+    :param file: A binary file open for reading.
+    :param passphrase: The passphrase of the backup.
+    :param resume: Whether to skip the chunks imported by a previous, interrupted import.
+    :raises BackupError: If the backup is malformed, altered or truncated, or the
+        passphrase is wrong. Chunks imported before the error stay imported.
+    :return: The statistics of the import.
+    """
+    header, cipher = _read_header(file, passphrase)
+    # The salt is random, so it identifies the backup
+    checkpoint = "backup:" + header[HEADER.size:].hex()
+    done = datas.get_checkpoint(checkpoint) if resume else None
+    skip = 0 if done is None else done + 1
+    stats = BackupStats(bytes=len(header))
+    start = time.perf_counter()
+    for index, entries, length in _chunks(file, header, cipher, skip):
+        stats.bytes += LENGTH.size + length
+        if entries is None:
+            stats.skipped_chunks += 1
+            continue
+        outcomes = datas.register_many(entries, checkpoint=(checkpoint, index))
+        if FAILED in outcomes and datas.get_checkpoint(checkpoint) != index:
+            # The transaction was rolled back, checkpoint included: the chunk is imported again on resume
+            raise BackupError(f"Chunk {index} of the backup could not be imported")
+        stats.entries += len(entries)
+        stats.chunks += 1
+        stats.inserted += outcomes.count(INSERTED)
+        stats.duplicates += outcomes.count(DUPLICATE)
+        stats.failed += outcomes.count(FAILED)
+    datas.remove_checkpoint(checkpoint)
+    stats.seconds = time.perf_counter() - start
+    return stats
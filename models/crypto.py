@@ -0,0 +1,302 @@
+"""
+__author__ = "Adrien Mertens"
+__version__ = "1.0"
+"""
+import hashlib
+import os
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Callable, Optional, Union
+
+# First byte of every encrypted value, to recognize the format of stored secrets
+FORMAT_VERSION = b"\x01"
+NONCE_SIZE = 12
+SALT_SIZE = 16
+KEY_SIZE = 32
+
+
+class InvalidMasterPassword(ValueError):
+    """Raised when the master password does not unlock the vault."""
+
+
+class VaultLockedError(RuntimeError):
+    """Raised when a secret is read or written before the vault has been unlocked."""
+
+
+@dataclass(frozen=True)
+class KdfParams:
+    """
+    Cost parameters of the scrypt key derivation. The memory used is about
+    `128 * n * r` bytes (32 MiB with the defaults) and the time grows linearly with
+    `n` and `p`. Raising them makes guessing the master password more expensive.
+
+    :ivar n: The CPU/memory cost, a power of 2.
+    :type n: int
+    :ivar r: The block size.
+    :type r: int
+    :ivar p: The parallelization factor.
+    :type p: int
+    """
+    n: int = 2 ** 15
+    r: int = 8
+    p: int = 1
+
+    def __post_init__(self) -> None:
+        if self.n < 2 or self.n & (self.n - 1):
+            raise ValueError("n must be a power of 2 greater than 1")
+        if self.r < 1 or self.p < 1:
+            raise ValueError("r and p must be positive integers")
+
+
+def derive_key(master_password: str, salt: bytes, params: KdfParams) -> bytes:
+    """
+    Derives the encryption key of the vault from the master password with scrypt,
+    a memory-hard key derivation function. This is deliberately slow and is meant
+    to run once per session.
+
+    :param master_password: The master password typed by the user.
+    :type master_password: str
+    :param salt: The random salt stored with the vault.
+    :type salt: bytes
+    :param params: The cost parameters stored with the vault.
+    :type params: KdfParams
+    :return: A key of `KEY_SIZE` bytes.
+    :rtype: bytes
+    """
+    return hashlib.scrypt(master_password.encode("utf-8"), salt=salt, n=params.n, r=params.r, p=params.p,
+                          maxmem=2 * 128 * params.n * params.r * params.p + 1024 * 1024, dklen=KEY_SIZE)
+
+
+class Cipher:
+    """
+    Authenticated encryption of individual fields with AES-256-GCM. The derived key
+    is kept in memory for the whole session, so encrypting or decrypting a field only
+    costs a few microseconds. Each value gets a fresh random nonce, and a value
+    encrypted for one field (the associated data) cannot be decrypted as another.
+
+    The `cryptography` package is imported by the first cipher built, so that opening
+    a vault without a master password does not pay for it.
+    """
+    def __init__(self, key: bytes) -> None:
+        from cryptography.exceptions import InvalidTag
+        from cryptography.hazmat.primitives.ciphers.aead import AESGCM
+        self.__aead = AESGCM(key)
+        self.__invalid_tag = InvalidTag
+
+    @classmethod
+    def from_master_password(cls, master_password: str, salt: bytes, params: KdfParams) -> "Cipher":
+        """
+        Derives the key from the master password and builds the cipher using it.
+
+        :param master_password: The master password typed by the user.
+        :param salt: The random salt stored with the vault.
+        :param params: The cost parameters stored with the vault.
+        :return: The cipher holding the derived key.
+        """
+        return cls(derive_key(master_password, salt, params))
+
+    def encrypt(self, plaintext: str, associated_data: bytes = b"") -> bytes:
+        """
+        Encrypts a text.
+
+        :param plaintext: The text to encrypt.
+        :param associated_data: Authenticated but unencrypted context, such as the field name.
+        :return: The version byte, the nonce and the ciphertext with its tag.
+        """
+        return self.encrypt_bytes(plaintext.encode("utf-8"), associated_data)
+
+    def encrypt_bytes(self, plaintext: bytes, associated_data: bytes = b"") -> bytes:
+        """
+        Encrypts binary data, like :meth:`encrypt`.
+
+        :param plaintext: The data to encrypt.
+        :param associated_data: Authenticated but unencrypted context.
+        :return: The version byte, the nonce and the ciphertext with its tag.
+        """
+        nonce = os.urandom(NONCE_SIZE)
+        return FORMAT_VERSION + nonce + self.__aead.encrypt(nonce, plaintext, associated_data)
+
+    def decrypt(self, token: bytes, associated_data: bytes = b"") -> str:
+        """
+        Decrypts a value produced by :meth:`encrypt` with the same key and associated data.
+
+        :param token: The encrypted value.
+        :param associated_data: The context given at encryption.
+        :raises ValueError: If the value is malformed, altered, or encrypted with another key.
+        :return: The decrypted text.
+        """
+        return self.decrypt_bytes(token, associated_data).decode("utf-8")
+
+    def decrypt_bytes(self, token: bytes, associated_data: bytes = b"") -> bytes:
+        """
+        Decrypts binary data produced by :meth:`encrypt_bytes`.
+
+        :param token: The encrypted value.
+        :param associated_data: The context given at encryption.
+        :raises ValueError: If the value is malformed, altered, or encrypted with another key.
+        :return: The decrypted data.
+        """
+        if token[:1] != FORMAT_VERSION:
+            raise ValueError("Unknown format of encrypted value")
+        nonce, ciphertext = token[1:1 + NONCE_SIZE], token[1 + NONCE_SIZE:]
+        try:
+            return self.__aead.decrypt(nonce, ciphertext, associated_data)
+        except self.__invalid_tag:
+            raise ValueError("The encrypted value is altered or was encrypted with another key") from None
+
+
+class SecretCache:
+    """
+    Small LRU cache of decrypted secrets, keyed by their encrypted value. A secret is
+    decrypted on its first read and kept for at most `ttl` seconds; the least recently
+    used secret is evicted once `maxsize` secrets are cached.
+
+    Plain texts are kept in mutable buffers that are overwritten with zeros when they
+    are evicted, expire or the cache is cleared. Secrets expire on time, whether or not
+    the cache is read again: a timer thread wipes them at the earliest expiry, and is
+    only running while secrets are cached. The strings handed to callers are
+    copies that Python does not allow to wipe, so they should not be kept longer than
+    needed.
+
+    :ivar maxsize: The maximum number of secrets kept decrypted.
+    :type maxsize: int
+    :ivar ttl: The number of seconds a decrypted secret is kept.
+    :type ttl: float
+    """
+    def __init__(self, decrypt: Callable[[bytes], str], maxsize: int = 32, ttl: float = 60.0,
+                 clock: Callable[[], float] = time.monotonic) -> None:
+        """
+        :param decrypt: The function decrypting an encrypted value.
+        :param maxsize: The maximum number of secrets kept decrypted.
+        :param ttl: The number of seconds a decrypted secret is kept.
+        :param clock: The time source, in seconds.
+        """
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.__decrypt = decrypt
+        self.__clock = clock
+        self.__lock = threading.Lock()
+        self.__entries: "OrderedDict[bytes, tuple[bytearray, float]]" = OrderedDict()
+        # Timer wiping the secrets at the earliest expiry, None while none is cached
+        self.__timer: Optional[threading.Timer] = None
+
+    def __len__(self) -> int:
+        return len(self.__entries)
+
+    def get(self, token: bytes) -> str:
+        """
+        Returns the plain text of an encrypted value, decrypting it only if it is not
+        cached or has expired.
+
+        :param token: The encrypted value.
+        :return: The plain text.
+        """
+        now = self.__clock()
+        with self.__lock:
+            self._evict_expired(now)
+            entry = self.__entries.get(token)
+            if entry is not None:
+                self.__entries.move_to_end(token)
+                return entry[0].decode("utf-8")
+        buffer = bytearray(self.__decrypt(token).encode("utf-8"))
+        with self.__lock:
+            previous = self.__entries.pop(token, None)
+            if previous is not None:
+                self._wipe(previous[0])
+            self.__entries[token] = (buffer, now + self.ttl)
+            while len(self.__entries) > self.maxsize:
+                self._wipe(self.__entries.popitem(last=False)[1][0])
+            if self.__timer is None:
+                self._schedule_expiry(now)
+            return buffer.decode("utf-8")
+
+    def clear(self) -> None:
+        """
+        Wipes and forgets every cached secret.
+
+        :return: None
+        """
+        with self.__lock:
+            while self.__entries:
+                self._wipe(self.__entries.popitem()[1][0])
+            if self.__timer is not None:
+                self.__timer.cancel()
+                self.__timer = None
+
+    def _schedule_expiry(self, now: float) -> None:
+        """Starts the timer wiping the secrets at the earliest expiry. Called with the lock held."""
+        delay = max(min(expires for _, expires in self.__entries.values()) - now, 0.0)
+        self.__timer = threading.Timer(delay, self._expire)
+        self.__timer.daemon = True
+        self.__timer.start()
+
+    def _expire(self) -> None:
+        """Wipes the expired secrets, from the timer thread, and waits for the next expiry if secrets remain."""
+        now = self.__clock()
+        with self.__lock:
+            if self.__timer is not threading.current_thread():
+                # Cancelled by clear() after it fired
+                return
+            self._evict_expired(now)
+            self.__timer = None
+            if self.__entries:
+                self._schedule_expiry(now)
+
+    def _evict_expired(self, now: float) -> None:
+        """Wipes and forgets the secrets whose time to live has passed."""
+        for token in [token for token, (_, expires) in self.__entries.items() if expires <= now]:
+            self._wipe(self.__entries.pop(token)[0])
+
+    @staticmethod
+    def _wipe(buffer: bytearray) -> None:
+        """Overwrites a buffer with zeros."""
+        buffer[:] = bytes(len(buffer))
+
+
+class LazySecret:
+    """
+    Handle on an encrypted secret read from the vault. Nothing is decrypted until
+    :meth:`reveal` is called, so loading entries costs no cryptographic operation.
+    The handle never prints its value.
+    """
+    __slots__ = ("__token", "__cache")
+
+    def __init__(self, token: bytes, cache: SecretCache) -> None:
+        self.__token = token
+        self.__cache = cache
+
+    @property
+    def token(self) -> bytes:
+        """The encrypted value."""
+        return self.__token
+
+    def reveal(self) -> str:
+        """
+        Returns the plain text of the secret, decrypted through the cache of the vault.
+
+        :raises VaultLockedError: If the vault has been locked since the secret was read.
+        :return: The plain text.
+        """
+        return self.__cache.get(self.__token)
+
+    def __eq__(self, other: object) -> bool:
+        return isinstance(other, LazySecret) and other.token == self.__token
+
+    def __hash__(self) -> int:
+        return hash(self.__token)
+
+    def __repr__(self) -> str:
+        return "LazySecret('***')"
+
+
+def reveal(secret: Union[str, LazySecret, None]) -> Union[str, None]:
+    """
+    Returns the plain text of a password read from the vault, whether it is stored
+    in plain text or as a :class:`LazySecret`.
+
+    :param secret: The password field of a `Data`.
+    :return: The plain text password.
+    """
+    return secret.reveal() if isinstance(secret, LazySecret) else secret
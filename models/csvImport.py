@@ -0,0 +1,308 @@
+"""
+__author__ = "Adrien Mertens"
+__version__ = "1.0"
+
+Import of the CSV files exported by browsers and other password managers.
+
+The columns of the file are mapped to the fields of `Data` from its header, whatever
+the program that wrote it (see `FIELD_ALIASES`). Rows are normalized: spaces trimmed,
+the source reduced to the host of its URL, and the name taken from that host when the
+file has none. Rows without a password, or without a name or a source, are skipped as
+invalid.
+
+The file is read in blocks that always end on a record boundary, even when a quoted
+field spans several lines, so that blocks can be parsed independently: in the calling
+process, or by a pool of processes for large files. Names are checked for duplicates
+in memory, against a set of the names of the vault read with one query, and the new
+entries are inserted in batches with :meth:`Datas.register_many`, each batch in its
+own transaction. The listeners of the vault are not told about each entry but receive
+a single `RELOADED` change at the end of the import.
+"""
+import csv
+import io
+import os
+import time
+from collections import deque
+from dataclasses import dataclass, replace
+from threading import Event
+from typing import BinaryIO, Callable, Dict, Iterator, List, Optional, Sequence, Tuple
+from urllib.parse import urlsplit
+
+from models.data import Data, Datas, INSERTED, DUPLICATE, FAILED
+
+# Headers naming each field, lowercased, in order of preference: those of Chrome,
+# Firefox, Edge, Safari, Bitwarden, LastPass, 1Password, KeePass and of this application
+FIELD_ALIASES = {
+    "name": ("name", "title", "account", "nom"),
+    "username": ("username", "login_username", "login name", "login", "user name", "user", "email",
+                 "nom d'utilisateur", "identifiant"),
+    "password": ("password", "login_password", "mot de passe"),
+    "source": ("source", "url", "login_uri", "web site", "website", "origin", "site"),
+}
+# Size of the blocks parsed at once
+CHUNK_BYTES = 4 * 2 ** 20
+# Files larger than this are parsed by a pool of processes when several CPUs are available
+PARALLEL_THRESHOLD = 64 * 2 ** 20
+
+# A normalized row: name, username, password and source
+Row = Tuple[str, str, str, Optional[str]]
+
+
+@dataclass
+class ImportStats:
+    """
+    Progress, then outcome, of an import.
+
+    :ivar rows: The number of rows read, header excluded.
+    :type rows: int
+    :ivar inserted: The number of entries added to the vault.
+    :type inserted: int
+    :ivar duplicates: The number of rows whose name was already in the vault or earlier in the file.
+    :type duplicates: int
+    :ivar invalid: The number of rows skipped for lack of a password, or of a name and a source.
+    :type invalid: int
+    :ivar failed: The number of entries the database refused.
+    :type failed: int
+    :ivar bytes_read: The number of bytes of the file read so far.
+    :type bytes_read: int
+    :ivar total_bytes: The size of the file.
+    :type total_bytes: int
+    :ivar seconds: The time elapsed since the start of the import.
+    :type seconds: float
+    :ivar cancelled: Whether the import was stopped before the end of the file.
+    :type cancelled: bool
+    """
+    rows: int = 0
+    inserted: int = 0
+    duplicates: int = 0
+    invalid: int = 0
+    failed: int = 0
+    bytes_read: int = 0
+    total_bytes: int = 0
+    seconds: float = 0.0
+    cancelled: bool = False
+
+    @property
+    def fraction(self) -> float:
+        """The part of the file read so far, from 0 to 1."""
+        return self.bytes_read / self.total_bytes if self.total_bytes else 1.0
+
+    @property
+    def mb_per_second(self) -> float:
+        """The throughput of the import, in megabytes of the file per second."""
+        return self.bytes_read / 1e6 / self.seconds if self.seconds else 0.0
+
+
+def map_columns(header: Sequence[str]) -> Dict[str, int]:
+    """
+    Finds the column of each field of `Data` in the header of a CSV file.
+
+    :param header: The cells of the header line.
+    :raises ValueError: If there is no password column, or neither a name nor a source column.
+    :return: The index of the column of each field found.
+    """
+    cells = [cell.strip().lower() for cell in header]
+    columns = {}
+    for field, aliases in FIELD_ALIASES.items():
+        for alias in aliases:
+            if alias in cells:
+                columns[field] = cells.index(alias)
+                break
+    if "password" not in columns:
+        raise ValueError("The CSV file has no password column")
+    if "name" not in columns and "source" not in columns:
+        raise ValueError("The CSV file has neither a name nor a URL column")
+    return columns
+
+
+def normalize(cells: Sequence[str], columns: Dict[str, int]) -> Optional[Row]:
+    """
+    Builds the entry of one row of a CSV file.
+
+    :param cells: The cells of the row.
+    :param columns: The columns of the fields, as returned by :func:`map_columns`.
+    :return: The name, username, password and source of the entry, or None if the row is invalid.
+    """
+    values = {field: cells[index].strip() if index < len(cells) else "" for field, index in columns.items()}
+    password = values["password"]
+    source = values.get("source", "")
+    if "://" in source:
+        source = (urlsplit(source).hostname or "").removeprefix("www.")
+    name = " ".join(values.get("name", "").split()) or source
+    if not password or not name:
+        return None
+    return name, values.get("username", ""), password, source or None
+
+
+def parse_chunk(chunk: bytes, columns: Dict[str, int], encoding: str) -> Tuple[List[Row], int]:
+    """
+    Parses a block of whole records. Runs in the processes of the pool, so it only
+    takes and returns values that are cheap to pickle.
+
+    :param chunk: The block, which starts and ends on a record boundary.
+    :param columns: The columns of the fields, as returned by :func:`map_columns`.
+    :param encoding: The encoding of the file.
+    :return: The valid rows of the block, normalized, and the number of invalid ones.
+    """
+    rows = []
+    invalid = 0
+    for cells in csv.reader(io.StringIO(chunk.decode(encoding), newline="")):
+        if not cells:
+            continue
+        row = normalize(cells, columns)
+        if row is None:
+            invalid += 1
+        else:
+            rows.append(row)
+    return rows, invalid
+
+
+def _record_end(data: bytes) -> Optional[int]:
+    """
+    Returns the end of the last whole record of `data`, which starts on a record
+    boundary: just after the last newline outside of a quoted field. Quotes inside a
+    quoted field are doubled, so a newline is outside of any when the quotes before it
+    are even in number.
+
+    :param data: The bytes read from the file.
+    :return: The offset just after that newline, or None if `data` holds no whole record.
+    """
+    quotes = data.count(b'"')
+    end = len(data)
+    while (newline := data.rfind(b"\n", 0, end)) >= 0:
+        quotes -= data.count(b'"', newline + 1, end)
+        if quotes % 2 == 0:
+            return newline + 1
+        end = newline
+    return None
+
+
+def split_records(file: BinaryIO, chunk_bytes: int = CHUNK_BYTES) -> Iterator[bytes]:
+    """
+    Reads a CSV file in blocks of about `chunk_bytes` bytes, each one ending on a
+    record boundary, from the current position of `file`, itself a record boundary.
+
+    :param file: The file, open in binary mode.
+    :param chunk_bytes: The number of bytes read at a time.
+    :return: A generator of blocks.
+    """
+    carry = b""
+    while block := file.read(chunk_bytes):
+        data = carry + block
+        end = _record_end(data)
+        if end is None:
+            carry = data
+        else:
+            yield data[:end]
+            carry = data[end:]
+    if carry:
+        yield carry
+
+
+def _parsed_chunks(file: BinaryIO, columns: Dict[str, int], encoding: str, chunk_bytes: int,
+                   processes: int) -> Iterator[Tuple[int, List[Row], int]]:
+    """
+    Yields the size, the valid rows and the number of invalid rows of each block of
+    `file`, in order, parsed by `processes` processes, or in the calling one if 1.
+    At most two blocks per process are read ahead, which bounds the memory used.
+    """
+    chunks = split_records(file, chunk_bytes)
+    if processes <= 1:
+        for chunk in chunks:
+            yield len(chunk), *parse_chunk(chunk, columns, encoding)
+        return
+    # Imported on first use: multiprocessing would slow down every start of the application
+    from concurrent.futures import ProcessPoolExecutor
+    pool = ProcessPoolExecutor(max_workers=processes)
+    pending = deque()
+    try:
+        for chunk in chunks:
+            pending.append((len(chunk), pool.submit(parse_chunk, chunk, columns, encoding)))
+            if len(pending) >= 2 * processes:
+                size, future = pending.popleft()
+                yield size, *future.result()
+        while pending:
+            size, future = pending.popleft()
+            yield size, *future.result()
+    finally:
+        pool.shutdown(cancel_futures=True)
+
+
+def import_csv(datas: Datas, path: str, batch_size: int = 5000, processes: Optional[int] = None,
+               chunk_bytes: int = CHUNK_BYTES, encoding: str = "utf-8",
+               progress: Optional[Callable[[ImportStats], None]] = None,
+               cancel: Optional[Event] = None) -> ImportStats:
+    """
+    Adds the entries of a CSV file to `datas`, skipping the names already present. An
+    encrypted vault must be unlocked, since the passwords are encrypted as they are added.
+
+    :param datas: The vault to import into.
+    :param path: The path of the CSV file, whose first line is a header.
+    :param batch_size: The number of entries inserted per transaction.
+    :param processes: The number of processes parsing the file, 1 to parse it in the
+        calling process. By default, one per CPU for files larger than
+        `PARALLEL_THRESHOLD`, and 1 otherwise.
+    :param chunk_bytes: The size of the blocks parsed at once.
+    :param encoding: The encoding of the file. A byte order mark is ignored.
+    :param progress: Called with a copy of the statistics after each block and each
+        batch, from the thread running the import.
+    :param cancel: When set, the import stops after the current batch; the entries
+        already inserted stay in the vault.
+    :raises ValueError: If the header does not name the needed columns, or the file
+        is not in `encoding`.
+    :return: The statistics of the import.
+    """
+    if batch_size < 1:
+        raise ValueError("batch_size must be a positive integer")
+    stats = ImportStats(total_bytes=os.path.getsize(path))
+    if processes is None:
+        processes = (os.cpu_count() or 1) if stats.total_bytes > PARALLEL_THRESHOLD else 1
+    start = time.perf_counter()
+    existing = datas.name_keys()
+    pending = []
+
+    def report() -> None:
+        stats.seconds = time.perf_counter() - start
+        if progress is not None:
+            progress(replace(stats))
+
+    def flush() -> None:
+        outcomes = datas.register_many(pending, batch_size=batch_size, notify=False)
+        stats.inserted += outcomes.count(INSERTED)
+        stats.duplicates += outcomes.count(DUPLICATE)
+        stats.failed += outcomes.count(FAILED)
+        pending.clear()
+        report()
+
+    try:
+        with open(path, "rb") as file:
+            header = file.readline()
+            stats.bytes_read = len(header)
+            columns = map_columns(next(csv.reader([header.removeprefix(b"\xef\xbb\xbf").decode(encoding)]), []))
+            for size, rows, invalid in _parsed_chunks(file, columns, encoding, chunk_bytes, processes):
+                stats.bytes_read += size
+                stats.rows += len(rows) + invalid
+                stats.invalid += invalid
+                for name, username, password, source in rows:
+                    key = datas.name_key(name)
+                    if key in existing:
+                        stats.duplicates += 1
+                        continue
+                    existing.add(key)
+                    pending.append(Data(name=name, username=username, password=password, source=source))
+                    if len(pending) >= batch_size:
+                        flush()
+                        if cancel is not None and cancel.is_set():
+                            break
+                if cancel is not None and cancel.is_set():
+                    stats.cancelled = True
+                    break
+                report()
+        if pending and not stats.cancelled:
+            flush()
+    finally:
+        # The listeners of the vault read it again once, instead of once per entry
+        if stats.inserted:
+            datas.notify_reloaded()
+    report()
+    return stats
@@ -2,27 +2,99 @@
 __author__ = "<Adrien Mertens>"
 __version__ = "1.0
 """
+import os
+import re
 import sys
-from dataclasses import dataclass, field
+import time
+import queue
+import threading
+from itertools import islice
+from dataclasses import dataclass, field, replace
 import sqlite3
 from contextlib import contextmanager
-from typing import Optional, List
+from typing import Optional, Dict, List, Iterable, Iterator, Callable, Set, Tuple, Union
+from models.crypto import Cipher, KdfParams, InvalidMasterPassword, LazySecret, SecretCache, VaultLockedError, SALT_SIZE
+from models.instrumentation import Instrumentation, timed
 
-@dataclass
+# Per-row outcomes reported by Datas.register_many
+INSERTED = "inserted"
+DUPLICATE = "duplicate"
+FAILED = "failed"
+
+# Kinds of change sent to the listeners of Datas (INSERTED is shared with the outcomes)
+UPDATED = "updated"
+DELETED = "deleted"
+# Many entries changed at once, after a bulk import: listeners read everything again
+RELOADED = "reloaded"
+
+# Case folding of SQLite's NOCASE collation, which only folds ASCII letters
+_NOCASE = str.maketrans("ABCDEFGHIJKLMNOPQRSTUVWXYZ", "abcdefghijklmnopqrstuvwxyz")
+
+# Pragmas applied to every connection opened by Datas, per storage profile.
+# All profiles use write-ahead logging, so readers never block the writer.
+# "safe" syncs the log on every commit; "balanced" only at checkpoints, so a power
+# loss may drop the last commits but never corrupts the file; "fast" never syncs and
+# leaves durability to the operating system. "safe" is the default: a change confirmed
+# to the user survives a power loss; the others are only used when asked for.
+STORAGE_PROFILES = {
+    "safe": {"journal_mode": "WAL", "synchronous": "FULL", "cache_size": -2000, "mmap_size": 0,
+             "temp_store": "DEFAULT"},
+    "balanced": {"journal_mode": "WAL", "synchronous": "NORMAL", "cache_size": -16000, "mmap_size": 64 * 2 ** 20,
+                 "temp_store": "MEMORY"},
+    "fast": {"journal_mode": "WAL", "synchronous": "OFF", "cache_size": -64000, "mmap_size": 256 * 2 ** 20,
+             "temp_store": "MEMORY"},
+}
+
+@dataclass(slots=True)
 class Data:
     """
     Represents a data structure for storing user-related information.
 
     This class is designed to encapsulate basic details about a user, including
     their name, username, password, source of data, and an optional identifier.
-    It primarily serves as a container for holding these attributes.
+    It primarily serves as a container for holding these attributes. Instances
+    have no `__dict__`, which keeps large lists of entries compact; see
+    `FrozenData` for an immutable copy.
+
+    :ivar name: The full name of the user.
+    :type name: str
+    :ivar username: The username or unique identifier for the user.
+    :type username: str
+    :ivar password: The password associated with the user's account. Passwords read
+        from an encrypted vault are `LazySecret` handles, decrypted only when revealed.
+    :type password: Union[str, LazySecret]
+    :ivar source: The source from which the data originates.
+    :type source: str
+    :ivar id: A unique identifier for the user. Defaults to -1 if not provided.
+    :type id: int
+    """
+    name: str = field(default=None)
+    username: str = field(default=None)
+    password: Union[str, LazySecret] = field(default=None)
+    source: str = field(default=None)
+    id: int = field(default=-1)
+
+    def freeze(self) -> "FrozenData":
+        """
+        Returns an immutable copy of the entry.
+
+        :return: The frozen copy.
+        :rtype: FrozenData
+        """
+        return FrozenData(self.name, self.username, self.password, self.source, self.id)
+
+@dataclass(slots=True, frozen=True)
+class FrozenData:
+    """
+    Immutable and hashable counterpart of `Data`, for entries shared between
+    components that must not see them change, such as caches.
 
     :ivar name: The full name of the user.
     :type name: str
     :ivar username: The username or unique identifier for the user.
     :type username: str
     :ivar password: The password associated with the user's account.
-    :type password: str
+    :type password: Union[str, LazySecret]
     :ivar source: The source from which the data originates.
     :type source: str
     :ivar id: A unique identifier for the user. Defaults to -1 if not provided.
@@ -30,10 +102,19 @@ class Data:
     """
     name: str = field(default=None)
     username: str = field(default=None)
-    password: str = field(default=None)
+    password: Union[str, LazySecret] = field(default=None)
     source: str = field(default=None)
     id: int = field(default=-1)
 
+    def thaw(self) -> Data:
+        """
+        Returns a mutable copy of the entry.
+
+        :return: The mutable copy.
+        :rtype: Data
+        """
+        return Data(self.name, self.username, self.password, self.source, self.id)
+
 class Datas:
     """
     Manages SQLite database interactions, including table creation, data manipulation,
@@ -43,21 +124,181 @@ class Datas:
     such as adding, updating, deleting, and retrieving records from a SQLite database.
     It can handle user data and ensures the existence of the 'data' table within the database.
 
+    Connections are kept in a small pool and reused between calls instead of being
+    opened and closed for every statement. A connection checked out by a thread is
+    reused by nested calls made from that same thread. The instance can be used as a
+    context manager, or closed explicitly with :meth:`close`. Each connection is set up
+    once, when it is opened, with the pragmas of the storage profile (see
+    `STORAGE_PROFILES`).
+
+    Once a master password is set with :meth:`set_master_password`, passwords are
+    stored encrypted. The vault must then be unlocked with :meth:`unlock` before
+    passwords can be read or written; the derived key is kept for the session.
+    Entries read from an encrypted vault hold their password as a `LazySecret`: it is
+    decrypted only when revealed, and kept decrypted in a small cache for a short time.
+
+    Every successful write is reported to the listeners registered with
+    :meth:`add_listener` as a change kind (`INSERTED`, `UPDATED` or `DELETED`) and
+    the affected `Data`, so views can update themselves without reloading the table.
+    A bulk import sends a single `RELOADED` change instead, when it is done.
+    The password of a reported entry is the one stored, still encrypted if the vault is.
+
+    Removed entries are kept as tombstones, stamped with the time of their removal in
+    'deleted_at', and can be restored until they are purged: every read skips them, and
+    names are only unique among the entries that are not removed. Tombstones older than
+    a retention period are purged with :meth:`purge_deleted`, and the pages they freed
+    given back to the file system with :meth:`incremental_vacuum`.
+
     :ivar path_db: The file path to the SQLite database. Defaults to an in-memory database.
     :type path_db: str
+    :ivar pool_size: The maximum number of connections kept open. ``0`` disables pooling
+        and opens a new connection for every call.
+    :type pool_size: int
+    :ivar case_sensitive_names: Whether two names differing only by case are distinct
+        entries. Names are unique under this rule, enforced by a unique index.
+    :type case_sensitive_names: bool
+    :ivar storage_profile: The trade-off between durability and speed, one of
+        ``"safe"`` (the default), ``"balanced"`` or ``"fast"``.
+    :type storage_profile: str
+    :ivar instrumentation: The measures of the latency of the queries and of the
+        connections opened, or None while instrumentation is disabled (see :meth:`stats`).
+    :type instrumentation: Optional[Instrumentation]
     """
-    def __init__(self, path_db: str = ":memory:"):
-        """Initializes the database and ensures the 'data' table exists."""
+    # Plain text encrypted with the key of the vault to check the master password
+    VERIFIER = "easy-password"
+    # Prefix of the keys of the checkpoints saved in the vault table by register_many
+    CHECKPOINT_PREFIX = "checkpoint:"
+
+    def __init__(self, path_db: str = ":memory:", pool_size: int = 5, case_sensitive_names: bool = True,
+                 storage_profile: str = "safe", instrumented: bool = False):
+        """
+        Initializes the database, the connection pool and ensures the 'data' table exists.
+        With `instrumented`, instrumentation is enabled before the first connection is opened.
+        """
+        if pool_size < 0:
+            raise ValueError("pool_size must be a positive integer or 0")
+        if storage_profile not in STORAGE_PROFILES:
+            raise ValueError(f"storage_profile must be one of {', '.join(STORAGE_PROFILES)}")
         self.path_db = path_db
+        self.storage_profile = storage_profile
+        self.case_sensitive_names = case_sensitive_names
+        self._name_collation = "BINARY" if case_sensitive_names else "NOCASE"
+        # An in-memory database only lives as long as its connection, so it is
+        # always served by a single persistent connection.
+        self.pool_size = 1 if path_db == ":memory:" else pool_size
+        self._pool = queue.LifoQueue()
+        self._pool_lock = threading.Lock()
+        self._opened_connections = 0
+        # Connection held by each thread, by thread id, guarded by _pool_lock
+        self._owners: Dict[int, sqlite3.Connection] = {}
+        self._closed = False
+        self.instrumentation: Optional[Instrumentation] = Instrumentation() if instrumented else None
+        # Connections opened and closed over the lifetime of the instance, reported by stats()
+        self._connections_opened = 0
+        self._connections_closed = 0
+        self._counters_lock = threading.Lock()
+        self._listeners: List[Callable[[str, Data], None]] = []
+        # Connection only used to read the data version, opened on first use
+        self._monitor: Optional[sqlite3.Connection] = None
+        self._monitor_lock = threading.Lock()
+        # Set to False when the SQLite build has no FTS5, search then falls back to LIKE
+        self.full_text_search = True
+        # Cipher holding the key derived from the master password, None while locked
+        self._cipher: Optional[Cipher] = None
+        # Passwords revealed recently, wiped when evicted or when the vault is locked
+        self._secrets = SecretCache(self._decrypt_password)
         self._create_table_if_not_exists()
+        self._encrypted = self.fetch_one('''SELECT 1 FROM vault WHERE key = 'salt' ''') is not None
+
+    def __enter__(self) -> "Datas":
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb) -> None:
+        self.close()
+
+    def _open_connection(self) -> sqlite3.Connection:
+        """
+        Opens a new SQLite connection on `path_db` and applies the pragmas of the
+        storage profile. The connection may be handed to several threads over its
+        lifetime, but the pool guarantees that only one thread uses it at a time.
+
+        :return: A new SQLite connection.
+        :rtype: sqlite3.Connection
+        """
+        conn = sqlite3.connect(self.path_db, check_same_thread=False)
+        try:
+            # Only applies to a new database, and must precede write-ahead logging to do so
+            conn.execute("PRAGMA auto_vacuum = INCREMENTAL")
+            for pragma, value in STORAGE_PROFILES[self.storage_profile].items():
+                conn.execute(f"PRAGMA {pragma} = {value}")
+        except sqlite3.Error:
+            conn.close()
+            raise
+        with self._counters_lock:
+            self._connections_opened += 1
+        return conn
+
+    def _close_connection(self, conn: sqlite3.Connection) -> None:
+        """Closes a connection opened by :meth:`_open_connection`."""
+        conn.close()
+        with self._counters_lock:
+            self._connections_closed += 1
+
+    def _acquire(self) -> sqlite3.Connection:
+        """
+        Takes an idle connection from the pool, opens a new one if the pool has not
+        reached `pool_size` yet, or waits for another thread to release one.
+
+        :raises sqlite3.ProgrammingError: If the instance has been closed.
+        :return: A connection reserved for the calling thread.
+        :rtype: sqlite3.Connection
+        """
+        if self._closed:
+            raise sqlite3.ProgrammingError("Cannot operate on a closed database.")
+        if self.pool_size == 0:
+            return self._open_connection()
+        try:
+            return self._pool.get_nowait()
+        except queue.Empty:
+            pass
+        with self._pool_lock:
+            if self._opened_connections < self.pool_size:
+                self._opened_connections += 1
+                try:
+                    return self._open_connection()
+                except sqlite3.Error:
+                    self._opened_connections -= 1
+                    raise
+        return self._pool.get()
+
+    def _release(self, conn: sqlite3.Connection) -> None:
+        """
+        Gives a connection back to the pool. Any transaction left open is rolled back
+        so the next user starts from a clean state. Connections are closed instead
+        when pooling is disabled or when the instance has been closed.
+
+        :param conn: The connection to release.
+        :type conn: sqlite3.Connection
+        :return: None
+        """
+        if conn.in_transaction:
+            conn.rollback()
+        if self.pool_size == 0:
+            self._close_connection(conn)
+        elif self._closed:
+            self._close_connection(conn)
+            with self._pool_lock:
+                self._opened_connections -= 1
+        else:
+            self._pool.put(conn)
 
     @contextmanager
     def _get_connection(self)->sqlite3.Connection:
         """
-        Provides a context manager for obtaining a database connection. This method ensures
-        that the database connection is properly established and closed, handling any errors
-        that may occur during the connection process. It connects to the database using the
-        path provided in the `path_db` attribute.
+        Provides a context manager for obtaining a database connection. The connection
+        is borrowed from the pool and given back once the block exits, so steady-state
+        operations do not pay the cost of opening and closing a connection. Nested calls
+        made by the same thread reuse the connection that thread already holds.
 
         The context manager is designed to streamline the usage of SQLite connections,
         ensuring their proper cleanup in a reliable manner.
@@ -67,26 +308,203 @@ class Datas:
 
         :raises sqlite3.Error: If an error occurs while connecting to the database.
         """
-        conn = None
-        try:
-            conn = sqlite3.connect(self.path_db)
+        owner = threading.get_ident()
+        with self._pool_lock:
+            conn = self._owners.get(owner)
+        if conn is not None:
             yield conn
+            return
+        try:
+            conn = self._acquire()
         except sqlite3.Error as e:
             print(f"An error occurred while connecting to the database: {e}", file=sys.stderr)
             raise
+        with self._pool_lock:
+            self._owners[owner] = conn
+        try:
+            yield conn
         finally:
-            if conn:
-                conn.close()
+            # A generator holding the connection may be finalized by another thread: the
+            # entry of the thread that acquired it is cleared, not that of the caller
+            with self._pool_lock:
+                if self._owners.get(owner) is conn:
+                    del self._owners[owner]
+            self._release(conn)
+
+    def close(self) -> None:
+        """
+        Closes every idle pooled connection and refuses any further operation.
+        Connections still in use by other threads are closed when they are released.
+
+        :return: None
+        """
+        self._closed = True
+        while True:
+            try:
+                conn = self._pool.get_nowait()
+            except queue.Empty:
+                break
+            self._close_connection(conn)
+            with self._pool_lock:
+                self._opened_connections -= 1
+        with self._monitor_lock:
+            if self._monitor is not None:
+                self._monitor.close()
+                self._monitor = None
+
+    def data_version(self) -> int:
+        """
+        Returns a number that changes whenever a transaction is committed to the database
+        file by any connection, including the pooled connections of this instance and
+        other processes. It is read with `PRAGMA data_version` on a dedicated connection
+        that never writes. An in-memory database cannot be changed from the outside, so
+        its version is always 0.
+
+        :raises sqlite3.ProgrammingError: If the instance has been closed.
+        :return: The current version of the database file.
+        :rtype: int
+        """
+        if self.path_db == ":memory:":
+            return 0
+        with self._monitor_lock:
+            if self._closed:
+                raise sqlite3.ProgrammingError("Cannot operate on a closed database.")
+            if self._monitor is None:
+                self._monitor = sqlite3.connect(self.path_db, check_same_thread=False)
+            return self._monitor.execute("PRAGMA data_version").fetchone()[0]
+
+    def enable_instrumentation(self, slow_query_seconds: float = 0.1) -> Instrumentation:
+        """
+        Starts measuring the latency of the queries. Measures already collected are kept
+        if instrumentation is already enabled.
+
+        :param slow_query_seconds: The duration, in seconds, from which a query is logged as slow.
+        :return: The instrumentation collecting the measures.
+        :rtype: Instrumentation
+        """
+        if self.instrumentation is None:
+            self.instrumentation = Instrumentation(slow_query_seconds=slow_query_seconds)
+        else:
+            self.instrumentation.slow_query_seconds = slow_query_seconds
+        return self.instrumentation
+
+    def disable_instrumentation(self) -> None:
+        """
+        Stops measuring and forgets the measures collected. Queries then run without any
+        measuring code but a check for None.
+
+        :return: None
+        """
+        self.instrumentation = None
+
+    def stats(self) -> dict:
+        """
+        Returns the number of connections opened and closed so far, the state of the
+        connection pool and, while instrumentation is enabled, the measures collected
+        since it was: a latency histogram summary for `execute_query`, `fetch_one` and
+        `fetch_all` (and for the operations of any controller using this instance) and
+        the slow query log.
+
+        :return: A dict made of plain dicts, lists and numbers. Its ``enabled`` key tells
+            whether instrumentation is enabled; the measures, described by
+            :meth:`Instrumentation.snapshot`, are only present when it is.
+        :rtype: dict
+        """
+        with self._counters_lock:
+            connections = {"opened": self._connections_opened, "closed": self._connections_closed,
+                           "open": self._connections_opened - self._connections_closed}
+        stats = {"enabled": self.instrumentation is not None, "connections": connections,
+                 "pool": {"size": self.pool_size, "opened": self._opened_connections, "idle": self._pool.qsize()}}
+        instrumentation = self.instrumentation
+        if instrumentation is not None:
+            stats.update(instrumentation.snapshot())
+        return stats
+
+    def add_listener(self, listener: Callable[[str, Data], None]) -> None:
+        """
+        Registers a callable notified after every successful write. The listener is
+        called with the kind of change (`INSERTED`, `UPDATED` or `DELETED`) and the
+        affected `Data`, whose `id` is always set. For deletions only the `id` is known.
+        After a bulk import (see :meth:`notify_reloaded`), it is called once with
+        `RELOADED` and an empty `Data`, and should read everything it shows again.
+
+        :param listener: The callable to notify.
+        :type listener: Callable[[str, Data], None]
+        :return: None
+        """
+        self._listeners.append(listener)
+
+    def remove_listener(self, listener: Callable[[str, Data], None]) -> None:
+        """
+        Unregisters a listener previously added with :meth:`add_listener`.
+
+        :param listener: The callable to remove.
+        :type listener: Callable[[str, Data], None]
+        :return: None
+        """
+        if listener in self._listeners:
+            self._listeners.remove(listener)
+
+    def notify_reloaded(self) -> None:
+        """
+        Tells the listeners that many entries changed at once, after writes made with
+        notifications disabled, such as the batches of :meth:`register_many` called with
+        `notify=False`.
+
+        :return: None
+        """
+        self._notify(RELOADED, Data())
+
+    def _notify(self, kind: str, data: Data) -> None:
+        """
+        Sends a change to every listener. A failing listener is reported on stderr
+        and never makes the write itself fail.
+
+        :param kind: The kind of change.
+        :param data: The affected entry.
+        :return: None
+        """
+        for listener in list(self._listeners):
+            try:
+                listener(kind, data)
+            except Exception as e:
+                print(f"An error occurred while notifying a change: {e}", file=sys.stderr)
+
+    @contextmanager
+    def transaction(self) -> sqlite3.Connection:
+        """
+        Provides a context manager running the enclosed statements in a single
+        transaction on one pooled connection. The transaction is committed when the
+        block exits normally and rolled back if an exception is raised.
+
+        :yield: The connection holding the open transaction.
+        :rtype: sqlite3.Connection
+
+        :raises sqlite3.Error: If the transaction cannot be started or committed.
+        """
+        with self._get_connection() as conn:
+            conn.execute("BEGIN")
+            try:
+                yield conn
+                conn.commit()
+            except BaseException:
+                conn.rollback()
+                raise
 
     def _create_table_if_not_exists(self)->None:
         """
         Creates a table named 'data' if it does not already exist in the database. The table
         includes the following columns: 'id' as the primary key with auto-increment,
-        'name', 'username', and 'password' as non-nullable fields, and 'source' as an
-        optional field.
+        'name', 'username', and 'password' as non-nullable fields, 'source' as an
+        optional field, and 'deleted_at', the time of removal of a tombstone.
 
         This method ensures the database schema includes the necessary structure
-        for storing data.
+        for storing data, including the unique index on 'name' matching
+        `case_sensitive_names`, restricted to the entries that are not removed, and the
+        partial index of the tombstones by time of removal. When the unique index is
+        missing, as in databases created by earlier versions, the 'deleted_at' column is
+        added and duplicated names are renamed first (see
+        :meth:`_rename_duplicate_names`) so that the index can be built.
 
         :raises sqlite3.Error: If there is an issue during the execution of the SQL
             command or database connection.
@@ -97,14 +515,226 @@ class Datas:
             name TEXT NOT NULL,
             username TEXT NOT NULL,
             password TEXT NOT NULL,
-            source TEXT
+            source TEXT,
+            deleted_at REAL
         )'''
+        # Salt, key derivation parameters and verifier of the master password
+        sql_vault = '''CREATE TABLE IF NOT EXISTS vault (
+            key TEXT PRIMARY KEY,
+            value BLOB NOT NULL
+        )'''
+        # Unique indexes on the names of the entries not removed; the first two, on every entry, predate tombstones
+        indexes = ["idx_data_name", "idx_data_name_nocase", "idx_data_live_name", "idx_data_live_name_nocase"]
+        index = indexes[2] if self.case_sensitive_names else indexes[3]
         try:
-            with self._get_connection() as db:
+            with self.transaction() as db:
                 db.execute(sql)
+                db.execute(sql_vault)
+                if db.execute('''SELECT 1 FROM sqlite_master WHERE type = 'index' AND name = ?''',
+                              (index,)).fetchone() is None:
+                    if "deleted_at" not in [column[1] for column in db.execute('''PRAGMA table_info(data)''')]:
+                        db.execute('''ALTER TABLE data ADD COLUMN deleted_at REAL''')
+                    self._rename_duplicate_names(db)
+                    for other_index in indexes:
+                        db.execute(f'''DROP INDEX IF EXISTS {other_index}''')
+                    db.execute(f'''CREATE UNIQUE INDEX {index} ON data (name COLLATE {self._name_collation})
+                                  WHERE deleted_at IS NULL''')
+                db.execute('''CREATE INDEX IF NOT EXISTS idx_data_deleted_at ON data (deleted_at)
+                              WHERE deleted_at IS NOT NULL''')
+                self.full_text_search = self._create_search_index(db)
         except sqlite3.Error as e:
             raise sqlite3.Error(f"An error occurred while creating the database: {e}")
 
+    @staticmethod
+    def _create_search_index(conn: sqlite3.Connection) -> bool:
+        """
+        Creates the FTS5 table 'data_fts' indexing the 'name', 'username' and 'source'
+        columns of 'data', and the triggers keeping it in sync with every insert, update
+        and delete. When the table is created on a database that already holds entries,
+        the index is built from them.
+
+        :param conn: The connection holding the schema transaction.
+        :type conn: sqlite3.Connection
+        :return: True if the full-text index is available, False if this SQLite build
+            does not provide FTS5.
+        :rtype: bool
+        """
+        sql = '''SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'data_fts' '''
+        if conn.execute(sql).fetchone():
+            return True
+        try:
+            conn.execute('''CREATE VIRTUAL TABLE data_fts USING fts5(
+                name, username, source, content='data', content_rowid='id', prefix='2 3'
+            )''')
+        except sqlite3.OperationalError:
+            return False
+        conn.execute('''CREATE TRIGGER data_fts_insert AFTER INSERT ON data BEGIN
+            INSERT INTO data_fts (rowid, name, username, source) VALUES (new.id, new.name, new.username, new.source);
+        END''')
+        conn.execute('''CREATE TRIGGER data_fts_delete AFTER DELETE ON data BEGIN
+            INSERT INTO data_fts (data_fts, rowid, name, username, source)
+                VALUES ('delete', old.id, old.name, old.username, old.source);
+        END''')
+        conn.execute('''CREATE TRIGGER data_fts_update AFTER UPDATE OF name, username, source ON data BEGIN
+            INSERT INTO data_fts (data_fts, rowid, name, username, source)
+                VALUES ('delete', old.id, old.name, old.username, old.source);
+            INSERT INTO data_fts (rowid, name, username, source) VALUES (new.id, new.name, new.username, new.source);
+        END''')
+        conn.execute('''INSERT INTO data_fts (data_fts) VALUES ('rebuild')''')
+        return True
+
+    def _rename_duplicate_names(self, conn: sqlite3.Connection) -> None:
+        """
+        Makes names unique among the entries not removed, so that the unique index on
+        'name' can be created. For each group of entries sharing a name, the oldest entry
+        keeps it and the others are renamed "name (2)", "name (3)", and so on (see
+        :meth:`_free_name`). No entry is deleted.
+
+        :param conn: The connection holding the migration transaction.
+        :type conn: sqlite3.Connection
+        :return: None
+        """
+        collation = self._name_collation
+        duplicates = conn.execute(f'''SELECT id, name FROM data
+            WHERE deleted_at IS NULL AND name COLLATE {collation} IN (
+                SELECT name FROM data WHERE deleted_at IS NULL GROUP BY name COLLATE {collation} HAVING COUNT(*) > 1
+            ) AND id NOT IN (
+                SELECT MIN(id) FROM data WHERE deleted_at IS NULL GROUP BY name COLLATE {collation}
+            ) ORDER BY id''').fetchall()
+        for data_id, name in duplicates:
+            conn.execute('''UPDATE data SET name = ? WHERE id = ?''', (self._free_name(conn, name), data_id))
+
+    def _free_name(self, conn: sqlite3.Connection, name: str) -> str:
+        """
+        Returns the first of "name (2)", "name (3)", and so on, that no entry uses.
+
+        :param conn: The connection to read the names with.
+        :param name: The name already in use.
+        :return: A name free among the entries not removed.
+        """
+        suffix = 2
+        while conn.execute(f'''SELECT 1 FROM data WHERE name = ? COLLATE {self._name_collation}
+                               AND deleted_at IS NULL''', (f"{name} ({suffix})",)).fetchone() is not None:
+            suffix += 1
+        return f"{name} ({suffix})"
+
+    @property
+    def is_encrypted(self) -> bool:
+        """True once a master password has been set and passwords are stored encrypted."""
+        return self._encrypted
+
+    @property
+    def is_locked(self) -> bool:
+        """True while the vault is encrypted and has not been unlocked."""
+        return self._cipher is None and self.is_encrypted
+
+    def set_master_password(self, master_password: str, params: Optional[KdfParams] = None) -> None:
+        """
+        Protects a vault that has no master password yet: the key derived from
+        `master_password` is stored nowhere, only its salt, its cost parameters and an
+        encrypted verifier are. The passwords already stored in plain text are
+        encrypted in the same transaction, and the vault is left unlocked.
+
+        :param master_password: The new master password.
+        :type master_password: str
+        :param params: The cost of the key derivation. Defaults to `KdfParams()`.
+        :type params: Optional[KdfParams]
+        :raises ValueError: If the master password is empty or already set.
+        :return: None
+        """
+        if not master_password:
+            raise ValueError("The master password cannot be empty")
+        if self.is_encrypted:
+            raise ValueError("The vault already has a master password")
+        params = params or KdfParams()
+        salt = os.urandom(SALT_SIZE)
+        cipher = Cipher.from_master_password(master_password, salt, params)
+        with self.transaction() as conn:
+            conn.executemany('''INSERT INTO vault (key, value) VALUES (?, ?)''', [
+                ("salt", salt), ("kdf_n", params.n), ("kdf_r", params.r), ("kdf_p", params.p),
+                ("verifier", cipher.encrypt(self.VERIFIER, b"verifier")),
+            ])
+            last_id = 0
+            while rows := conn.execute('''SELECT id, password FROM data WHERE id > ? AND typeof(password) = 'text'
+                                          ORDER BY id LIMIT 1000''', (last_id,)).fetchall():
+                conn.executemany('''UPDATE data SET password = ? WHERE id = ?''',
+                                 [(cipher.encrypt(password, b"password"), data_id) for data_id, password in rows])
+                last_id = rows[-1][0]
+        self._encrypted = True
+        self._cipher = cipher
+
+    def unlock(self, master_password: str) -> None:
+        """
+        Unlocks an encrypted vault. The key is derived once from `master_password` with
+        the parameters stored in the vault, checked against the stored verifier, and kept
+        in memory until :meth:`lock` or the end of the session.
+
+        :param master_password: The master password of the vault.
+        :type master_password: str
+        :raises InvalidMasterPassword: If the master password is wrong.
+        :raises ValueError: If the vault has no master password.
+        :return: None
+        """
+        meta = dict(self.fetch_all('''SELECT key, value FROM vault'''))
+        if "salt" not in meta:
+            raise ValueError("The vault has no master password")
+        params = KdfParams(n=meta["kdf_n"], r=meta["kdf_r"], p=meta["kdf_p"])
+        cipher = Cipher.from_master_password(master_password, meta["salt"], params)
+        try:
+            cipher.decrypt(meta["verifier"], b"verifier")
+        except ValueError:
+            raise InvalidMasterPassword("The master password is incorrect") from None
+        self._secrets.clear()
+        self._cipher = cipher
+
+    def lock(self) -> None:
+        """
+        Forgets the key derived from the master password and wipes the passwords kept
+        decrypted. Passwords can no longer be read or written until the vault is
+        unlocked again.
+
+        :return: None
+        """
+        self._cipher = None
+        self._secrets.clear()
+
+    def _seal(self, password: Union[str, LazySecret]) -> Union[str, bytes]:
+        """
+        Returns the value to store for `password`: encrypted when the vault has a
+        master password, unchanged otherwise.
+
+        :raises VaultLockedError: If the vault is encrypted and locked.
+        """
+        if isinstance(password, LazySecret):
+            password = password.reveal()
+        if self._cipher is not None:
+            return self._cipher.encrypt(password, b"password")
+        if self.is_encrypted:
+            raise VaultLockedError("The vault must be unlocked to store a password")
+        return password
+
+    def _decrypt_password(self, token: bytes) -> str:
+        """
+        Decrypts a stored password. Called by the secret cache when a `LazySecret` is revealed.
+
+        :raises VaultLockedError: If the vault is locked.
+        """
+        cipher = self._cipher
+        if cipher is None:
+            raise VaultLockedError("The vault must be unlocked to read a password")
+        return cipher.decrypt(token, b"password")
+
+    def _stored_password(self, value: Union[str, bytes]) -> Union[str, LazySecret]:
+        """Returns the password of a `Data` for a stored value, wrapping an encrypted one in a `LazySecret`."""
+        return LazySecret(value, self._secrets) if isinstance(value, bytes) else value
+
+    def _row_to_data(self, row: tuple) -> Data:
+        """
+        Builds a `Data` from a full row of the 'data' table. An encrypted password is
+        wrapped in a `LazySecret` without being decrypted.
+        """
+        return Data(id=row[0], name=row[1], username=row[2], password=self._stored_password(row[3]), source=row[4])
+
     def execute_query(self, sql: str, params: tuple = ()) -> bool:
         """
         Executes a given SQL query with optional parameters, committing
@@ -123,15 +753,29 @@ class Datas:
             successful. Returns True if the operation succeeded, and False
             otherwise.
         """
+        return self._execute_write(sql, params) is not None
+
+    @timed("execute_query", with_statement=True)
+    def _execute_write(self, sql: str, params: tuple = ()) -> Optional[sqlite3.Cursor]:
+        """
+        Executes and commits a single statement, like :meth:`execute_query`, but gives
+        back the cursor so callers can read `lastrowid` or `rowcount`. Its latency is
+        recorded as the one of `execute_query`, which it implements.
+
+        :param sql: The SQL query to be executed.
+        :param params: The parameters of the query.
+        :return: The cursor used by the statement, or None if it failed.
+        """
         try:
             with self._get_connection() as conn:
                 cursor = conn.cursor()
                 cursor.execute(sql, params)
                 conn.commit()
-            return True
+            return cursor
         except sqlite3.Error:
-            return False
+            return None
 
+    @timed("fetch_one", with_statement=True)
     def fetch_one(self, sql: str, params: tuple = ()) -> Optional[tuple]:
         """
         Fetches a single row from the database by executing the provided SQL query with
@@ -157,6 +801,7 @@ class Datas:
             print(f"An error occurred while fetching data: {e}", file=sys.stderr)
             return None
 
+    @timed("fetch_all", with_statement=True)
     def fetch_all(self, sql: str, params: tuple = ()) -> List[tuple]:
         """
         Executes a SQL query and retrieves all rows from the result set. This
@@ -179,56 +824,229 @@ class Datas:
             print(f"An error occurred while fetching data: {e}", file=sys.stderr)
             return []
 
+    def _iter_rows(self, sql: str, params: tuple = (), batch_size: int = 500) -> Iterator[tuple]:
+        """
+        Yields the rows of a query as they are read, pulling `batch_size` rows at a time
+        with `fetchmany`, so that only one batch is held in memory. The connection stays
+        checked out by the calling thread until the generator is exhausted or closed,
+        and is shared with the calls that thread makes meanwhile. If an error occurs,
+        it is logged to the standard error and the iteration stops.
+
+        :param sql: The SQL query to be executed.
+        :param params: A tuple of parameters to substitute into the query. Optional.
+        :param batch_size: The number of rows fetched at a time.
+        :return: A generator of rows.
+        """
+        try:
+            with self._get_connection() as conn:
+                cursor = conn.execute(sql, params)
+                while rows := cursor.fetchmany(batch_size):
+                    yield from rows
+        except sqlite3.Error as e:
+            print(f"An error occurred while fetching data: {e}", file=sys.stderr)
+
     def check_if_user_data_exists(self, data: Data) -> bool:
         """
         Checks if the user data exists in the database by querying for specific
         records with the provided name. This function sends a query to the database
-        and evaluates whether the specified user data is present.
+        and evaluates whether the specified user data is present. The lookup uses the
+        unique index on 'name' and follows `case_sensitive_names`.
 
         :param data: A `Data` object containing the `name` attribute
                      to search for in the database.
         :return: A boolean indicating whether the user data exists
                  (`True`) or not (`False`).
         """
-        sql = '''SELECT 1 FROM data WHERE name = ?'''
+        sql = f'''SELECT 1 FROM data WHERE name = ? COLLATE {self._name_collation} AND deleted_at IS NULL'''
         result = self.fetch_one(sql, (data.name,))
         return result is not None
 
     def register_data(self, data: Data) -> bool:
         """
-        Registers the provided user data into the database. The method checks if the user
-        data already exists. If it does not exist, the data is inserted into the database.
-        If it already exists, the operation is skipped, and the method returns False.
+        Registers the provided user data into the database. The data is inserted in a single
+        statement: if an entry with the same name already exists, the unique index makes the
+        insertion a no-op, and the method returns False.
 
         :param data: The user data object containing the name, username, password,
                      and source details to be registered in the database of type `Data`.
         :return: True if the data is successfully inserted into the database. Returns
                  False if the data already exists.
         """
-        if not self.check_if_user_data_exists(data):
-            sql = '''INSERT INTO data (name, username, password, source) VALUES (?, ?, ?, ?)'''
-            return self.execute_query(sql, (data.name, data.username, data.password, data.source))
-        else:
+        sql = '''INSERT INTO data (name, username, password, source) VALUES (?, ?, ?, ?)
+                 ON CONFLICT DO NOTHING'''
+        sealed = self._seal(data.password)
+        cursor = self._execute_write(sql, (data.name, data.username, sealed, data.source))
+        if cursor is None or cursor.rowcount == 0:
             return False
+        self._notify(INSERTED, replace(data, id=cursor.lastrowid, password=self._stored_password(sealed)))
+        return True
 
     def remove_data(self, id_data: int) -> bool:
         """
         Removes a data entry from the database based on the provided ID.
 
-        This function checks if a data entry exists in the database with the given
-        ID. If the entry exists, it executes an SQL query to remove it from the
-        database. The function returns a boolean value indicating the success of the
-        removal operation.
+        The entry is not deleted but turned into a tombstone, stamped with the time of
+        its removal by a single statement, so that it can be restored with
+        :meth:`restore_data` or :meth:`undo_last_delete` until it is purged. The function
+        returns a boolean value indicating the success of the removal operation.
 
         :param id_data: The ID of the data entry to be removed.
         :type id_data: int
         :return: True if the data entry was successfully removed, otherwise False.
         :rtype: bool
         """
-        if self.get_one_data_in_db(id_data):
-            sql = '''DELETE FROM data WHERE id = ?'''
-            return self.execute_query(sql, (id_data,))
-        return False
+        sql = '''UPDATE data SET deleted_at = ? WHERE id = ? AND deleted_at IS NULL'''
+        cursor = self._execute_write(sql, (time.time(), id_data))
+        if cursor is None or cursor.rowcount == 0:
+            return False
+        self._notify(DELETED, Data(id=id_data))
+        return True
+
+    def remove_many(self, ids: Iterable[int], batch_size: int = 500) -> List[int]:
+        """
+        Removes many entries at once, like :meth:`remove_data`, inside a single
+        transaction and with one statement per batch of `batch_size` ids. Every entry
+        gets the same time of removal, so :meth:`undo_last_delete` restores them together.
+
+        :param ids: The ids of the entries to remove.
+        :type ids: Iterable[int]
+        :param batch_size: The number of ids per statement.
+        :type batch_size: int
+        :return: The ids of the entries removed, without those that did not exist or were
+            already removed.
+        :rtype: List[int]
+        """
+        if batch_size < 1:
+            raise ValueError("batch_size must be a positive integer")
+        removed = []
+        deleted_at = time.time()
+        iterator = iter(ids)
+        try:
+            with self.transaction() as conn:
+                while batch := list(islice(iterator, batch_size)):
+                    placeholders = ",".join("?" * len(batch))
+                    removed += [row[0] for row in conn.execute(
+                        f'''UPDATE data SET deleted_at = ? WHERE id IN ({placeholders}) AND deleted_at IS NULL
+                            RETURNING id''', (deleted_at, *batch))]
+        except sqlite3.Error as e:
+            print(f"An error occurred while removing data: {e}", file=sys.stderr)
+            return []
+        for data_id in removed:
+            self._notify(DELETED, Data(id=data_id))
+        return removed
+
+    def list_deleted(self, limit: int = 100) -> List[Tuple[int, str, float]]:
+        """
+        Lists the tombstones, the most recently removed first, read from the partial
+        index of the tombstones.
+
+        :param limit: The maximum number of tombstones returned.
+        :type limit: int
+        :return: The `(id, name, deleted_at)` tuples, `deleted_at` in seconds since the epoch.
+        :rtype: List[Tuple[int, str, float]]
+        """
+        sql = '''SELECT id, name, deleted_at FROM data WHERE deleted_at IS NOT NULL ORDER BY deleted_at DESC, id
+                 LIMIT ?'''
+        return self.fetch_all(sql, (limit,))
+
+    def restore_data(self, data_id: int) -> bool:
+        """
+        Restores a removed entry. If another entry has taken its name in the meantime,
+        the restored entry is renamed "name (2)", "name (3)", and so on.
+
+        :param data_id: The id of the removed entry.
+        :type data_id: int
+        :return: True if the entry was restored, False if it is not a tombstone, for
+            instance because it has been purged.
+        :rtype: bool
+        """
+        return bool(self._restore('''id = ?''', (data_id,)))
+
+    def undo_last_delete(self) -> List[int]:
+        """
+        Restores the entries removed by the last call to :meth:`remove_data` or
+        :meth:`remove_many`, as :meth:`restore_data` does.
+
+        :return: The ids of the restored entries, empty if there is no tombstone.
+        :rtype: List[int]
+        """
+        return self._restore('''deleted_at = (SELECT MAX(deleted_at) FROM data WHERE deleted_at IS NOT NULL)''')
+
+    def _restore(self, condition: str, params: tuple = ()) -> List[int]:
+        """
+        Restores the tombstones matching `condition` in one transaction, renaming those
+        whose name is taken, then reports them to the listeners as inserted.
+
+        :param condition: The SQL condition selecting the tombstones.
+        :param params: The parameters of the condition.
+        :return: The ids of the restored entries.
+        """
+        restored = []
+        try:
+            with self.transaction() as conn:
+                rows = conn.execute(f'''SELECT * FROM data WHERE {condition} AND deleted_at IS NOT NULL ORDER BY id''',
+                                    params).fetchall()
+                for row in rows:
+                    data = self._row_to_data(row)
+                    if conn.execute(f'''SELECT 1 FROM data WHERE name = ? COLLATE {self._name_collation}
+                                        AND deleted_at IS NULL''', (data.name,)).fetchone() is not None:
+                        data.name = self._free_name(conn, data.name)
+                    conn.execute('''UPDATE data SET name = ?, deleted_at = NULL WHERE id = ?''', (data.name, data.id))
+                    restored.append(data)
+        except sqlite3.Error as e:
+            print(f"An error occurred while restoring data: {e}", file=sys.stderr)
+            return []
+        for data in restored:
+            self._notify(INSERTED, data)
+        return [data.id for data in restored]
+
+    def purge_deleted(self, older_than_days: float = 30, limit: int = 500) -> int:
+        """
+        Deletes for good at most `limit` tombstones removed more than `older_than_days`
+        days ago, the oldest first, found with the partial index of the tombstones. Each
+        call is one short transaction, so a large purge is made of several calls that
+        let other writers run in between (see `controllers.compactor.Compactor`).
+
+        :param older_than_days: The retention period of the tombstones.
+        :type older_than_days: float
+        :param limit: The maximum number of tombstones deleted.
+        :type limit: int
+        :return: The number of tombstones deleted, 0 when none is left to purge.
+        :rtype: int
+        """
+        sql = '''DELETE FROM data WHERE id IN (
+                     SELECT id FROM data WHERE deleted_at < ? ORDER BY deleted_at LIMIT ?
+                 )'''
+        cursor = self._execute_write(sql, (time.time() - older_than_days * 86400, limit))
+        return 0 if cursor is None else cursor.rowcount
+
+    def incremental_vacuum(self, max_pages: Optional[int] = None) -> int:
+        """
+        Gives free pages of the database file back to the file system, such as those
+        freed by :meth:`purge_deleted`, without rewriting the whole file as `VACUUM`
+        would. That needs incremental auto-vacuum, which this class sets on the databases
+        it creates but which SQLite only lets an existing database switch to by rewriting
+        it: a database created before tombstones existed is switched once, by the first
+        call, with a full `VACUUM` that also gives back all its free pages.
+
+        :param max_pages: The maximum number of pages given back, all of them if None.
+        :type max_pages: Optional[int]
+        :return: The number of pages given back.
+        :rtype: int
+        """
+        try:
+            with self._get_connection() as conn:
+                before = conn.execute('''PRAGMA freelist_count''').fetchone()[0]
+                if conn.execute('''PRAGMA auto_vacuum''').fetchone()[0] != 2:
+                    # Not in incremental mode (2): switched once, by rewriting the file
+                    conn.executescript('''PRAGMA auto_vacuum = INCREMENTAL; VACUUM''')
+                else:
+                    # A script runs the pragma to completion, where execute() would free a single page
+                    conn.executescript(f'''PRAGMA incremental_vacuum({max_pages or 0})''')
+                return before - conn.execute('''PRAGMA freelist_count''').fetchone()[0]
+        except sqlite3.Error as e:
+            print(f"An error occurred while vacuuming the database: {e}", file=sys.stderr)
+            return 0
 
     def modify_data(self, data_id: int, new_data: Data) -> bool:
         """
@@ -244,8 +1062,12 @@ class Datas:
         :return: Returns True if the data was successfully updated, and False otherwise.
         """
         if self.get_one_data_in_db(data_id):
-            sql = '''UPDATE data SET name = ?, username = ?, password = ?, source = ? WHERE id = ?'''
-            return self.execute_query(sql, (new_data.name, new_data.username, new_data.password, new_data.source, data_id))
+            sql = '''UPDATE data SET name = ?, username = ?, password = ?, source = ?
+                     WHERE id = ? AND deleted_at IS NULL'''
+            sealed = self._seal(new_data.password)
+            if self.execute_query(sql, (new_data.name, new_data.username, sealed, new_data.source, data_id)):
+                self._notify(UPDATED, replace(new_data, id=data_id, password=self._stored_password(sealed)))
+                return True
         return False
 
     def get_all_Data_in_db(self) -> List[Data]:
@@ -254,16 +1076,31 @@ class Datas:
 
         This method executes a SQL query to fetch all rows from the "data" table
         and maps each row to a `Data` object. The resulting list of `Data` objects
-        is then returned.
+        is then returned. Prefer :meth:`iter_all` when the entries are processed one
+        by one, which keeps a single batch of rows in memory.
 
         :raises DatabaseError: If there is an issue with executing the SQL query.
 
         :return: A list of `Data` objects representing all entries in the database.
         :rtype: List[Data]
         """
-        sql = '''SELECT * FROM data'''
-        results = self.fetch_all(sql)
-        return [Data(id=row[0], name=row[1], username=row[2], password=row[3], source=row[4]) for row in results]
+        return list(self.iter_all())
+
+    def iter_all(self, batch_size: int = 500) -> Iterator[Data]:
+        """
+        Yields every entry, ordered by id, as a `Data` object built only when it is
+        reached. Rows are pulled `batch_size` at a time, so peak memory depends on the
+        batch size rather than on the size of the vault. The generator should be
+        consumed entirely or closed, since it holds a pooled connection until then.
+
+        :param batch_size: The number of rows fetched at a time.
+        :type batch_size: int
+        :return: A generator of entries.
+        :rtype: Iterator[Data]
+        """
+        for row in self._iter_rows('''SELECT * FROM data WHERE deleted_at IS NULL ORDER BY id''',
+                                   batch_size=batch_size):
+            yield self._row_to_data(row)
 
     def get_one_data_in_db(self, data_id: int) -> Optional[Data]:
         """
@@ -278,8 +1115,254 @@ class Datas:
             None if no entry is found.
         :rtype: Optional[Data]
         """
-        sql = '''SELECT * FROM data WHERE id = ?'''
+        sql = '''SELECT * FROM data WHERE id = ? AND deleted_at IS NULL'''
         row = self.fetch_one(sql, (data_id,))
         if row:
-            return Data(id=row[0], name=row[1], username=row[2], password=row[3], source=row[4])
+            return self._row_to_data(row)
+        return None
+
+    def get_one_data_by_name(self, name: str) -> Optional[Data]:
+        """
+        Retrieves a single data entry by its name, using the unique index on 'name' and
+        following `case_sensitive_names`.
+
+        :param name: The name of the entry.
+        :return: The entry, or None if no entry has this name.
+        :rtype: Optional[Data]
+        """
+        sql = f'''SELECT * FROM data WHERE name = ? COLLATE {self._name_collation} AND deleted_at IS NULL'''
+        row = self.fetch_one(sql, (name,))
+        if row:
+            return self._row_to_data(row)
         return None
+
+    def name_key(self, name: str) -> str:
+        """
+        Returns the form of `name` compared by the unique index on 'name': the name
+        itself, or with ASCII letters lowered when `case_sensitive_names` is False.
+
+        :param name: The name of an entry.
+        :return: Its key, equal for two names the database considers duplicates.
+        """
+        return name if self.case_sensitive_names else name.translate(_NOCASE)
+
+    def name_keys(self) -> Set[str]:
+        """
+        Returns the keys (see :meth:`name_key`) of every name in the database, read with
+        one query, so that many candidate entries can be checked for duplicates in memory.
+
+        :return: The set of the keys.
+        :rtype: Set[str]
+        """
+        return {self.name_key(name) for name, in self._iter_rows('''SELECT name FROM data WHERE deleted_at IS NULL''',
+                                                                           batch_size=5000)}
+
+    def get_page(self, after_id: int = 0, limit: int = 100) -> List[Data]:
+        """
+        Retrieves one page of entries ordered by id, starting right after `after_id`.
+        Pages are selected by key rather than by offset, so reading a page costs the
+        same whatever its position in a large table. Passing the id of the last entry
+        of a page as `after_id` gives the next page.
+
+        :param after_id: The id after which the page starts. Defaults to 0 (first page).
+        :type after_id: int
+        :param limit: The maximum number of entries in the page.
+        :type limit: int
+        :return: The entries of the page, fewer than `limit` if it is the last one.
+        :rtype: List[Data]
+        """
+        sql = '''SELECT * FROM data WHERE id > ? AND deleted_at IS NULL ORDER BY id LIMIT ?'''
+        results = self.fetch_all(sql, (after_id, limit))
+        return [self._row_to_data(row) for row in results]
+
+    def list_names(self, after_id: int = 0, limit: Optional[int] = None) -> List[Tuple[int, str]]:
+        """
+        Lists the entries as `(id, name)` tuples ordered by id, without reading their
+        username, password or source. This is what listing views need, and it keeps
+        secrets out of memory until an entry is actually opened with
+        :meth:`get_one_data_in_db`. Like :meth:`get_page`, the listing can be read page
+        by page by passing the last id received as `after_id`.
+
+        :param after_id: The id after which the listing starts. Defaults to 0.
+        :type after_id: int
+        :param limit: The maximum number of entries returned, or None for all of them.
+        :type limit: Optional[int]
+        :return: The `(id, name)` tuples.
+        :rtype: List[Tuple[int, str]]
+        """
+        sql = '''SELECT id, name FROM data WHERE id > ? AND deleted_at IS NULL ORDER BY id LIMIT ?'''
+        return self.fetch_all(sql, (after_id, -1 if limit is None else limit))
+
+    def list_names_and_sources(self) -> List[Tuple[int, str, Optional[str]]]:
+        """
+        Lists every entry as an `(id, name, source)` tuple ordered by id, without reading
+        usernames or passwords.
+
+        :return: The `(id, name, source)` tuples.
+        :rtype: List[Tuple[int, str, Optional[str]]]
+        """
+        return list(self.iter_names_and_sources())
+
+    def iter_names_and_sources(self, batch_size: int = 500) -> Iterator[Tuple[int, str, Optional[str]]]:
+        """
+        Yields every entry as an `(id, name, source)` tuple ordered by id, pulling rows
+        `batch_size` at a time. This is the input of the in-memory fuzzy search index.
+
+        :param batch_size: The number of rows fetched at a time.
+        :type batch_size: int
+        :return: A generator of `(id, name, source)` tuples.
+        :rtype: Iterator[Tuple[int, str, Optional[str]]]
+        """
+        return self._iter_rows('''SELECT id, name, source FROM data WHERE deleted_at IS NULL ORDER BY id''',
+                               batch_size=batch_size)
+
+    def search(self, query: str, limit: int = 100) -> List[Tuple[int, str]]:
+        """
+        Searches the entries whose name, username or source contain every word of
+        `query`, each word matching as a prefix ("gma" finds "gmail"). Results come from
+        the FTS5 index, best matches first, as `(id, name)` tuples like :meth:`list_names`.
+        Without FTS5, the search falls back to a slower substring scan ordered by id.
+        Removed entries stay in the index until purged, and are filtered out.
+
+        :param query: The words to search for. Punctuation is ignored.
+        :type query: str
+        :param limit: The maximum number of results.
+        :type limit: int
+        :return: The matching `(id, name)` tuples, or an empty list if `query` has no word.
+        :rtype: List[Tuple[int, str]]
+        """
+        words = re.findall(r"\w+", query)
+        if not words:
+            return []
+        if self.full_text_search:
+            sql = '''SELECT data.id, data.name FROM data_fts JOIN data ON data.id = data_fts.rowid
+                     WHERE data_fts MATCH ? AND data.deleted_at IS NULL ORDER BY rank LIMIT ?'''
+            return self.fetch_all(sql, (" ".join(f'"{word}"*' for word in words), limit))
+        condition = "(name LIKE ? ESCAPE '\\' OR username LIKE ? ESCAPE '\\' OR source LIKE ? ESCAPE '\\')"
+        sql = f'''SELECT id, name FROM data WHERE {" AND ".join([condition] * len(words))} AND deleted_at IS NULL
+                  ORDER BY id LIMIT ?'''
+        params = []
+        for word in words:
+            escaped = word.replace("_", "\\_")
+            params += [f"%{escaped}%"] * 3
+        return self.fetch_all(sql, (*params, limit))
+
+    def register_many(self, datas: Iterable[Data], batch_size: int = 500,
+                      checkpoint: Optional[Tuple[str, int]] = None, notify: bool = True) -> List[str]:
+        """
+        Registers many entries at once inside a single transaction. The input is consumed
+        lazily in batches of `batch_size`, so it can be a generator of any length. For each
+        batch, the names already present in the database are found with one query and the
+        remaining entries are inserted with `executemany`. An entry whose name appears twice
+        in the input is only inserted once.
+
+        Listeners are told about the inserted entries once the transaction is committed.
+        Nothing is kept for them meanwhile: the transaction holds the write lock, so the
+        entries it inserts are exactly those with an id above the highest id found when
+        it started, and they are read back from the database as they are notified, so
+        that memory stays bounded whatever the size of the input.
+
+        :param datas: The entries to register, typically a generator.
+        :type datas: Iterable[Data]
+        :param batch_size: The number of entries checked and inserted per statement.
+        :type batch_size: int
+        :param checkpoint: A `(key, value)` pair saved in the same transaction, read back
+            with :meth:`get_checkpoint`, so that a caller registering entries over several
+            calls knows how far it got, even after a failure.
+        :type checkpoint: Optional[Tuple[str, int]]
+        :param notify: Whether the listeners are told about each inserted entry. A bulk
+            import disables it and calls :meth:`notify_reloaded` once it is done.
+        :type notify: bool
+        :return: One outcome per input entry, in input order: `INSERTED`, `DUPLICATE`
+            or `FAILED`.
+        :rtype: List[str]
+        """
+        if batch_size < 1:
+            raise ValueError("batch_size must be a positive integer")
+        outcomes = []
+        # Ids of the entries inserted, from first_id excluded to last_id included
+        first_id = last_id = 0
+        iterator = iter(datas)
+        try:
+            with self.transaction() as conn:
+                first_id = conn.execute('''SELECT COALESCE(MAX(id), 0) FROM data''').fetchone()[0]
+                while batch := list(islice(iterator, batch_size)):
+                    outcomes.extend(self._register_batch(conn, batch))
+                last_id = conn.execute('''SELECT COALESCE(MAX(id), 0) FROM data''').fetchone()[0]
+                if checkpoint is not None:
+                    key, value = checkpoint
+                    conn.execute('''INSERT OR REPLACE INTO vault (key, value) VALUES (?, ?)''',
+                                 (self.CHECKPOINT_PREFIX + key, value))
+        except sqlite3.Error as e:
+            print(f"An error occurred while registering data: {e}", file=sys.stderr)
+            return [FAILED if outcome == INSERTED else outcome for outcome in outcomes]
+        if notify and self._listeners and last_id > first_id:
+            for row in self._iter_rows('''SELECT * FROM data WHERE id > ? AND id <= ? AND deleted_at IS NULL
+                                          ORDER BY id''', (first_id, last_id)):
+                self._notify(INSERTED, self._row_to_data(row))
+        return outcomes
+
+    def get_checkpoint(self, key: str) -> Optional[int]:
+        """
+        Returns the value of a checkpoint saved by :meth:`register_many`.
+
+        :param key: The key of the checkpoint.
+        :return: Its value, or None if it was never saved or has been removed.
+        """
+        row = self.fetch_one('''SELECT value FROM vault WHERE key = ?''', (self.CHECKPOINT_PREFIX + key,))
+        return row[0] if row else None
+
+    def remove_checkpoint(self, key: str) -> None:
+        """
+        Removes a checkpoint once the work it tracks is complete.
+
+        :param key: The key of the checkpoint.
+        :return: None
+        """
+        self.execute_query('''DELETE FROM vault WHERE key = ?''', (self.CHECKPOINT_PREFIX + key,))
+
+    def _register_batch(self, conn: sqlite3.Connection, batch: List[Data]) -> List[str]:
+        """
+        Inserts one batch of `register_many` on a connection holding an open transaction.
+        If the bulk insert fails, the batch is rolled back to a savepoint and retried row
+        by row so that only the offending entries are reported, as duplicates when they
+        hit the unique index on 'name' and as failed otherwise. Duplicates are found
+        beforehand by their keys (see :meth:`name_key`), so a batch only takes that slow
+        path when the database refuses an entry for another reason.
+
+        :param conn: The connection holding the transaction.
+        :param batch: The entries of the batch.
+        :return: One outcome per entry of the batch.
+        """
+        placeholders = ",".join("?" * len(batch))
+        existing = {self.name_key(row[0]) for row in conn.execute(
+            f"SELECT name FROM data WHERE name COLLATE {self._name_collation} IN ({placeholders}) "
+            f"AND deleted_at IS NULL",
+            [data.name for data in batch])}
+        outcomes = []
+        pending = []
+        for data in batch:
+            if data.name is None or data.username is None or data.password is None:
+                outcomes.append(FAILED)
+            elif (key := self.name_key(data.name)) in existing:
+                outcomes.append(DUPLICATE)
+            else:
+                existing.add(key)
+                pending.append((len(outcomes), (data.name, data.username, self._seal(data.password), data.source)))
+                outcomes.append(INSERTED)
+
+        sql = '''INSERT INTO data (name, username, password, source) VALUES (?, ?, ?, ?)'''
+        conn.execute("SAVEPOINT register_batch")
+        try:
+            conn.executemany(sql, [params for _, params in pending])
+        except sqlite3.Error:
+            conn.execute("ROLLBACK TO register_batch")
+            for index, params in pending:
+                try:
+                    conn.execute(sql, params)
+                except sqlite3.IntegrityError as e:
+                    outcomes[index] = DUPLICATE if "UNIQUE" in str(e) else FAILED
+                except sqlite3.Error:
+                    outcomes[index] = FAILED
+        conn.execute("RELEASE register_batch")
+        return outcomes
@@ -0,0 +1,223 @@
+"""
+__author__ = "Adrien Mertens"
+__version__ = "1.0"
+"""
+import threading
+import time
+from bisect import bisect_left, insort
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Tuple
+
+from models.data import Data, Datas, FrozenData, DELETED, RELOADED
+
+
+@dataclass
+class CacheStats:
+    """
+    Counters of a `DataCache`.
+
+    :ivar hits: The number of reads served from memory.
+    :type hits: int
+    :ivar misses: The number of reads that went to the database.
+    :type misses: int
+    :ivar invalidations: The number of times the cache was emptied because the
+        database was modified by another process.
+    :type invalidations: int
+    :ivar hit_seconds: The total time spent serving hits.
+    :type hit_seconds: float
+    :ivar miss_seconds: The total time spent serving misses.
+    :type miss_seconds: float
+    """
+    hits: int = 0
+    misses: int = 0
+    invalidations: int = 0
+    hit_seconds: float = 0.0
+    miss_seconds: float = 0.0
+
+    @property
+    def hit_ratio(self) -> float:
+        """The fraction of reads served from memory."""
+        reads = self.hits + self.misses
+        return self.hits / reads if reads else 0.0
+
+    @property
+    def mean_hit_latency(self) -> float:
+        """The mean time, in seconds, to serve a hit."""
+        return self.hit_seconds / self.hits if self.hits else 0.0
+
+    @property
+    def mean_miss_latency(self) -> float:
+        """The mean time, in seconds, to serve a miss."""
+        return self.miss_seconds / self.misses if self.misses else 0.0
+
+
+class DataCache:
+    """
+    Write-through cache of the entries of a `Datas`: a map from id to entry, filled as
+    entries are read, and the list of names sorted alphabetically.
+
+    The cache listens to the changes of `Datas`, so every write made in this process,
+    whichever controller makes it, updates the cached entry instead of evicting it.
+    Writes made by other processes are detected with :meth:`Datas.data_version`
+    before every read and empty the cache. Entries are kept frozen and handed out as
+    copies, so callers cannot alter them; encrypted passwords stay encrypted.
+
+    A write made by another process in the instant between a write of this process
+    and the update of the known version may go unnoticed until the next change.
+    """
+    def __init__(self, datas: Datas) -> None:
+        """
+        Attaches the cache to `datas`.
+
+        :param datas: The data layer to cache.
+        """
+        self.__datas = datas
+        self.__lock = threading.RLock()
+        self.__entries: Dict[int, FrozenData] = {}
+        # Whether every entry of the database is in __entries
+        self.__complete = False
+        # Sort keys of the names, and the key of each id, built on first use
+        self.__names: Optional[List[Tuple[str, int, str]]] = None
+        self.__name_keys: Dict[int, Tuple[str, int, str]] = {}
+        # Incremented by every change, so that a read racing with a write is not cached
+        self.__generation = 0
+        self.__version = datas.data_version()
+        self.stats = CacheStats()
+        datas.add_listener(self.on_data_changed)
+
+    def close(self) -> None:
+        """
+        Detaches the cache from its `Datas` and forgets the cached entries.
+
+        :return: None
+        """
+        self.__datas.remove_listener(self.on_data_changed)
+        self.invalidate()
+
+    def invalidate(self) -> None:
+        """
+        Forgets every cached entry.
+
+        :return: None
+        """
+        with self.__lock:
+            self.__generation += 1
+            self.__entries.clear()
+            self.__complete = False
+            self.__names = None
+            self.__name_keys.clear()
+
+    def _check_version(self) -> None:
+        """Empties the cache if the database was modified by another process."""
+        version = self.__datas.data_version()
+        if version != self.__version:
+            self.invalidate()
+            self.__version = version
+            self.stats.invalidations += 1
+
+    def get(self, data_id: int) -> Optional[Data]:
+        """
+        Returns an entry, from memory when it has been read or written before.
+
+        :param data_id: The id of the entry.
+        :return: A copy of the entry, or None if it does not exist.
+        """
+        start = time.perf_counter()
+        with self.__lock:
+            self._check_version()
+            entry = self.__entries.get(data_id)
+            if entry is not None or self.__complete:
+                self.stats.hits += 1
+                self.stats.hit_seconds += time.perf_counter() - start
+                return entry.thaw() if entry is not None else None
+            generation = self.__generation
+        data = self.__datas.get_one_data_in_db(data_id)
+        with self.__lock:
+            if data is not None and generation == self.__generation:
+                self.__entries[data_id] = data.freeze()
+            self.stats.misses += 1
+            self.stats.miss_seconds += time.perf_counter() - start
+        return data
+
+    def get_all(self) -> List[Data]:
+        """
+        Returns every entry ordered by id. The first call reads the whole table, the
+        following ones are served from memory.
+
+        :return: Copies of the entries.
+        """
+        start = time.perf_counter()
+        with self.__lock:
+            self._check_version()
+            if self.__complete:
+                entries = [self.__entries[data_id].thaw() for data_id in sorted(self.__entries)]
+                self.stats.hits += 1
+                self.stats.hit_seconds += time.perf_counter() - start
+                return entries
+            generation = self.__generation
+        entries = self.__datas.get_all_Data_in_db()
+        with self.__lock:
+            if generation == self.__generation:
+                self.__entries = {data.id: data.freeze() for data in entries}
+                self.__complete = True
+            self.stats.misses += 1
+            self.stats.miss_seconds += time.perf_counter() - start
+        return entries
+
+    def sorted_names(self) -> List[Tuple[int, str]]:
+        """
+        Returns the `(id, name)` pairs of every entry, sorted by name regardless of case.
+
+        :return: The sorted pairs.
+        """
+        start = time.perf_counter()
+        with self.__lock:
+            self._check_version()
+            if self.__names is not None:
+                names = [(data_id, name) for _, data_id, name in self.__names]
+                self.stats.hits += 1
+                self.stats.hit_seconds += time.perf_counter() - start
+                return names
+            generation = self.__generation
+        keys = sorted(self._name_key(data_id, name) for data_id, name in self.__datas.list_names())
+        with self.__lock:
+            if generation == self.__generation:
+                self.__names = keys
+                self.__name_keys = {key[1]: key for key in keys}
+            self.stats.misses += 1
+            self.stats.miss_seconds += time.perf_counter() - start
+        return [(data_id, name) for _, data_id, name in keys]
+
+    @staticmethod
+    def _name_key(data_id: int, name: str) -> Tuple[str, int, str]:
+        """Returns the sort key of a name, ties broken by id."""
+        return name.casefold(), data_id, name
+
+    def on_data_changed(self, kind: str, data: Data) -> None:
+        """
+        Applies a write reported by `Datas` to the cached entries and names, then takes
+        the resulting version of the database as known.
+
+        :param kind: The kind of change (`INSERTED`, `UPDATED`, `DELETED`, or `RELOADED`
+            which empties the cache).
+        :param data: The entry affected by the change.
+        :return: None
+        """
+        with self.__lock:
+            if kind == RELOADED:
+                self.invalidate()
+                self.__version = self.__datas.data_version()
+                return
+            self.__generation += 1
+            if kind == DELETED:
+                self.__entries.pop(data.id, None)
+            else:
+                self.__entries[data.id] = data.freeze()
+            if self.__names is not None:
+                old_key = self.__name_keys.pop(data.id, None)
+                if old_key is not None:
+                    del self.__names[bisect_left(self.__names, old_key)]
+                if kind != DELETED:
+                    new_key = self.__name_keys[data.id] = self._name_key(data.id, data.name)
+                    insort(self.__names, new_key)
+            self.__version = self.__datas.data_version()
@@ -0,0 +1,107 @@
+"""
+__author__ = "Adrien Mertens"
+__version__ = "1.0"
+"""
+from array import array
+from bisect import bisect_left
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+
+from models.data import Data
+
+
+class DataTable:
+    """
+    Compact, column-oriented listing of entries, for the paths that only need their
+    id, name and source. Ids are kept in a typed array and names in a list; sources,
+    shared by many entries, are stored once and referenced by a small integer code.
+    A million entries take a fraction of the memory of a million `Data` objects.
+
+    The table can still be used where a list of `Data` is expected: iterating or
+    indexing it builds the `Data` objects on the fly, without username or password.
+    Rows must be appended in increasing id order, as read from `Datas`, which lets
+    :meth:`index_of` find an id by bisection.
+
+    :ivar ids: The id of each row.
+    :type ids: array
+    :ivar names: The name of each row.
+    :type names: List[str]
+    """
+    def __init__(self) -> None:
+        self.ids = array("q")
+        self.names: List[str] = []
+        # Code of the source of each row, index into __sources
+        self.__source_codes = array("I")
+        self.__sources: List[Optional[str]] = []
+        self.__source_codes_by_value: Dict[Optional[str], int] = {}
+
+    @classmethod
+    def from_rows(cls, rows: Iterable[Tuple[int, str, Optional[str]]]) -> "DataTable":
+        """
+        Builds a table from `(id, name, source)` rows ordered by id, such as those of
+        :meth:`Datas.iter_names_and_sources`.
+
+        :param rows: The rows to store.
+        :return: The table holding the rows.
+        """
+        table = cls()
+        for data_id, name, source in rows:
+            table.append(data_id, name, source)
+        return table
+
+    def append(self, data_id: int, name: str, source: Optional[str] = None) -> None:
+        """
+        Adds a row at the end of the table.
+
+        :param data_id: The id of the entry, greater than every id already in the table.
+        :param name: The name of the entry.
+        :param source: The source of the entry.
+        :raises ValueError: If the id is not greater than the last one.
+        :return: None
+        """
+        if self.ids and data_id <= self.ids[-1]:
+            raise ValueError("Rows must be appended in increasing id order")
+        code = self.__source_codes_by_value.get(source)
+        if code is None:
+            code = self.__source_codes_by_value[source] = len(self.__sources)
+            self.__sources.append(source)
+        self.ids.append(data_id)
+        self.names.append(name)
+        self.__source_codes.append(code)
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+    def __getitem__(self, index: int) -> Data:
+        return Data(name=self.names[index], source=self.__sources[self.__source_codes[index]], id=self.ids[index])
+
+    def __iter__(self) -> Iterator[Data]:
+        sources = self.__sources
+        for data_id, name, code in zip(self.ids, self.names, self.__source_codes):
+            yield Data(name=name, source=sources[code], id=data_id)
+
+    def rows(self) -> Iterator[Tuple[int, str, Optional[str]]]:
+        """
+        Yields the rows as `(id, name, source)` tuples, without building `Data` objects.
+
+        :return: A generator of rows.
+        """
+        sources = self.__sources
+        for data_id, name, code in zip(self.ids, self.names, self.__source_codes):
+            yield data_id, name, sources[code]
+
+    @property
+    def sources(self) -> List[Optional[str]]:
+        """The distinct sources of the table, in order of first appearance."""
+        return list(self.__sources)
+
+    def index_of(self, data_id: int) -> Optional[int]:
+        """
+        Finds the row of an entry.
+
+        :param data_id: The id of the entry.
+        :return: The index of its row, or None if it is not in the table.
+        """
+        index = bisect_left(self.ids, data_id)
+        if index < len(self.ids) and self.ids[index] == data_id:
+            return index
+        return None
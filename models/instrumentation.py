@@ -0,0 +1,218 @@
+"""
+__author__ = "Adrien Mertens"
+__version__ = "1.0"
+"""
+import functools
+import sys
+import threading
+import time
+from collections import deque
+from dataclasses import dataclass
+from typing import Any, Callable, Deque, Dict, List, Optional
+
+# Number of buckets of a LatencyHistogram: bucket i counts the durations below 2**i
+# microseconds, the last one everything above about half an hour
+HISTOGRAM_BUCKETS = 32
+
+
+class LatencyHistogram:
+    """
+    Distribution of the durations of one operation, in buckets of powers of two
+    microseconds. Recording a duration costs a few integer operations and the memory
+    stays constant however many durations are recorded; percentiles are given as the
+    upper bound of their bucket, so they are exact within a factor of two.
+
+    :ivar count: The number of recorded durations.
+    :type count: int
+    :ivar total: The sum of the recorded durations, in seconds.
+    :type total: float
+    :ivar max: The longest recorded duration, in seconds.
+    :type max: float
+    """
+    __slots__ = ("count", "total", "max", "buckets")
+
+    def __init__(self) -> None:
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+        self.buckets = [0] * HISTOGRAM_BUCKETS
+
+    def record(self, seconds: float) -> None:
+        """
+        Adds a duration to the distribution.
+
+        :param seconds: The duration, in seconds.
+        :return: None
+        """
+        self.count += 1
+        self.total += seconds
+        if seconds > self.max:
+            self.max = seconds
+        self.buckets[min(int(seconds * 1e6).bit_length(), HISTOGRAM_BUCKETS - 1)] += 1
+
+    @property
+    def mean(self) -> float:
+        """The mean duration, in seconds."""
+        return self.total / self.count if self.count else 0.0
+
+    def percentile(self, fraction: float) -> float:
+        """
+        Returns the duration below which `fraction` of the recorded durations fall.
+
+        :param fraction: The fraction of durations, between 0 and 1.
+        :return: The upper bound of the bucket holding the percentile, in seconds, at
+            most the longest recorded duration.
+        """
+        if not self.count:
+            return 0.0
+        rank = max(1, round(fraction * self.count))
+        seen = 0
+        for index, bucket in enumerate(self.buckets):
+            seen += bucket
+            if seen >= rank:
+                return min(2 ** index / 1e6, self.max)
+        return self.max
+
+    def summary(self) -> Dict[str, float]:
+        """
+        Returns the count and the main figures of the distribution, durations in seconds.
+
+        :return: A dict with the keys count, total, mean, p50, p95, p99 and max.
+        """
+        return {"count": self.count, "total": self.total, "mean": self.mean, "p50": self.percentile(0.5),
+                "p95": self.percentile(0.95), "p99": self.percentile(0.99), "max": self.max}
+
+
+@dataclass(frozen=True)
+class SlowQuery:
+    """
+    An operation that took longer than the slow query threshold.
+
+    :ivar operation: The name of the instrumented operation.
+    :type operation: str
+    :ivar statement: The SQL statement run, if the operation runs one.
+    :type statement: Optional[str]
+    :ivar seconds: The duration of the operation.
+    :type seconds: float
+    :ivar at: The time the operation ended, as given by `time.time`.
+    :type at: float
+    """
+    operation: str
+    statement: Optional[str]
+    seconds: float
+    at: float
+
+
+class Instrumentation:
+    """
+    Collects where the time of the data layer goes: a latency histogram per operation
+    and a log of the slow operations. Every method may be called from any thread.
+
+    Instrumentation is optional. Code that is instrumented holds None instead of an
+    instance while it is disabled and only checks for it, so that disabled
+    instrumentation costs next to nothing (see :func:`timed`).
+
+    :ivar slow_query_seconds: The duration from which an operation is logged as slow.
+    :type slow_query_seconds: float
+    """
+    def __init__(self, slow_query_seconds: float = 0.1, slow_log_size: int = 100) -> None:
+        """
+        :param slow_query_seconds: The duration, in seconds, from which an operation is
+            logged as slow, and reported on the standard error.
+        :param slow_log_size: The number of slow operations kept, the oldest being dropped first.
+        """
+        if slow_query_seconds < 0:
+            raise ValueError("slow_query_seconds must be positive")
+        self.slow_query_seconds = slow_query_seconds
+        self.__lock = threading.Lock()
+        self.__histograms: Dict[str, LatencyHistogram] = {}
+        self.__slow_queries: Deque[SlowQuery] = deque(maxlen=slow_log_size)
+
+    def record(self, operation: str, seconds: float, statement: Optional[str] = None) -> None:
+        """
+        Records the duration of an operation, and logs it if it is slow.
+
+        :param operation: The name of the operation.
+        :param seconds: Its duration, in seconds.
+        :param statement: The SQL statement it ran, if any.
+        :return: None
+        """
+        with self.__lock:
+            histogram = self.__histograms.get(operation)
+            if histogram is None:
+                histogram = self.__histograms[operation] = LatencyHistogram()
+            histogram.record(seconds)
+            if seconds < self.slow_query_seconds:
+                return
+            self.__slow_queries.append(SlowQuery(operation, statement, seconds, time.time()))
+        message = f"Slow operation {operation} ({seconds * 1000:.1f} ms)"
+        print(f"{message}: {statement}" if statement else message, file=sys.stderr)
+
+    def histogram(self, operation: str) -> Optional[LatencyHistogram]:
+        """
+        Returns the histogram of an operation.
+
+        :param operation: The name of the operation.
+        :return: Its histogram, or None if it was never recorded.
+        """
+        with self.__lock:
+            return self.__histograms.get(operation)
+
+    @property
+    def slow_queries(self) -> List[SlowQuery]:
+        """The slow operations logged, oldest first."""
+        with self.__lock:
+            return list(self.__slow_queries)
+
+    def reset(self) -> None:
+        """
+        Forgets every measure.
+
+        :return: None
+        """
+        with self.__lock:
+            self.__histograms.clear()
+            self.__slow_queries.clear()
+
+    def snapshot(self) -> Dict[str, Any]:
+        """
+        Returns a copy of every measure, made of plain dicts, lists and numbers so that
+        it can be displayed or serialized as JSON.
+
+        :return: A dict with the keys ``operations`` (the summary of each histogram, see
+            :meth:`LatencyHistogram.summary`), ``slow_queries`` and ``slow_query_seconds``.
+        """
+        with self.__lock:
+            return {
+                "operations": {name: histogram.summary() for name, histogram in sorted(self.__histograms.items())},
+                "slow_queries": [{"operation": slow.operation, "statement": slow.statement, "seconds": slow.seconds,
+                                  "at": slow.at} for slow in self.__slow_queries],
+                "slow_query_seconds": self.slow_query_seconds,
+            }
+
+
+def timed(operation: str, with_statement: bool = False) -> Callable[[Callable], Callable]:
+    """
+    Decorates a method so that its duration is recorded under `operation` by the
+    `Instrumentation` of its instance, found in its `instrumentation` attribute. While
+    that attribute is None the method is called directly.
+
+    :param operation: The name the durations are recorded under.
+    :param with_statement: Whether the first argument of the method is an SQL statement,
+        kept in the slow query log.
+    :return: The decorator.
+    """
+    def decorator(method: Callable) -> Callable:
+        @functools.wraps(method)
+        def wrapper(self, *args, **kwargs):
+            instrumentation = self.instrumentation
+            if instrumentation is None:
+                return method(self, *args, **kwargs)
+            start = time.perf_counter()
+            try:
+                return method(self, *args, **kwargs)
+            finally:
+                statement = (args[0] if args else kwargs.get("sql")) if with_statement else None
+                instrumentation.record(operation, time.perf_counter() - start, statement)
+        return wrapper
+    return decorator
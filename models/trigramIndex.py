@@ -0,0 +1,171 @@
+"""
+__author__ = "Adrien Mertens"
+__version__ = "1.0"
+"""
+import heapq
+from collections import Counter
+from functools import lru_cache
+from typing import Dict, FrozenSet, Iterable, List, Optional, Set, Tuple
+
+from models.data import Data, DELETED, RELOADED
+
+
+@lru_cache(maxsize=4096)
+def trigrams(text: Optional[str]) -> FrozenSet[str]:
+    """
+    Splits a text into its lowercase trigrams. The text is padded with two spaces at
+    the start and one at the end, so that short words and first letters weigh in the
+    similarity ("gmail" gives "  g", " gm", "gma", "mai", "ail" and "il "). Results are
+    cached, since sources are shared by many entries.
+
+    :param text: The text to split. None gives no trigram.
+    :type text: Optional[str]
+    :return: The set of trigrams of the text.
+    :rtype: FrozenSet[str]
+    """
+    if not text:
+        return frozenset()
+    padded = f"  {' '.join(text.lower().split())} "
+    return frozenset(padded[i:i + 3] for i in range(len(padded) - 2))
+
+
+class TrigramIndex:
+    """
+    In-memory index of the trigrams of the name and source of each entry, used for
+    typo-tolerant search ("gmial" finds "gmail"). Entries are ranked by the similarity
+    of their trigrams with those of the query (Jaccard index), keeping the best of the
+    name and the source.
+
+    The index is filled once with :meth:`add` and then kept up to date by registering
+    :meth:`on_data_changed` as a listener of `Datas`. After a bulk import it is marked
+    `stale`, and its owner fills it again.
+
+    :ivar min_similarity: The similarity under which an entry is not a match.
+    :type min_similarity: float
+    """
+    # Number of candidates, per result requested, whose exact similarity is computed
+    CANDIDATES_PER_RESULT = 20
+
+    def __init__(self, min_similarity: float = 0.15) -> None:
+        self.min_similarity = min_similarity
+        # Ids of the entries containing each trigram
+        self._postings: Dict[str, Set[int]] = {}
+        # Name, and trigrams of the name and of the source, of each entry
+        self._entries: Dict[int, Tuple[str, FrozenSet[str], FrozenSet[str]]] = {}
+        # Set when the indexed entries no longer match the database
+        self.stale = False
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def add(self, data_id: int, name: str, source: Optional[str] = None) -> None:
+        """
+        Indexes an entry, replacing what was indexed before under the same id.
+
+        :param data_id: The id of the entry.
+        :param name: The name of the entry.
+        :param source: The source of the entry.
+        :return: None
+        """
+        if data_id in self._entries:
+            self.remove(data_id)
+        name_trigrams, source_trigrams = trigrams(name), trigrams(source)
+        self._entries[data_id] = (name, name_trigrams, source_trigrams)
+        postings = self._postings
+        for trigram in name_trigrams | source_trigrams:
+            posting = postings.get(trigram)
+            if posting is None:
+                postings[trigram] = {data_id}
+            else:
+                posting.add(data_id)
+
+    def add_many(self, entries: Iterable[Tuple[int, str, Optional[str]]]) -> None:
+        """
+        Indexes many `(id, name, source)` entries.
+
+        :param entries: The entries to index.
+        :return: None
+        """
+        for data_id, name, source in entries:
+            self.add(data_id, name, source)
+
+    def clear(self) -> None:
+        """
+        Empties the index and marks it up to date, before it is filled again.
+
+        :return: None
+        """
+        self._postings = {}
+        self._entries = {}
+        self.stale = False
+
+    def remove(self, data_id: int) -> None:
+        """
+        Removes an entry from the index. Unknown ids are ignored.
+
+        :param data_id: The id of the entry.
+        :return: None
+        """
+        entry = self._entries.pop(data_id, None)
+        if entry is None:
+            return
+        for trigram in entry[1] | entry[2]:
+            posting = self._postings.get(trigram)
+            if posting is not None:
+                posting.discard(data_id)
+                if not posting:
+                    del self._postings[trigram]
+
+    def on_data_changed(self, kind: str, data: Data) -> None:
+        """
+        Applies a change reported by `Datas` to the index.
+
+        :param kind: The kind of change (`INSERTED`, `UPDATED`, `DELETED`, or `RELOADED`
+            which marks the index stale).
+        :param data: The entry affected by the change.
+        :return: None
+        """
+        if kind == RELOADED:
+            self.stale = True
+        elif kind == DELETED:
+            self.remove(data.id)
+        else:
+            self.add(data.id, data.name, data.source)
+
+    def search(self, query: str, limit: int = 10) -> List[Tuple[int, str, float]]:
+        """
+        Finds the entries whose name or source is the most similar to `query`.
+
+        The entries sharing the most trigrams with the query are selected first from the
+        postings, then ranked by their exact similarity, so the cost depends on the
+        number of entries sharing a trigram with the query, not on the size of the index.
+
+        :param query: The text to search for, possibly misspelt.
+        :param limit: The maximum number of results.
+        :return: `(id, name, similarity)` tuples, most similar first.
+        """
+        query_trigrams = trigrams(query)
+        if not query_trigrams:
+            return []
+        shared = Counter()
+        for trigram in query_trigrams:
+            posting = self._postings.get(trigram)
+            if posting:
+                shared.update(posting)
+        results = []
+        for data_id, _ in heapq.nlargest(limit * self.CANDIDATES_PER_RESULT, shared.items(), key=lambda item: item[1]):
+            name, name_trigrams, source_trigrams = self._entries[data_id]
+            similarity = max(self._similarity(query_trigrams, name_trigrams),
+                             self._similarity(query_trigrams, source_trigrams))
+            if similarity >= self.min_similarity:
+                results.append((data_id, name, similarity))
+        results.sort(key=lambda result: (-result[2], result[0]))
+        return results[:limit]
+
+    @staticmethod
+    def _similarity(first: FrozenSet[str], second: FrozenSet[str]) -> float:
+        """Returns the Jaccard index of two sets of trigrams."""
+        if not second:
+            return 0.0
+        common = len(first & second)
+        return common / (len(first) + len(second) - common)
@@ -0,0 +1,46 @@
+# -*- coding: utf-8 -*-
+"""
+__author__ = "<Adrien Mertens>"
+__version__ = "1.0"
+"""
+
+import pytest
+from controllers.appService import AppService
+from models.data import Data, Datas, INSERTED, UPDATED
+
+@pytest.fixture
+def service(tmp_path)->AppService:
+    """
+    Provides an application service on a temporary database, closed after the test.
+    :param tmp_path: A pytest fixture providing a temporary directory.
+    :return: Yields the service.
+    """
+    datas = Datas(path_db=str(tmp_path / "test_database.db"))
+    with AppService(datas) as service:
+        yield service
+    datas.close()
+
+def test_writes_reach_readers_as_change_events(service)->None:
+    """
+    Tests that a write made through the shared controller, as the menu does, reaches a
+    listener of that controller, as the board is, as a single change event, and that
+    the cache of the controller sees it.
+    """
+    changes = []
+    service.controller.add_listener(lambda kind, data: changes.append((kind, data.id, data.name)))
+    future = service.controller.submit(service.controller.add_data,
+                                       Data(name="gmail", username="u", password="p", source="google.com"))
+    assert future.result(timeout=5)
+    assert service.controller.get_one_data(1).name == "gmail"
+    service.controller.modif_data(1, Data(name="Gmail", username="u", password="p", source="google.com"))
+    assert changes == [(INSERTED, 1, "gmail"), (UPDATED, 1, "Gmail")]
+    assert service.controller.get_one_data(1).name == "Gmail"
+    assert service.controller.cache_stats().hits == 2
+
+def test_closed_service_stops_its_worker(service)->None:
+    """
+    Tests that closing the service stops the worker running the calls of the views.
+    """
+    service.close()
+    with pytest.raises(RuntimeError):
+        service.controller.submit(service.controller.list_names)
@@ -0,0 +1,86 @@
+# -*- coding: utf-8 -*-
+"""
+__author__ = "<Adrien Mertens>"
+__version__ = "1.0"
+"""
+
+import asyncio
+import threading
+import pytest
+from models.data import Data, Datas
+from models.asyncDatas import AsyncDatas
+
+@pytest.fixture
+def datas_instance(tmp_path)->Datas:
+    """
+    Provides a Datas instance on a temporary database, closed after the test.
+    :param tmp_path: A pytest fixture providing a temporary directory.
+    :return: Yields the Datas instance.
+    """
+    datas = Datas(path_db=str(tmp_path / "test_database.db"))
+    yield datas
+    datas.close()
+
+def entry(index: int)->Data:
+    """Builds a distinct entry for `index`."""
+    return Data(name=f"entry {index}", username="user", password=f"secret {index}", source="source")
+
+def test_async_crud(datas_instance)->None:
+    """
+    Tests that the awaitable methods add, modify, read and remove entries.
+    """
+    async def scenario():
+        async with AsyncDatas(datas_instance) as datas:
+            assert await datas.register_data(entry(1))
+            assert not await datas.register_data(entry(1))
+            assert await datas.modify_data(1, Data(name="renamed", username="u", password="p", source="s"))
+            assert (await datas.get_one_data_in_db(1)).name == "renamed"
+            assert [data.name for data in await datas.get_all_Data_in_db()] == ["renamed"]
+            assert await datas.remove_data(1)
+            assert await datas.get_all_Data_in_db() == []
+    asyncio.run(scenario())
+
+def test_concurrent_writes_are_serialized(datas_instance)->None:
+    """
+    Tests that writes awaited concurrently all succeed and all run on the same thread.
+    """
+    threads = set()
+    datas_instance.add_listener(lambda kind, data: threads.add(threading.current_thread()))
+    async def scenario():
+        async with AsyncDatas(datas_instance) as datas:
+            results = await asyncio.gather(*(datas.register_data(entry(i)) for i in range(50)))
+            names = await asyncio.gather(*(datas.get_one_data_in_db(i) for i in range(1, 51)))
+            return results, names
+    results, names = asyncio.run(scenario())
+    assert all(results)
+    assert sorted(data.name for data in names) == sorted(entry(i).name for i in range(50))
+    assert len(threads) == 1
+
+def test_writer_does_not_wait_for_busy_readers(datas_instance)->None:
+    """
+    Tests that a write completes while every reader holds a connection of the pool.
+    """
+    release = threading.Event()
+    def hold_connection()->None:
+        with datas_instance._get_connection():
+            release.wait(5)
+    async def scenario():
+        async with AsyncDatas(datas_instance) as datas:
+            readers = [asyncio.ensure_future(datas._read(hold_connection))
+                       for _ in range(datas._readers._max_workers)]
+            try:
+                return await asyncio.wait_for(datas.register_data(entry(1)), timeout=2)
+            finally:
+                release.set()
+                await asyncio.gather(*readers)
+    assert asyncio.run(scenario())
+
+def test_stream_all_reads_in_batches(datas_instance)->None:
+    """
+    Tests that stream_all yields every entry in id order, across several batches.
+    """
+    datas_instance.register_many(entry(i) for i in range(25))
+    async def scenario():
+        async with AsyncDatas(datas_instance) as datas:
+            return [data.id async for data in datas.stream_all(batch_size=10)]
+    assert asyncio.run(scenario()) == list(range(1, 26))
@@ -0,0 +1,120 @@
+# -*- coding: utf-8 -*-
+"""
+__author__ = "<Adrien Mertens>"
+__version__ = "1.0"
+"""
+
+import io
+import pytest
+from models.backup import BackupError, HEADER, LENGTH, export_backup, import_backup
+from models.crypto import KdfParams, SALT_SIZE, reveal
+from models.data import Data, Datas
+
+# Cheap key derivation so that the tests do not pay the cost of the real one
+FAST_KDF = KdfParams(n=2 ** 10, r=8, p=1)
+
+@pytest.fixture
+def backup()->bytes:
+    """
+    Provides a backup of 25 entries in chunks of 10, so in three chunks.
+    :return: The content of the backup.
+    """
+    with Datas() as datas:
+        datas.register_many(Data(name=f"entry-{i}", username="user", password=f"pass-{i}", source="site")
+                            for i in range(25))
+        file = io.BytesIO()
+        stats = export_backup(datas, file, "passphrase", chunk_size=10, params=FAST_KDF)
+    assert (stats.entries, stats.chunks, stats.bytes) == (25, 3, len(file.getvalue()))
+    return file.getvalue()
+
+def chunk_offsets(content:bytes)->list[int]:
+    """
+    Returns the offset of each chunk of a backup.
+    :param content: The content of the backup.
+    :return: The offsets, in order.
+    """
+    offsets = []
+    offset = HEADER.size + SALT_SIZE
+    while offset < len(content):
+        offsets.append(offset)
+        offset += LENGTH.size + LENGTH.unpack(content[offset:offset + LENGTH.size])[0]
+    return offsets
+
+def test_round_trip(backup)->None:
+    """
+    Tests that every entry of a backup is restored, with its password, and that a second restore only finds duplicates.
+    """
+    with Datas() as datas:
+        stats = import_backup(datas, io.BytesIO(backup), "passphrase")
+        assert (stats.entries, stats.inserted, stats.duplicates, stats.skipped_chunks) == (25, 25, 0, 0)
+        restored = datas.get_one_data_by_name("entry-7")
+        assert (restored.username, reveal(restored.password), restored.source) == ("user", "pass-7", "site")
+        assert import_backup(datas, io.BytesIO(backup), "passphrase").duplicates == 25
+
+def test_round_trip_between_encrypted_vaults()->None:
+    """
+    Tests that a backup of an encrypted vault holds the passwords in clear and restores into another encrypted vault.
+    """
+    file = io.BytesIO()
+    with Datas() as datas:
+        datas.set_master_password("first", params=FAST_KDF)
+        datas.register_data(Data(name="gmail", username="jdoe", password="s3cret", source="google.com"))
+        export_backup(datas, file, "passphrase", params=FAST_KDF)
+    with Datas() as datas:
+        datas.set_master_password("second", params=FAST_KDF)
+        import_backup(datas, io.BytesIO(file.getvalue()), "passphrase")
+        assert reveal(datas.get_one_data_by_name("gmail").password) == "s3cret"
+
+def test_empty_vault()->None:
+    """
+    Tests that the backup of an empty vault holds one empty, final chunk and restores nothing.
+    """
+    file = io.BytesIO()
+    with Datas() as datas:
+        assert export_backup(datas, file, "passphrase", params=FAST_KDF).chunks == 1
+        assert import_backup(datas, io.BytesIO(file.getvalue()), "passphrase").entries == 0
+
+def test_wrong_passphrase(backup)->None:
+    """
+    Tests that a wrong passphrase is reported and nothing is restored.
+    """
+    with Datas() as datas:
+        with pytest.raises(BackupError, match="Wrong passphrase"):
+            import_backup(datas, io.BytesIO(backup), "other")
+        assert datas.get_all_Data_in_db() == []
+
+def test_altered_or_reordered_chunk(backup)->None:
+    """
+    Tests that a chunk altered by one bit, or two chunks swapped, are detected.
+    """
+    offsets = chunk_offsets(backup)
+    altered = bytearray(backup)
+    altered[offsets[1] + 20] ^= 1
+    swapped = backup[:offsets[0]] + backup[offsets[1]:offsets[2]] + backup[offsets[0]:offsets[1]] + backup[offsets[2]:]
+    for content in (bytes(altered), swapped):
+        with Datas() as datas:
+            with pytest.raises(BackupError):
+                import_backup(datas, io.BytesIO(content), "passphrase")
+
+def test_truncated_or_foreign_file(backup)->None:
+    """
+    Tests that a backup missing its last chunk, or a file that is not a backup, is rejected.
+    """
+    with Datas() as datas:
+        with pytest.raises(BackupError, match="truncated"):
+            import_backup(datas, io.BytesIO(backup[:chunk_offsets(backup)[2]]), "passphrase")
+        with pytest.raises(BackupError, match="not a backup"):
+            import_backup(datas, io.BytesIO(b"name,username\n" * 10), "passphrase")
+
+def test_resume_after_failure(backup)->None:
+    """
+    Tests that a restore interrupted after two chunks resumes with the third one, and that its progress is then forgotten.
+    """
+    with Datas() as datas:
+        with pytest.raises(BackupError):
+            import_backup(datas, io.BytesIO(backup[:chunk_offsets(backup)[2] + 10]), "passphrase")
+        assert len(datas.get_all_Data_in_db()) == 20
+        stats = import_backup(datas, io.BytesIO(backup), "passphrase")
+        assert (stats.skipped_chunks, stats.chunks, stats.inserted) == (2, 1, 5)
+        assert len(datas.get_all_Data_in_db()) == 25
+        assert import_backup(datas, io.BytesIO(backup), "passphrase").skipped_chunks == 0
@@ -0,0 +1,176 @@
+# -*- coding: utf-8 -*-
+"""
+__author__ = "<Adrien Mertens>"
+__version__ = "1.0"
+"""
+
+from concurrent.futures import Future
+from types import SimpleNamespace
+import pytest
+from controllers.controllersDatas import ControllersDatas
+from models.data import Data, Datas
+from views.boardView import BoardView
+
+class FakeTreeview:
+    """Stands for a Treeview, keeping its rows in a list, so that the board runs without a display."""
+    def __init__(self)->None:
+        self.rows = []
+        self.values = {}
+        self.tags = {}
+
+    def insert(self, parent, index, iid, values, tags)->None:
+        self.rows.insert(len(self.rows) if index == "end" else index, iid)
+        self.values[iid], self.tags[iid] = values, tags
+
+    def delete(self, *iids)->None:
+        for iid in iids:
+            self.rows.remove(iid)
+            del self.values[iid], self.tags[iid]
+
+    def item(self, iid, values=None, tags=None)->None:
+        if values is not None:
+            self.values[iid] = values
+        if tags is not None:
+            self.tags[iid] = tags
+
+    def index(self, iid)->int:
+        return self.rows.index(iid)
+
+    def get_children(self)->tuple:
+        return tuple(self.rows)
+
+class InlineDispatcher:
+    """Stands for the TkDispatcher, running the callbacks at once instead of on the main loop."""
+    def call_soon(self, callback, *args)->None:
+        callback(*args)
+
+    def when_done(self, future, on_success, on_error, busy=None)->None:
+        on_success(future.result())
+
+class InlineController(ControllersDatas):
+    """Controller running the submitted calls at once instead of on the database worker."""
+    def submit(self, call, *args, **kwargs)->Future:
+        future = Future()
+        future.set_result(call(*args, **kwargs))
+        return future
+
+@pytest.fixture
+def datas()->Datas:
+    """
+    Provides an in-memory vault of 7 entries, named "entry 1" to "entry 7" after their id.
+    :return: Yields the vault.
+    """
+    with Datas() as datas:
+        datas.register_many(Data(name=f"entry {i}", username="u", password="p", source="s") for i in range(1, 8))
+        yield datas
+
+def make_board(datas: Datas, page_size: int = 3)->BoardView:
+    """
+    Builds a board on fake widgets, pages of `page_size` rows, listening to `datas`, and
+    loads its first page.
+    """
+    board = BoardView.__new__(BoardView)
+    board.board = FakeTreeview()
+    board.scrollbar = SimpleNamespace(set=lambda first, last: None)
+    board.after_idle = lambda callback: callback()
+    board.PAGE_SIZE = page_size
+    for name, value in {"controller": None, "names": {}, "last_id": 0, "fully_loaded": False,
+                        "page_pending": False, "query": "", "refresh_pending": False, "generation": 0,
+                        "dispatcher": InlineDispatcher()}.items():
+        setattr(board, f"_BoardView__{name}", value)
+    board.controller = InlineController(datas)
+    board.refresh_data_board_from_db()
+    return board
+
+def shown(board: BoardView)->list:
+    """Returns the names displayed by the board, in order, after checking the stripes of its rows."""
+    rows = board.board.get_children()
+    assert [board.board.tags[iid] for iid in rows] == [(BoardView._stripe(index),) for index in range(len(rows))]
+    return [board.board.values[iid][0] for iid in rows]
+
+def test_restored_entries_go_back_to_their_place(datas)->None:
+    """
+    Tests that entries restored with their old id are inserted at their place among the
+    rows loaded, whether the board is fully loaded or not.
+    """
+    board = make_board(datas, page_size=10)
+    datas.remove_many([2, 7])
+    assert shown(board) == ["entry 1", "entry 3", "entry 4", "entry 5", "entry 6"]
+    datas.undo_last_delete()
+    assert shown(board) == [f"entry {i}" for i in range(1, 8)]
+
+    board = make_board(datas, page_size=3)
+    datas.remove_data(2)
+    datas.remove_data(3)
+    datas.restore_data(3)
+    datas.restore_data(2)
+    assert shown(board) == ["entry 1", "entry 2", "entry 3"]
+
+def test_changes_update_a_fully_loaded_board(datas)->None:
+    """
+    Tests that, once the whole table is loaded, an insertion appends a row, an update
+    renames its row only, and a deletion removes its row and restripes the next ones.
+    """
+    board = make_board(datas, page_size=10)
+    assert shown(board) == [f"entry {i}" for i in range(1, 8)]
+    datas.register_data(Data(name="entry 8", username="u", password="p", source="s"))
+    datas.modify_data(3, Data(name="renamed", username="u", password="p", source="s"))
+    datas.remove_data(2)
+    assert shown(board) == ["entry 1", "renamed", "entry 4", "entry 5", "entry 6", "entry 7", "entry 8"]
+    assert board.board.get_children() == ("1", "3", "4", "5", "6", "7", "8")
+
+def test_changes_update_a_partially_loaded_board(datas)->None:
+    """
+    Tests that, while pages remain to be loaded, an insertion is left to the last page,
+    and updates and deletions only touch the rows loaded.
+    """
+    board = make_board(datas)
+    assert shown(board) == ["entry 1", "entry 2", "entry 3"]
+    datas.register_data(Data(name="entry 8", username="u", password="p", source="s"))
+    datas.modify_data(2, Data(name="renamed", username="u", password="p", source="s"))
+    datas.modify_data(5, Data(name="not loaded", username="u", password="p", source="s"))
+    datas.remove_data(1)
+    datas.remove_data(6)
+    assert shown(board) == ["renamed", "entry 3"]
+
+def test_refresh_keeps_unchanged_rows(datas)->None:
+    """
+    Tests that a refresh only touches the rows that changed, and restripes the rows
+    from the first one whose position changed.
+    """
+    board = make_board(datas, page_size=10)
+    # Changes made without the board being notified, as by another process
+    datas.remove_listener(board._queue_data_changed)
+    datas.remove_data(3)
+    datas.modify_data(5, Data(name="renamed", username="u", password="p", source="s"))
+    datas.register_data(Data(name="entry 8", username="u", password="p", source="s"))
+    calls = []
+    board.board.insert = lambda parent, index, iid, values, tags, insert=board.board.insert: (
+        calls.append(iid), insert(parent, index, iid, values, tags))
+    board.refresh_data_board_from_db()
+    assert calls == ["8"]
+    assert shown(board) == ["entry 1", "entry 2", "entry 4", "renamed", "entry 6", "entry 7", "entry 8"]
+
+def test_next_page_is_loaded_on_scroll(datas)->None:
+    """
+    Tests that the next page is loaded once the view is scrolled past the threshold,
+    and not before, until the whole table is loaded; new entries are appended after.
+    """
+    board = make_board(datas)
+    board._on_scroll("0.0", "0.5")
+    assert shown(board) == ["entry 1", "entry 2", "entry 3"]
+    board._on_scroll("0.2", str(BoardView.PREFETCH_THRESHOLD))
+    assert shown(board) == [f"entry {i}" for i in range(1, 7)]
+    board._on_scroll("0.5", "1.0")
+    assert shown(board) == [f"entry {i}" for i in range(1, 8)]
+    assert board._BoardView__fully_loaded
+    datas.register_data(Data(name="entry 8", username="u", password="p", source="s"))
+    assert shown(board)[-1] == "entry 8"
+
+def test_stale_page_is_dropped(datas)->None:
+    """
+    Tests that a page requested before a refresh is not appended when it arrives after it.
+    """
+    board = make_board(datas)
+    board._append_page([(4, "entry 4")], generation=board._BoardView__generation - 1)
+    assert shown(board) == ["entry 1", "entry 2", "entry 3"]
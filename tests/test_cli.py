@@ -0,0 +1,92 @@
+# -*- coding: utf-8 -*-
+"""
+__author__ = "<Adrien Mertens>"
+__version__ = "1.0"
+"""
+
+import io
+import json
+import sys
+import pytest
+import cli
+from models.data import Datas
+from models.crypto import KdfParams
+
+@pytest.fixture
+def vault(tmp_path)->str:
+    """
+    Provides the path of an empty vault.
+    :param tmp_path: A pytest fixture providing a temporary directory.
+    :return: The path of the vault.
+    """
+    return str(tmp_path / "vault.db")
+
+def test_add_get_and_remove(vault, capsys, monkeypatch)->None:
+    """
+    Tests that an entry added with its password piped on stdin can be read back by name, then removed.
+    """
+    monkeypatch.setattr(sys, "stdin", io.StringIO("s3cret\n"))
+    assert cli.main(["--db", vault, "add", "gmail", "--username", "jdoe", "--source", "google.com"]) == 0
+    assert cli.main(["--db", vault, "add", "gmail", "--password", "other"]) == 1
+    assert cli.main(["--db", vault, "get", "gmail", "--field", "password"]) == 0
+    assert capsys.readouterr().out == "s3cret\n"
+    assert cli.main(["--db", vault, "rm", "--id", "1"]) == 0
+    assert cli.main(["--db", vault, "get", "gmail"]) == 1
+
+def test_import_then_export(vault, tmp_path, capsys)->None:
+    """
+    Tests that a CSV file is imported, duplicates skipped, and that the vault is exported as JSON Lines.
+    """
+    source = tmp_path / "entries.csv"
+    source.write_text("name,username,password,source\ngmail,jdoe,p1,google.com\ndrive,jdoe,p2,\ngmail,x,y,z\n")
+    assert cli.main(["--db", vault, "import", str(source)]) == 0
+    assert "2 imported, 1 duplicates" in capsys.readouterr().err
+    assert cli.main(["--db", vault, "list"]) == 0
+    assert capsys.readouterr().out == "1\tgmail\tgoogle.com\n2\tdrive\t\n"
+    assert cli.main(["--db", vault, "export", "-", "--format", "jsonl"]) == 0
+    rows = [json.loads(line) for line in capsys.readouterr().out.splitlines()]
+    assert rows == [{"name": "gmail", "username": "jdoe", "password": "p1", "source": "google.com"},
+                    {"name": "drive", "username": "jdoe", "password": "p2", "source": None}]
+
+def test_encrypted_vault(vault, capsys, monkeypatch)->None:
+    """
+    Tests that an encrypted vault is unlocked with the master password of the environment.
+    """
+    with Datas(vault) as datas:
+        datas.set_master_password("master", params=KdfParams(n=2 ** 10, r=8, p=1))
+    monkeypatch.setenv("EASY_PASSWORD_MASTER", "master")
+    assert cli.main(["--db", vault, "add", "gmail", "--password", "s3cret"]) == 0
+    assert cli.main(["--db", vault, "get", "gmail", "--field", "password"]) == 0
+    assert capsys.readouterr().out == "s3cret\n"
+    monkeypatch.setenv("EASY_PASSWORD_MASTER", "wrong")
+    assert cli.main(["--db", vault, "list"]) == 1
+
+def test_backup_then_restore(vault, tmp_path, capsys, monkeypatch)->None:
+    """
+    Tests that a backup written with the passphrase of the environment is restored into another vault.
+    """
+    assert cli.main(["--db", vault, "add", "gmail", "--password", "s3cret"]) == 0
+    monkeypatch.setenv("EASY_PASSWORD_BACKUP", "passphrase")
+    path = str(tmp_path / "vault.epbk")
+    assert cli.main(["--db", vault, "backup", path]) == 0
+    other = str(tmp_path / "other.db")
+    assert cli.main(["--db", other, "restore", path]) == 0
+    assert "1 imported" in capsys.readouterr().err
+    assert cli.main(["--db", other, "get", "gmail", "--field", "password"]) == 0
+    assert capsys.readouterr().out == "s3cret\n"
+    monkeypatch.setenv("EASY_PASSWORD_BACKUP", "wrong")
+    assert cli.main(["--db", other, "restore", path]) == 1
+
+def test_import_skips_nameless_records(vault, tmp_path, capsys, monkeypatch)->None:
+    """
+    Tests that JSON Lines records without a name are counted as invalid instead of failing
+    the import, and that a CSV file piped without a name column is refused.
+    """
+    source = tmp_path / "entries.jsonl"
+    source.write_text('{"name": "gmail", "password": "p"}\n{"username": "u", "password": "p"}\n{"name": ""}\n',
+                      encoding="utf-8")
+    assert cli.main(["--db", vault, "import", str(source)]) == 0
+    assert "1 imported, 0 duplicates, 0 failed, 2 invalid" in capsys.readouterr().err
+    monkeypatch.setattr(sys, "stdin", io.StringIO("username,password\nu,p\n"))
+    assert cli.main(["--db", vault, "import", "-", "--format", "csv"]) == 1
+    assert "no 'name' column" in capsys.readouterr().err
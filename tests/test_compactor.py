@@ -0,0 +1,59 @@
+# -*- coding: utf-8 -*-
+"""
+__author__ = "<Adrien Mertens>"
+__version__ = "1.0"
+"""
+
+import pytest
+from controllers.compactor import Compactor
+from models.data import Data, Datas
+
+@pytest.fixture
+def datas(tmp_path)->Datas:
+    """
+    Provides a vault of 50 entries, 30 of them removed, on a temporary database.
+    :param tmp_path: A pytest fixture providing a temporary directory.
+    :return: Yields the vault.
+    """
+    with Datas(path_db=str(tmp_path / "test_database.db")) as datas:
+        datas.register_many(Data(name=f"entry-{i}", username="u", password="p" * 500, source="s") for i in range(50))
+        datas.remove_many(range(1, 31))
+        yield datas
+
+def test_compact_purges_in_batches(datas)->None:
+    """
+    Tests that a compaction purges the tombstones older than the retention period in
+    several batches, keeps the entries, and gives the pages back.
+    """
+    compactor = Compactor(datas, retention_days=0, delay=3600, batch_size=8)
+    try:
+        stats = compactor.compact()
+        assert (stats.purged, stats.batches) == (30, 4)
+        assert stats.pages_freed > 0
+        assert compactor.last_run is stats
+        assert datas.list_deleted() == [] and len(datas.list_names()) == 20
+    finally:
+        compactor.close()
+
+def test_compact_keeps_recent_tombstones(datas)->None:
+    """
+    Tests that the tombstones younger than the retention period can still be restored.
+    """
+    compactor = Compactor(datas, retention_days=30, delay=3600)
+    try:
+        assert compactor.compact().purged == 0
+        assert len(datas.undo_last_delete()) == 30
+    finally:
+        compactor.close()
+
+def test_compactor_runs_in_background(datas)->None:
+    """
+    Tests that the thread compacts after its delay, and stops when closed.
+    """
+    compactor = Compactor(datas, retention_days=0, delay=0, interval=3600)
+    import time
+    deadline = time.monotonic() + 5
+    while compactor.last_run is None and time.monotonic() < deadline:
+        time.sleep(0.01)
+    compactor.close()
+    assert compactor.last_run is not None and compactor.last_run.purged == 30
@@ -1,7 +1,9 @@
 import os
+import threading
 import pytest
 from controllers.controllersDatas import ControllersDatas
 from models.data import Data, Datas
+from models.crypto import KdfParams
 
 @pytest.fixture
 def datas_instance(tmp_path):
@@ -15,6 +17,7 @@ def datas_instance(tmp_path):
     db_path = tmp_path / "test_database.db"
     datas = Datas(path_db=str(db_path))
     yield datas
+    datas.close()
     # Supprime le fichier de la base de données après l'exécution des tests
     if os.path.exists(db_path):
         try:
@@ -84,3 +87,145 @@ def test_get_one_data(controllers_datas_instance):
     retrieved_data = controllers_datas_instance.get_one_data(1)
     assert retrieved_data is not None
     assert retrieved_data.username == "jdoe"
+
+def test_add_many(controllers_datas_instance):
+    """
+    Tests adding several data entries at once through the ControllersDatas instance.
+    """
+    datas = [Data(name=f"user{i}", username="u", password="p", source="s") for i in range(3)]
+    result = controllers_datas_instance.add_many(datas + [datas[0]])
+    assert result == ["inserted", "inserted", "inserted", "duplicate"]
+    assert len(controllers_datas_instance.get_all_datas()) == 3
+
+def test_get_page(controllers_datas_instance):
+    """
+    Tests retrieving a page of data entries through the ControllersDatas instance.
+    """
+    controllers_datas_instance.add_many(Data(name=f"user{i}", username="u", password="p", source="s") for i in range(3))
+    page = controllers_datas_instance.get_page(after_id=1, limit=5)
+    assert [data.name for data in page] == ["user1", "user2"]
+
+def test_list_names(controllers_datas_instance):
+    """
+    Tests listing the ids and names of the data entries through the ControllersDatas instance.
+    """
+    controllers_datas_instance.add_data(Data(name="John Doe", username="jdoe", password="password123", source="source1"))
+    assert controllers_datas_instance.list_names() == [(1, "John Doe")]
+
+def test_search(controllers_datas_instance):
+    """
+    Tests searching data entries through the ControllersDatas instance.
+    """
+    controllers_datas_instance.add_data(Data(name="John Doe", username="jdoe", password="password123", source="source1"))
+    assert controllers_datas_instance.search("jd") == [(1, "John Doe")]
+
+def test_fuzzy_find(controllers_datas_instance):
+    """
+    Tests typo-tolerant search through the ControllersDatas instance, including
+    entries added after the index was built.
+    """
+    controllers_datas_instance.add_data(Data(name="gmail", username="jdoe", password="password123", source="google.com"))
+    assert controllers_datas_instance.fuzzy_find("gmial") == [(1, "gmail")]
+    controllers_datas_instance.add_data(Data(name="github", username="jdoe", password="password123", source="github.com"))
+    assert controllers_datas_instance.fuzzy_find("githbu")[0] == (2, "github")
+
+def test_master_password(controllers_datas_instance):
+    """
+    Tests setting a master password and unlocking through the ControllersDatas instance.
+    """
+    assert not controllers_datas_instance.has_master_password()
+    controllers_datas_instance.set_master_password("master", KdfParams(n=2 ** 10))
+    controllers_datas_instance.add_data(Data(name="John Doe", username="jdoe", password="password123", source="source1"))
+    assert controllers_datas_instance.has_master_password()
+    assert not controllers_datas_instance.is_locked()
+    controllers_datas_instance.unlock("master")
+    assert controllers_datas_instance.get_one_data(1).password.reveal() == "password123"
+
+def test_submit_runs_calls_on_worker_thread(controllers_datas_instance):
+    """
+    Tests that submitted calls run in order on the worker thread, and that their changes
+    are reported from that thread.
+    """
+    threads = []
+    controllers_datas_instance.add_listener(lambda kind, data: threads.append(threading.current_thread()))
+    added = controllers_datas_instance.submit(controllers_datas_instance.add_data,
+                                              Data(name="John Doe", username="jdoe", password="password123", source="source1"))
+    names = controllers_datas_instance.submit(controllers_datas_instance.list_names)
+    assert added.result(timeout=5) is True
+    assert names.result(timeout=5) == [(1, "John Doe")]
+    assert threads and threads[0] is not threading.current_thread()
+
+def test_iter_all_datas(controllers_datas_instance):
+    """
+    Tests that iter_all_datas yields every entry through the ControllersDatas instance.
+    """
+    controllers_datas_instance.add_many(Data(name=f"entry {i}", username="jdoe", password="p", source="s") for i in range(5))
+    assert [data.name for data in controllers_datas_instance.iter_all_datas(batch_size=2)] == [f"entry {i}" for i in range(5)]
+
+def test_get_table(controllers_datas_instance):
+    """
+    Tests that get_table lists the ids, names and sources of the entries.
+    """
+    controllers_datas_instance.add_data(Data(name="gmail", username="jdoe", password="p", source="google.com"))
+    controllers_datas_instance.add_data(Data(name="drive", username="jdoe", password="p", source="google.com"))
+    table = controllers_datas_instance.get_table()
+    assert list(table.rows()) == [(1, "gmail", "google.com"), (2, "drive", "google.com")]
+
+def test_cached_controller(datas_instance):
+    """
+    Tests that a controller with a cache serves repeated reads from memory and reports it.
+    """
+    controller = ControllersDatas(datas_instance, cache=True)
+    assert controller.cache_stats().hits == 0
+    controller.add_data(Data(name="gmail", username="jdoe", password="p", source="google.com"))
+    controller.add_data(Data(name="Drive", username="jdoe", password="p", source="google.com"))
+    controller.modif_data(1, Data(name="Gmail", username="jdoe", password="p", source="google.com"))
+    assert controller.get_one_data(1).name == "Gmail"
+    assert controller.sorted_names() == [(2, "Drive"), (1, "Gmail")]
+    assert controller.cache_stats().hits == 1
+    assert ControllersDatas(datas_instance).sorted_names() == [(2, "Drive"), (1, "Gmail")]
+    assert ControllersDatas(datas_instance).cache_stats() is None
+
+def test_controller_operations_are_timed(controllers_datas_instance):
+    """
+    Tests that the operations of the controller are measured along with the queries they run.
+    """
+    controllers_datas_instance.add_data(Data(name="gmail", username="jdoe", password="p", source="google.com"))
+    assert controllers_datas_instance.stats()["enabled"] is False
+    controllers_datas_instance.enable_instrumentation()
+    controllers_datas_instance.get_one_data(1)
+    operations = controllers_datas_instance.stats()["operations"]
+    assert operations["controller.get_one_data"]["count"] == 1
+    assert operations["fetch_one"]["count"] == 1
+    controllers_datas_instance.disable_instrumentation()
+    assert controllers_datas_instance.instrumentation is None
+
+def test_fuzzy_index_is_rebuilt_after_bulk_import(controllers_datas_instance, tmp_path):
+    """
+    Tests that typo-tolerant search finds the entries of a bulk import, which are not
+    reported to the index one by one.
+    """
+    controllers_datas_instance.add_data(Data(name="gmail", username="jdoe", password="password123", source="google.com"))
+    assert controllers_datas_instance.fuzzy_find("gmial") == [(1, "gmail")]
+    path = tmp_path / "import.csv"
+    path.write_text("name,password\ngithub,pw\n")
+    controllers_datas_instance.import_csv(str(path))
+    assert controllers_datas_instance.fuzzy_find("githbu")[0] == (2, "github")
+
+def test_submit_apart_runs_calls_on_their_own_thread(controllers_datas_instance):
+    """
+    Tests that a long call runs on a thread of its own, so that the calls submitted to the
+    worker meanwhile are not held up by it.
+    """
+    release = threading.Event()
+    threads = {}
+    def long_call():
+        threads["apart"] = threading.current_thread()
+        release.wait(5)
+        return "done"
+    apart = controllers_datas_instance.submit_apart(long_call)
+    names = controllers_datas_instance.submit(controllers_datas_instance.list_names)
+    assert names.result(timeout=2) == []
+    release.set()
+    assert apart.result(timeout=5) == "done"
+    assert threads["apart"] is not threading.current_thread()
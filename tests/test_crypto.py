@@ -0,0 +1,128 @@
+# -*- coding: utf-8 -*-
+"""
+__author__ = "<Adrien Mertens>"
+__version__ = "1.0"
+"""
+
+import pytest
+from models.crypto import Cipher, KdfParams, LazySecret, SecretCache, derive_key, reveal, FORMAT_VERSION, NONCE_SIZE
+
+# Cheap parameters so that the tests do not pay the cost of a real derivation
+FAST_KDF = KdfParams(n=2 ** 10, r=8, p=1)
+
+def test_derive_key_is_deterministic()->None:
+    """
+    Tests that the same password, salt and parameters always give the same key,
+    and that changing any of them gives another key.
+
+    :return: None
+    """
+    key = derive_key("master", b"salt" * 4, FAST_KDF)
+    assert len(key) == 32
+    assert key == derive_key("master", b"salt" * 4, FAST_KDF)
+    assert key != derive_key("Master", b"salt" * 4, FAST_KDF)
+    assert key != derive_key("master", b"SALT" * 4, FAST_KDF)
+    assert key != derive_key("master", b"salt" * 4, KdfParams(n=2 ** 11))
+
+def test_kdf_params_are_validated()->None:
+    """
+    Tests that invalid scrypt parameters are refused.
+
+    :return: None
+    """
+    with pytest.raises(ValueError):
+        KdfParams(n=1000)
+    with pytest.raises(ValueError):
+        KdfParams(r=0)
+
+def test_cipher_round_trip()->None:
+    """
+    Tests that an encrypted value decrypts to the original text, and that two
+    encryptions of the same text differ thanks to their random nonce.
+
+    :return: None
+    """
+    cipher = Cipher.from_master_password("master", b"salt" * 4, FAST_KDF)
+    token = cipher.encrypt("pässword", b"password")
+    assert token[:1] == FORMAT_VERSION
+    assert len(token) == 1 + NONCE_SIZE + len("pässword".encode()) + 16
+    assert cipher.decrypt(token, b"password") == "pässword"
+    assert cipher.encrypt("pässword", b"password") != token
+    assert cipher.decrypt_bytes(cipher.encrypt_bytes(b"\x00\xff", b"chunk"), b"chunk") == b"\x00\xff"
+
+def test_cipher_rejects_altered_or_foreign_values()->None:
+    """
+    Tests that decryption fails with another key, another associated data or an
+    altered value.
+
+    :return: None
+    """
+    cipher = Cipher(bytes(32))
+    token = cipher.encrypt("secret", b"password")
+    with pytest.raises(ValueError):
+        Cipher(bytes([1]) * 32).decrypt(token, b"password")
+    with pytest.raises(ValueError):
+        cipher.decrypt(token, b"username")
+    with pytest.raises(ValueError):
+        cipher.decrypt(token[:-1] + bytes([token[-1] ^ 1]), b"password")
+    with pytest.raises(ValueError):
+        cipher.decrypt(b"\x02" + token[1:], b"password")
+
+def test_secret_cache_is_bounded_and_expires()->None:
+    """
+    Tests that the secret cache decrypts each value once, evicts the least recently
+    used secret beyond its size, expires secrets after their time to live, and wipes
+    the plain text it evicts.
+    """
+    now = [0.0]
+    decrypted = []
+    cache = SecretCache(lambda token: decrypted.append(token) or token.decode(), maxsize=2, ttl=10,
+                        clock=lambda: now[0])
+    assert cache.get(b"a") == "a" and cache.get(b"b") == "b" and cache.get(b"a") == "a"
+    assert decrypted == [b"a", b"b"]
+
+    buffer = cache._SecretCache__entries[b"b"][0]
+    cache.get(b"c")
+    assert len(cache) == 2 and buffer == bytearray(1)
+    cache.get(b"b")
+    assert decrypted == [b"a", b"b", b"c", b"b"]
+
+    now[0] = 10
+    cache.get(b"b")
+    assert decrypted[-1] == b"b" and len(cache) == 1
+    cache.clear()
+    assert len(cache) == 0
+
+def test_secret_cache_wipes_secrets_on_time()->None:
+    """
+    Tests that a revealed secret is wiped once its time to live has passed, although the
+    cache is not read again, and that a cleared cache stops its timer.
+    """
+    import time
+    cache = SecretCache(lambda token: token.decode(), ttl=0.05)
+    cache.get(b"first")
+    buffer = cache._SecretCache__entries[b"first"][0]
+    time.sleep(0.02)
+    cache.get(b"second")
+    deadline = time.monotonic() + 5
+    while len(cache) and time.monotonic() < deadline:
+        time.sleep(0.01)
+    assert len(cache) == 0 and buffer == bytearray(len(b"first"))
+    assert cache._SecretCache__timer is None
+
+    cache.get(b"third")
+    cache.clear()
+    assert cache._SecretCache__timer is None
+
+def test_lazy_secret()->None:
+    """
+    Tests that a lazy secret is decrypted only when revealed and never shows its value.
+    """
+    cipher = Cipher(bytes(32))
+    cache = SecretCache(lambda token: cipher.decrypt(token, b"password"))
+    secret = LazySecret(cipher.encrypt("hunter2", b"password"), cache)
+    assert len(cache) == 0
+    assert "hunter2" not in repr(secret) and "hunter2" not in str(secret)
+    assert secret.reveal() == "hunter2" and reveal(secret) == "hunter2"
+    assert reveal("plain") == "plain" and reveal(None) is None
+    assert len(cache) == 1
@@ -0,0 +1,103 @@
+# -*- coding: utf-8 -*-
+"""
+__author__ = "<Adrien Mertens>"
+__version__ = "1.0"
+"""
+
+import io
+import threading
+import pytest
+from models.csvImport import import_csv, map_columns, normalize, split_records
+from models.data import Data, Datas, RELOADED
+
+# Export of Chrome: a quoted password holding a quote and a line break, a row without
+# a name, a row without a password and a name repeated with another case
+CHROME_EXPORT = ('﻿name,url,username,password,note\r\n'
+                 'Gmail,https://www.google.com/login,jdoe,"p""1\nx",\r\n'
+                 ',https://github.com/session,me,p2,\r\n'
+                 'broken,https://example.org,me,,\r\n'
+                 'gmail,,other,p3,\r\n')
+
+@pytest.fixture
+def chrome_export(tmp_path)->str:
+    """
+    Provides the path of a CSV file exported by Chrome.
+    :param tmp_path: A pytest fixture providing a temporary directory.
+    :return: The path of the file.
+    """
+    path = tmp_path / "chrome.csv"
+    path.write_text(CHROME_EXPORT, encoding="utf-8", newline="")
+    return str(path)
+
+def test_map_columns()->None:
+    """
+    Tests that the headers of several password managers are mapped, and that a header without password is rejected.
+    """
+    assert map_columns(["name", "url", "username", "password", "note"]) == {
+        "name": 0, "username": 2, "password": 3, "source": 1}
+    assert map_columns(["folder", "favorite", "type", "name", "notes", "fields", "reprompt", "login_uri",
+                        "login_username", "login_password", "login_totp"]) == {
+        "name": 3, "username": 8, "password": 9, "source": 7}
+    assert map_columns(["Account", "Login Name", "Password", "Web Site", "Comments"]) == {
+        "name": 0, "username": 1, "password": 2, "source": 3}
+    with pytest.raises(ValueError):
+        map_columns(["name", "username"])
+
+def test_normalize()->None:
+    """
+    Tests that cells are trimmed, that the name falls back to the host, and that rows without password are invalid.
+    """
+    columns = {"name": 0, "username": 1, "password": 2, "source": 3}
+    assert normalize(["  My   bank ", " jdoe ", "pw", "https://www.bank.be/login?x=1"], columns) == (
+        "My bank", "jdoe", "pw", "bank.be")
+    assert normalize(["", "jdoe", "pw", "https://github.com"], columns) == ("github.com", "jdoe", "pw", "github.com")
+    assert normalize(["site", "jdoe", "pw"], columns) == ("site", "jdoe", "pw", None)
+    assert normalize(["site", "jdoe", "", "x.org"], columns) is None
+
+def test_split_records_keeps_quoted_line_breaks()->None:
+    """
+    Tests that blocks never end inside a quoted field, whatever the block size.
+    """
+    content = b'a,"b\nc ""d"""\ne,f\n"g\n\nh",i\n'
+    for chunk_bytes in (1, 3, 7, 100):
+        chunks = list(split_records(io.BytesIO(content), chunk_bytes))
+        assert b"".join(chunks) == content
+        assert all(chunk.count(b'"') % 2 == 0 for chunk in chunks)
+
+@pytest.mark.parametrize("processes", [1, 2])
+def test_import_csv(chrome_export, processes)->None:
+    """
+    Tests the import of an export of Chrome in small blocks, in process and with a pool, into a vault ignoring case.
+    """
+    with Datas(case_sensitive_names=False) as datas:
+        datas.register_data(Data(name="GITHUB.COM", username="me", password="old"))
+        reports = []
+        stats = import_csv(datas, chrome_export, processes=processes, chunk_bytes=16, progress=reports.append)
+        assert (stats.rows, stats.inserted, stats.duplicates, stats.invalid, stats.failed) == (4, 1, 2, 1, 0)
+        assert stats.bytes_read == stats.total_bytes and not stats.cancelled
+        assert reports and reports[-1].fraction == 1.0
+        data = datas.get_one_data_by_name("gmail")
+        assert (data.name, data.username, data.password, data.source) == ("Gmail", "jdoe", 'p"1\nx', "google.com")
+        assert len(datas.get_all_Data_in_db()) == 2
+
+def test_import_csv_cancel(tmp_path)->None:
+    """
+    Tests that a cancelled import stops after the current batch and keeps the entries inserted.
+    """
+    path = tmp_path / "many.csv"
+    path.write_text("name,password\n" + "".join(f"entry-{i},pw\n" for i in range(100)))
+    cancel = threading.Event()
+    with Datas() as datas:
+        stats = import_csv(datas, str(path), batch_size=10, progress=lambda _: cancel.set(), cancel=cancel)
+        assert stats.cancelled and stats.inserted == 10
+        assert len(datas.get_all_Data_in_db()) == 10
+
+def test_import_csv_notifies_once(chrome_export)->None:
+    """
+    Tests that the listeners of the vault receive a single change for the whole import.
+    """
+    with Datas() as datas:
+        changes = []
+        datas.add_listener(lambda kind, data: changes.append(kind))
+        stats = import_csv(datas, chrome_export, batch_size=1)
+        assert stats.inserted == 3 and changes == [RELOADED]
@@ -6,7 +6,11 @@ __version__ = "1.0"
 
 import os
 import pytest
-from models.data import Data, Datas
+from models.data import Data, Datas, INSERTED, DUPLICATE, FAILED, UPDATED, DELETED, STORAGE_PROFILES
+from models.crypto import KdfParams, InvalidMasterPassword, LazySecret, VaultLockedError, reveal
+
+# Cheap key derivation so that the tests do not pay the cost of the real one
+FAST_KDF = KdfParams(n=2 ** 10, r=8, p=1)
 
 # Fixture pour créer une instance de Datas avec une base de données temporaire
 @pytest.fixture
@@ -23,6 +27,7 @@ def datas_instance(tmp_path)->Datas:
     db_path = tmp_path / "test_database.db"
     datas = Datas(path_db=str(db_path))
     yield datas
+    datas.close()
     # Supprime le fichier de la base de données après l'exécution des tests
     if os.path.exists(db_path):
         try:
@@ -228,3 +233,748 @@ def test_data_class_modification()->None:
     assert data.username == "modified_user"
     assert data.password == "<MODIFIED_PASSWORD>"
     assert data.source == "modified_source"
+
+def test_data_class_is_slotted_and_can_be_frozen()->None:
+    """
+    Tests that Data instances have no __dict__, and that their frozen copy is immutable,
+    hashable and can be turned back into a Data.
+
+    :return: None
+    """
+    data = Data(name="gmail", username="user", password="p", source="google.com", id=3)
+    assert not hasattr(data, "__dict__")
+    frozen = data.freeze()
+    with pytest.raises(AttributeError):
+        frozen.name = "other"
+    assert hash(frozen) == hash(Data(name="gmail", username="user", password="p", source="google.com", id=3).freeze())
+    assert frozen.thaw() == data
+
+def test_connection_is_reused_between_calls(datas_instance)->None:
+    """
+    Tests that consecutive operations borrow the same pooled connection instead
+    of opening a new one for each statement.
+
+    :param datas_instance: The Datas instance under test.
+    :type datas_instance: Datas
+    :return: None
+    """
+    with datas_instance._get_connection() as first:
+        pass
+    datas_instance.register_data(Data(name="pool", username="user", password="pwd", source="src"))
+    with datas_instance._get_connection() as second:
+        assert second is first
+
+def test_nested_connection_is_shared_by_thread(datas_instance)->None:
+    """
+    Tests that a nested call made by the thread already holding a connection
+    reuses it, so a pool of one connection cannot deadlock.
+
+    :param datas_instance: The Datas instance under test.
+    :type datas_instance: Datas
+    :return: None
+    """
+    with datas_instance._get_connection() as outer:
+        with datas_instance._get_connection() as inner:
+            assert inner is outer
+
+def test_generator_closed_by_another_thread_releases_its_owner(tmp_path)->None:
+    """
+    Tests that a generator holding a connection, closed by another thread, gives the
+    connection back without leaving it bound to the thread that opened it, so that the
+    connection is never used by two threads at once.
+
+    :param tmp_path: A pytest fixture providing a temporary directory.
+    :return: None
+    """
+    import threading
+
+    with Datas(path_db=str(tmp_path / "threads.db"), pool_size=2) as datas:
+        datas.register_many(Data(name=f"entry {i}", username="u", password="p", source="s") for i in range(5))
+        entries = datas.iter_all(batch_size=2)
+        next(entries)
+        closer = threading.Thread(target=entries.close)
+        closer.start()
+        closer.join()
+        assert not datas._owners
+
+        taken = {}
+        def hold() -> None:
+            with datas._get_connection() as conn:
+                taken["other"] = conn
+        holder = threading.Thread(target=hold)
+        with datas._get_connection() as conn:
+            holder.start()
+            holder.join()
+        assert taken["other"] is not conn
+
+def test_pool_is_shared_between_threads(tmp_path)->None:
+    """
+    Tests that several threads can use a pooled instance concurrently and that
+    the pool never opens more connections than its configured size.
+
+    :param tmp_path: A pytest fixture providing a temporary directory.
+    :return: None
+    """
+    import threading
+
+    with Datas(path_db=str(tmp_path / "threads.db"), pool_size=2) as datas:
+        def worker(index: int) -> None:
+            for i in range(20):
+                datas.register_data(Data(name=f"{index}-{i}", username="u", password="p", source="s"))
+
+        threads = [threading.Thread(target=worker, args=(index,)) for index in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        assert len(datas.get_all_Data_in_db()) == 80
+        assert datas._opened_connections <= 2
+
+def test_pool_disabled_opens_connection_per_call(tmp_path)->None:
+    """
+    Tests that a pool size of 0 keeps the historical connect-per-call behaviour.
+
+    :param tmp_path: A pytest fixture providing a temporary directory.
+    :return: None
+    """
+    datas = Datas(path_db=str(tmp_path / "nopool.db"), pool_size=0)
+    assert datas.register_data(Data(name="a", username="u", password="p", source="s"))
+    with datas._get_connection() as first:
+        pass
+    with datas._get_connection() as second:
+        assert second is not first
+    assert datas._opened_connections == 0
+
+def test_in_memory_database_keeps_its_data()->None:
+    """
+    Tests that an in-memory database keeps its table and rows between calls,
+    since it is served by a single persistent connection.
+
+    :return: None
+    """
+    with Datas() as datas:
+        assert datas.register_data(Data(name="memory", username="u", password="p", source="s"))
+        assert len(datas.get_all_Data_in_db()) == 1
+
+def test_closed_datas_refuses_operations(tmp_path)->None:
+    """
+    Tests that the context manager closes the pool and that a closed instance
+    refuses any further operation.
+
+    :param tmp_path: A pytest fixture providing a temporary directory.
+    :return: None
+    """
+    with Datas(path_db=str(tmp_path / "closed.db")) as datas:
+        datas.register_data(Data(name="a", username="u", password="p", source="s"))
+    assert datas._opened_connections == 0
+    assert datas.fetch_one("SELECT 1") is None
+    with pytest.raises(ValueError):
+        Datas(path_db=str(tmp_path / "invalid.db"), pool_size=-1)
+
+def test_default_storage_profile_is_durable(tmp_path)->None:
+    """
+    Tests that, unless another profile is asked for, every commit is synced to disk.
+
+    :param tmp_path: A pytest fixture providing a temporary directory.
+    :return: None
+    """
+    with Datas(path_db=str(tmp_path / "default.db")) as datas:
+        assert datas.storage_profile == "safe"
+        # 2 is FULL
+        assert datas.fetch_one("PRAGMA synchronous") == (2,)
+
+@pytest.mark.parametrize("profile", ["safe", "balanced", "fast"])
+def test_storage_profile_is_applied_to_each_connection(tmp_path, profile)->None:
+    """
+    Tests that every pooled connection is opened in WAL mode with the synchronous level,
+    cache size, memory map size and temporary storage of the storage profile.
+
+    :param tmp_path: A pytest fixture providing a temporary directory.
+    :param profile: The storage profile under test.
+    :return: None
+    """
+    expected = STORAGE_PROFILES[profile]
+    synchronous = {"OFF": 0, "NORMAL": 1, "FULL": 2}
+    temp_store = {"DEFAULT": 0, "FILE": 1, "MEMORY": 2}
+    with Datas(path_db=str(tmp_path / "profile.db"), storage_profile=profile) as datas:
+        with datas._get_connection() as first:
+            second = datas._open_connection()
+            for conn in (first, second):
+                assert conn.execute("PRAGMA journal_mode").fetchone()[0] == "wal"
+                assert conn.execute("PRAGMA synchronous").fetchone()[0] == synchronous[expected["synchronous"]]
+                assert conn.execute("PRAGMA cache_size").fetchone()[0] == expected["cache_size"]
+                assert conn.execute("PRAGMA temp_store").fetchone()[0] == temp_store[expected["temp_store"]]
+            second.close()
+
+def test_unknown_storage_profile_is_refused(tmp_path)->None:
+    """
+    Tests that an unknown storage profile is refused.
+
+    :param tmp_path: A pytest fixture providing a temporary directory.
+    :return: None
+    """
+    with pytest.raises(ValueError):
+        Datas(path_db=str(tmp_path / "invalid.db"), storage_profile="reckless")
+
+def test_register_many_reports_outcomes(datas_instance)->None:
+    """
+    Tests that `register_many` inserts new entries and reports duplicates, both
+    against the database and inside the input, as well as invalid entries.
+
+    :param datas_instance: The Datas instance under test.
+    :type datas_instance: Datas
+    :return: None
+    """
+    datas_instance.register_data(Data(name="existing", username="u", password="p", source="s"))
+    outcomes = datas_instance.register_many([
+        Data(name="new", username="u", password="p", source="s"),
+        Data(name="existing", username="u", password="p", source="s"),
+        Data(name="new", username="u", password="p", source="s"),
+        Data(name="no password", username="u", source="s"),
+    ])
+    assert outcomes == [INSERTED, DUPLICATE, DUPLICATE, FAILED]
+    assert sorted(data.name for data in datas_instance.get_all_Data_in_db()) == ["existing", "new"]
+
+def test_register_many_streams_generator_in_batches(datas_instance)->None:
+    """
+    Tests that `register_many` consumes a generator across several batches.
+
+    :param datas_instance: The Datas instance under test.
+    :type datas_instance: Datas
+    :return: None
+    """
+    generator = (Data(name=f"entry-{i % 250}", username="u", password="p", source="s") for i in range(300))
+    outcomes = datas_instance.register_many(generator, batch_size=100)
+    assert outcomes.count(INSERTED) == 250
+    assert outcomes.count(DUPLICATE) == 50
+    assert len(datas_instance.get_all_Data_in_db()) == 250
+
+def test_listeners_receive_changes(datas_instance)->None:
+    """
+    Tests that listeners are notified of insertions, updates and deletions with
+    the id of the affected entry, and no longer once removed.
+
+    :param datas_instance: The Datas instance under test.
+    :type datas_instance: Datas
+    :return: None
+    """
+    changes = []
+    listener = lambda kind, data: changes.append((kind, data.id, data.name))
+    datas_instance.add_listener(listener)
+
+    datas_instance.register_data(Data(name="first", username="u", password="p", source="s"))
+    datas_instance.register_data(Data(name="first", username="u", password="p", source="s"))
+    datas_instance.modify_data(1, Data(name="renamed", username="u", password="p", source="s"))
+    datas_instance.register_many([Data(name="bulk", username="u", password="p", source="s")])
+    bulk_id = datas_instance.list_names()[-1][0]
+    datas_instance.remove_data(1)
+    datas_instance.remove_listener(listener)
+    datas_instance.remove_data(bulk_id)
+
+    assert changes == [(INSERTED, 1, "first"), (UPDATED, 1, "renamed"), (INSERTED, bulk_id, "bulk"), (DELETED, 1, None)]
+
+def test_register_many_notifies_committed_entries(datas_instance)->None:
+    """
+    Tests that the entries inserted by `register_many` are notified once committed, in
+    id order, with their id, and that duplicates and failed entries are not.
+
+    :param datas_instance: The Datas instance under test.
+    :type datas_instance: Datas
+    :return: None
+    """
+    datas_instance.register_data(Data(name="existing", username="u", password="p", source="s"))
+    changes = []
+    def listener(kind, data):
+        assert datas_instance.get_one_data_in_db(data.id).name == data.name
+        changes.append((kind, data.id, data.name, data.password))
+    datas_instance.add_listener(listener)
+    entries = (Data(name=name, username="u", password="p", source="s")
+               for name in ["a", "existing", "b", "a", "c"] + [f"entry {i}" for i in range(20)])
+    datas_instance.register_many(entries, batch_size=3)
+    assert [change[1] for change in changes] == list(range(2, 25))
+    assert changes[:3] == [(INSERTED, 2, "a", "p"), (INSERTED, 3, "b", "p"), (INSERTED, 4, "c", "p")]
+
+def test_failing_listener_does_not_fail_write(datas_instance)->None:
+    """
+    Tests that an exception raised by a listener does not make the write fail.
+
+    :param datas_instance: The Datas instance under test.
+    :type datas_instance: Datas
+    :return: None
+    """
+    def listener(kind, data):
+        raise RuntimeError("boom")
+
+    datas_instance.add_listener(listener)
+    assert datas_instance.register_data(Data(name="a", username="u", password="p", source="s"))
+
+def test_get_page_uses_keyset(datas_instance)->None:
+    """
+    Tests that `get_page` returns entries by id, page after page, and a short
+    page at the end of the table.
+
+    :param datas_instance: The Datas instance under test.
+    :type datas_instance: Datas
+    :return: None
+    """
+    datas_instance.register_many(Data(name=f"entry-{i}", username="u", password="p", source="s") for i in range(5))
+    datas_instance.remove_data(2)
+
+    first_page = datas_instance.get_page(limit=2)
+    assert [data.id for data in first_page] == [1, 3]
+    second_page = datas_instance.get_page(after_id=first_page[-1].id, limit=2)
+    assert [data.id for data in second_page] == [4, 5]
+    assert datas_instance.get_page(after_id=5, limit=2) == []
+
+def test_list_names_returns_only_ids_and_names(datas_instance)->None:
+    """
+    Tests that `list_names` returns `(id, name)` tuples, page by page, without
+    any secret field.
+
+    :param datas_instance: The Datas instance under test.
+    :type datas_instance: Datas
+    :return: None
+    """
+    datas_instance.register_many(Data(name=f"entry-{i}", username="u", password="p", source="s") for i in range(3))
+    assert datas_instance.list_names() == [(1, "entry-0"), (2, "entry-1"), (3, "entry-2")]
+    assert datas_instance.list_names(after_id=1, limit=1) == [(2, "entry-1")]
+
+def test_names_are_unique(datas_instance)->None:
+    """
+    Tests that a name cannot be registered twice, nor given to another entry.
+
+    :param datas_instance: The Datas instance under test.
+    :type datas_instance: Datas
+    :return: None
+    """
+    assert datas_instance.register_data(Data(name="gmail", username="u", password="p", source="s"))
+    assert not datas_instance.register_data(Data(name="gmail", username="v", password="q", source="t"))
+    assert datas_instance.register_data(Data(name="Gmail", username="u", password="p", source="s"))
+    assert not datas_instance.modify_data(2, Data(name="gmail", username="u", password="p", source="s"))
+    assert datas_instance.check_if_user_data_exists(Data(name="Gmail"))
+    assert not datas_instance.check_if_user_data_exists(Data(name="GMAIL"))
+
+def test_case_insensitive_names(tmp_path)->None:
+    """
+    Tests that names differing only by case are duplicates when names are not
+    case sensitive, for single and bulk registrations.
+
+    :param tmp_path: A pytest fixture providing a temporary directory.
+    :return: None
+    """
+    with Datas(path_db=str(tmp_path / "nocase.db"), case_sensitive_names=False) as datas:
+        assert datas.register_data(Data(name="gmail", username="u", password="p", source="s"))
+        assert not datas.register_data(Data(name="GMail", username="u", password="p", source="s"))
+        assert datas.check_if_user_data_exists(Data(name="GMAIL"))
+        outcomes = datas.register_many([Data(name="GMAIL", username="u", password="p", source="s"),
+                                        Data(name="outlook", username="u", password="p", source="s"),
+                                        Data(name="Outlook", username="u", password="p", source="s")])
+        assert outcomes == [DUPLICATE, INSERTED, DUPLICATE]
+
+def test_register_many_finds_duplicates_ignoring_case_in_one_statement()->None:
+    """
+    Tests that, in a vault ignoring case, names differing from a stored one or from
+    another of the batch only by case are reported as duplicates without rolling the
+    batch back and inserting it row by row.
+    """
+    with Datas(case_sensitive_names=False) as datas:
+        assert datas.register_data(Data(name="Gmail", username="u", password="p", source="s"))
+        statements = []
+        with datas._get_connection() as conn:
+            conn.set_trace_callback(statements.append)
+        outcomes = datas.register_many([Data(name="gmail", username="u", password="p", source="s"),
+                                        Data(name="bank", username="u", password="p", source="s"),
+                                        Data(name="BANK", username="u", password="p", source="s"),
+                                        Data(name="mail", username="u", password="p", source="s")])
+        assert outcomes == [DUPLICATE, INSERTED, DUPLICATE, INSERTED]
+        assert not any("ROLLBACK TO" in statement for statement in statements)
+        assert sorted(name for _, name in datas.list_names()) == ["Gmail", "bank", "mail"]
+
+def test_existing_duplicates_are_renamed(tmp_path)->None:
+    """
+    Tests that opening a database created without the unique index renames the
+    duplicated names instead of deleting entries, and then enforces uniqueness.
+
+    :param tmp_path: A pytest fixture providing a temporary directory.
+    :return: None
+    """
+    import sqlite3
+
+    path = str(tmp_path / "legacy.db")
+    conn = sqlite3.connect(path)
+    conn.execute('''CREATE TABLE data (id INTEGER PRIMARY KEY AUTOINCREMENT, name TEXT NOT NULL,
+                    username TEXT NOT NULL, password TEXT NOT NULL, source TEXT)''')
+    conn.executemany("INSERT INTO data (name, username, password, source) VALUES (?, 'u', 'p', 's')",
+                     [("mail",), ("mail",), ("mail (2)",), ("mail",), ("bank",)])
+    conn.commit()
+    conn.close()
+
+    with Datas(path_db=path) as datas:
+        assert [name for _, name in datas.list_names()] == ["mail", "mail (3)", "mail (2)", "mail (4)", "bank"]
+        assert not datas.register_data(Data(name="mail", username="u", password="p", source="s"))
+
+def test_search_matches_words_by_prefix(datas_instance)->None:
+    """
+    Tests that `search` finds entries by name, username or source prefixes,
+    requires every word, and follows modifications and deletions.
+
+    :param datas_instance: The Datas instance under test.
+    :type datas_instance: Datas
+    :return: None
+    """
+    datas_instance.register_data(Data(name="Gmail perso", username="john", password="p", source="google.com"))
+    datas_instance.register_data(Data(name="Banque", username="jdoe_42", password="p", source="bank.be"))
+    assert datas_instance.full_text_search
+
+    assert datas_instance.search("gma") == [(1, "Gmail perso")]
+    assert datas_instance.search("google") == [(1, "Gmail perso")]
+    assert datas_instance.search("jdoe_42") == [(2, "Banque")]
+    assert datas_instance.search("gmail bank") == []
+    assert datas_instance.search("  ") == []
+
+    datas_instance.modify_data(1, Data(name="Outlook", username="john", password="p", source="live.com"))
+    assert datas_instance.search("gmail") == []
+    assert datas_instance.search("outl") == [(1, "Outlook")]
+    datas_instance.remove_data(1)
+    assert datas_instance.search("outlook") == []
+
+def test_search_index_is_built_for_existing_entries(tmp_path)->None:
+    """
+    Tests that the full-text index is built from the entries of a database created
+    before it existed.
+
+    :param tmp_path: A pytest fixture providing a temporary directory.
+    :return: None
+    """
+    import sqlite3
+
+    path = str(tmp_path / "legacy.db")
+    conn = sqlite3.connect(path)
+    conn.execute('''CREATE TABLE data (id INTEGER PRIMARY KEY AUTOINCREMENT, name TEXT NOT NULL,
+                    username TEXT NOT NULL, password TEXT NOT NULL, source TEXT)''')
+    conn.execute("INSERT INTO data (name, username, password, source) VALUES ('github', 'u', 'p', 's')")
+    conn.commit()
+    conn.close()
+
+    with Datas(path_db=path) as datas:
+        assert datas.search("git") == [(1, "github")]
+
+def test_search_without_full_text_index(datas_instance)->None:
+    """
+    Tests the substring fallback used when SQLite has no FTS5.
+
+    :param datas_instance: The Datas instance under test.
+    :type datas_instance: Datas
+    :return: None
+    """
+    datas_instance.register_data(Data(name="Gmail perso", username="john", password="p", source="google.com"))
+    datas_instance.register_data(Data(name="Banque", username="jdoe_42", password="p", source="bank.be"))
+    datas_instance.full_text_search = False
+
+    assert datas_instance.search("mail") == [(1, "Gmail perso")]
+    assert datas_instance.search("doe_4 bank") == [(2, "Banque")]
+    assert datas_instance.search("doe4") == []
+
+def test_data_version_changes_on_commit(datas_instance)->None:
+    """
+    Tests that the data version changes when a write is committed, and not otherwise.
+
+    :param datas_instance: The Datas instance under test.
+    :type datas_instance: Datas
+    :return: None
+    """
+    version = datas_instance.data_version()
+    datas_instance.get_all_Data_in_db()
+    assert datas_instance.data_version() == version
+    datas_instance.register_data(Data(name="a", username="u", password="p", source="s"))
+    assert datas_instance.data_version() != version
+    assert Datas().data_version() == 0
+
+def test_iter_all_streams_entries(datas_instance)->None:
+    """
+    Tests that iter_all yields every entry in id order across several batches, holds its
+    connection only while it is iterated, and lets the same thread make other calls
+    meanwhile.
+
+    :param datas_instance: The Datas instance under test.
+    :type datas_instance: Datas
+    :return: None
+    """
+    datas_instance.register_many(Data(name=f"entry {i}", username="u", password="p", source="s") for i in range(25))
+    entries = datas_instance.iter_all(batch_size=10)
+    first = next(entries)
+    assert first.id == 1 and datas_instance._owners
+    assert datas_instance.get_one_data_in_db(25).name == "entry 24"
+    assert [data.id for data in entries] == list(range(2, 26))
+    assert not datas_instance._owners
+
+    entries = datas_instance.iter_all(batch_size=10)
+    next(entries)
+    entries.close()
+    assert not datas_instance._owners
+    assert [data.id for data in datas_instance.get_all_Data_in_db()] == list(range(1, 26))
+
+def test_list_names_and_sources(datas_instance)->None:
+    """
+    Tests that `list_names_and_sources` returns ids, names and sources only.
+
+    :param datas_instance: The Datas instance under test.
+    :type datas_instance: Datas
+    :return: None
+    """
+    datas_instance.register_data(Data(name="gmail", username="u", password="p", source="google.com"))
+    assert datas_instance.list_names_and_sources() == [(1, "gmail", "google.com")]
+
+def test_master_password_encrypts_passwords(datas_instance)->None:
+    """
+    Tests that setting a master password encrypts the passwords already stored and
+    the ones stored afterwards, while reads still return them in plain text.
+
+    :param datas_instance: The Datas instance under test.
+    :type datas_instance: Datas
+    :return: None
+    """
+    datas_instance.register_data(Data(name="before", username="u", password="first secret", source="s"))
+    assert not datas_instance.is_encrypted
+    datas_instance.set_master_password("master", FAST_KDF)
+    datas_instance.register_data(Data(name="after", username="u", password="second secret", source="s"))
+    datas_instance.register_many([Data(name="bulk", username="u", password="third secret", source="s")])
+    datas_instance.modify_data(1, Data(name="before", username="u", password="new secret", source="s"))
+
+    stored = datas_instance.fetch_all("SELECT password FROM data ORDER BY id")
+    assert all(isinstance(password, bytes) for password, in stored)
+    assert [reveal(data.password) for data in datas_instance.get_all_Data_in_db()] == ["new secret", "second secret", "third secret"]
+    assert datas_instance.is_encrypted and not datas_instance.is_locked
+    with pytest.raises(ValueError):
+        datas_instance.set_master_password("other", FAST_KDF)
+
+def test_unlock_checks_master_password(tmp_path)->None:
+    """
+    Tests that a reopened encrypted vault is locked, refuses a wrong master password
+    and gives back the passwords once unlocked with the right one.
+
+    :param tmp_path: A pytest fixture providing a temporary directory.
+    :return: None
+    """
+    path = str(tmp_path / "vault.db")
+    with Datas(path_db=path) as datas:
+        datas.set_master_password("master", FAST_KDF)
+        datas.register_data(Data(name="gmail", username="u", password="secret", source="s"))
+
+    with Datas(path_db=path) as datas:
+        assert datas.is_locked
+        assert datas.list_names() == [(1, "gmail")]
+        with pytest.raises(VaultLockedError):
+            datas.get_one_data_in_db(1).password.reveal()
+        with pytest.raises(VaultLockedError):
+            datas.register_data(Data(name="other", username="u", password="p", source="s"))
+        with pytest.raises(InvalidMasterPassword):
+            datas.unlock("wrong")
+        datas.unlock("master")
+        assert datas.get_one_data_in_db(1).password.reveal() == "secret"
+        datas.lock()
+        assert datas.is_locked
+
+def test_passwords_are_decrypted_lazily(datas_instance, monkeypatch)->None:
+    """
+    Tests that reading entries from an encrypted vault decrypts nothing, that a revealed
+    password is decrypted once and then served from the cache, and that locking the
+    vault wipes the cache.
+
+    :param datas_instance: The Datas instance under test.
+    :type datas_instance: Datas
+    :return: None
+    """
+    datas_instance.set_master_password("master", FAST_KDF)
+    datas_instance.register_many(Data(name=f"entry {i}", username="u", password=f"secret {i}", source="s")
+                                 for i in range(50))
+    decrypted = []
+    decrypt = datas_instance._decrypt_password
+    monkeypatch.setattr(datas_instance._secrets, "_SecretCache__decrypt", lambda token: decrypted.append(token) or decrypt(token))
+
+    entries = datas_instance.get_all_Data_in_db()
+    assert all(isinstance(data.password, LazySecret) for data in entries)
+    assert "secret" not in repr(entries[0])
+    assert decrypted == []
+
+    assert entries[3].password.reveal() == "secret 3"
+    assert datas_instance.get_one_data_in_db(4).password.reveal() == "secret 3"
+    assert len(decrypted) == 1
+
+    datas_instance.register_data(Data(name="copy", username="u", password=entries[3].password, source="s"))
+    assert datas_instance.get_one_data_in_db(51).password.reveal() == "secret 3"
+
+    datas_instance.lock()
+    assert len(datas_instance._secrets) == 0
+    with pytest.raises(VaultLockedError):
+        entries[3].password.reveal()
+
+def test_unlock_without_master_password(datas_instance)->None:
+    """
+    Tests that unlocking a vault without master password is refused.
+
+    :param datas_instance: The Datas instance under test.
+    :type datas_instance: Datas
+    :return: None
+    """
+    with pytest.raises(ValueError):
+        datas_instance.unlock("master")
+    with pytest.raises(ValueError):
+        datas_instance.set_master_password("")
+
+def test_stats_are_collected_once_enabled(tmp_path)->None:
+    """
+    Tests that the latency of the queries is only measured while instrumentation is enabled, and connections always.
+    """
+    datas = Datas(path_db=str(tmp_path / "stats.db"), instrumented=True)
+    datas.register_data(Data(name="gmail", username="jdoe", password="p", source="google.com"))
+    datas.get_all_Data_in_db()
+    stats = datas.stats()
+    assert stats["enabled"]
+    assert stats["operations"]["execute_query"]["count"] == 1
+    assert stats["operations"]["fetch_one"]["count"] >= 1
+    assert stats["connections"]["opened"] == stats["pool"]["opened"] == 1
+    datas.disable_instrumentation()
+    assert datas.stats() == {"enabled": False, "connections": {"opened": 1, "closed": 0, "open": 1},
+                             "pool": {"size": 5, "opened": 1, "idle": 1}}
+    instrumentation = datas.enable_instrumentation(slow_query_seconds=0)
+    datas.get_one_data_in_db(1)
+    assert instrumentation.slow_queries[0].operation == "fetch_one"
+    datas.close()
+    assert datas.stats()["connections"] == {"opened": 1, "closed": 1, "open": 0}
+
+def test_get_one_data_by_name(tmp_path)->None:
+    """
+    Tests that an entry is found by name, following the case sensitivity of the names.
+    """
+    with Datas(path_db=str(tmp_path / "names.db"), case_sensitive_names=False) as datas:
+        datas.register_data(Data(name="Gmail", username="jdoe", password="p", source="google.com"))
+        assert datas.get_one_data_by_name("gmail").id == 1
+        assert datas.get_one_data_by_name("drive") is None
+
+def test_name_keys_follow_the_unique_index()->None:
+    """
+    Tests that the keys of the names are equal exactly when the unique index considers the names duplicates.
+    """
+    with Datas(case_sensitive_names=False) as datas:
+        datas.register_data(Data(name="Gmail", username="jdoe", password="p"))
+        datas.register_data(Data(name="Élan", username="jdoe", password="p"))
+        assert datas.name_keys() == {"gmail", "Élan"}
+        assert datas.name_key("GMAIL") in datas.name_keys()
+        assert datas.register_data(Data(name="élan", username="jdoe", password="p"))
+    with Datas() as datas:
+        datas.register_data(Data(name="Gmail", username="jdoe", password="p"))
+        assert datas.name_keys() == {"Gmail"}
+
+def test_removed_entries_are_tombstones(datas_instance)->None:
+    """
+    Tests that a removed entry is hidden from every read and frees its name, and that
+    restoring it renames it when its name has been taken in the meantime.
+    """
+    datas_instance.register_data(Data(name="gmail", username="u", password="p", source="google.com"))
+    datas_instance.register_data(Data(name="bank", username="u", password="p", source="bank.be"))
+    assert datas_instance.remove_data(1)
+    assert not datas_instance.remove_data(1)
+    assert [name for _, name in datas_instance.list_names()] == ["bank"]
+    assert datas_instance.get_one_data_in_db(1) is None
+    assert datas_instance.get_one_data_by_name("gmail") is None
+    assert datas_instance.search("gmail") == []
+    assert [(data_id, name) for data_id, name, _ in datas_instance.list_deleted()] == [(1, "gmail")]
+
+    assert datas_instance.register_data(Data(name="gmail", username="new", password="p", source="google.com"))
+    assert datas_instance.restore_data(1)
+    assert not datas_instance.restore_data(1)
+    assert datas_instance.get_one_data_in_db(1).name == "gmail (2)"
+    assert datas_instance.list_deleted() == []
+
+def test_undo_last_delete_restores_the_last_removal(datas_instance)->None:
+    """
+    Tests that the entries removed together by remove_many are restored together, and
+    only those.
+    """
+    for name in ("a", "b", "c", "d"):
+        datas_instance.register_data(Data(name=name, username="u", password="p", source="s"))
+    assert datas_instance.remove_data(1)
+    changes = []
+    datas_instance.add_listener(lambda kind, data: changes.append((kind, data.id)))
+    assert datas_instance.remove_many([2, 3, 1, 99], batch_size=1) == [2, 3]
+    assert changes == [(DELETED, 2), (DELETED, 3)]
+    assert [name for _, name in datas_instance.list_names()] == ["d"]
+
+    assert datas_instance.undo_last_delete() == [2, 3]
+    assert changes[2:] == [(INSERTED, 2), (INSERTED, 3)]
+    assert datas_instance.undo_last_delete() == [1]
+    assert datas_instance.undo_last_delete() == []
+    assert [name for _, name in datas_instance.list_names()] == ["a", "b", "c", "d"]
+
+def test_purge_and_vacuum_give_space_back(datas_instance)->None:
+    """
+    Tests that old tombstones are purged in batches, that recent ones are kept, and that
+    the freed pages are given back to the file system.
+    """
+    datas_instance.register_many(Data(name=f"entry-{i}", username="u", password="p" * 500, source="s")
+                                 for i in range(200))
+    datas_instance.remove_many(range(1, 201))
+    assert datas_instance.purge_deleted(older_than_days=30) == 0
+    assert datas_instance.purge_deleted(older_than_days=0, limit=150) == 150
+    assert datas_instance.purge_deleted(older_than_days=0, limit=150) == 50
+    assert datas_instance.restore_data(1) is False
+    assert datas_instance.incremental_vacuum() > 0
+    assert datas_instance.fetch_all("PRAGMA freelist_count") == [(0,)]
+
+def test_vacuum_switches_existing_databases_to_incremental(tmp_path)->None:
+    """
+    Tests that a database created without incremental auto-vacuum is switched to it by
+    the first vacuum, which gives back the pages of the purged tombstones, and that later
+    purges are given back incrementally.
+
+    :param tmp_path: A pytest fixture providing a temporary directory.
+    :return: None
+    """
+    import sqlite3
+
+    path = str(tmp_path / "legacy.db")
+    conn = sqlite3.connect(path)
+    conn.execute('''CREATE TABLE data (id INTEGER PRIMARY KEY AUTOINCREMENT, name TEXT NOT NULL,
+                    username TEXT NOT NULL, password TEXT NOT NULL, source TEXT)''')
+    conn.executemany("INSERT INTO data (name, username, password, source) VALUES (?, 'u', ?, 's')",
+                     [(f"entry-{i}", "p" * 500) for i in range(400)])
+    conn.commit()
+    conn.close()
+
+    with Datas(path_db=path) as datas:
+        assert datas.fetch_one("PRAGMA auto_vacuum") == (0,)
+        datas.remove_many(range(1, 201))
+        assert datas.purge_deleted(older_than_days=0) == 200
+        assert datas.incremental_vacuum() > 0
+        assert datas.fetch_one("PRAGMA auto_vacuum") == (2,)
+        assert datas.fetch_one("PRAGMA freelist_count") == (0,)
+        assert len(datas.list_names()) == 200
+
+        datas.remove_many(range(201, 401))
+        assert datas.purge_deleted(older_than_days=0) == 200
+        assert datas.incremental_vacuum() > 0
+        assert datas.fetch_one("PRAGMA freelist_count") == (0,)
+
+def test_tombstones_are_added_to_existing_databases(tmp_path)->None:
+    """
+    Tests that a database created before tombstones existed gets the column of removal
+    times, and that names stay unique among the entries that are not removed only.
+    """
+    import sqlite3
+
+    path = str(tmp_path / "legacy.db")
+    conn = sqlite3.connect(path)
+    conn.execute('''CREATE TABLE data (id INTEGER PRIMARY KEY AUTOINCREMENT, name TEXT NOT NULL,
+                    username TEXT NOT NULL, password TEXT NOT NULL, source TEXT)''')
+    conn.execute('''CREATE UNIQUE INDEX idx_data_name ON data (name)''')
+    conn.execute("INSERT INTO data (name, username, password, source) VALUES ('mail', 'u', 'p', 's')")
+    conn.commit()
+    conn.close()
+
+    with Datas(path_db=path) as datas:
+        assert datas.remove_data(1)
+        assert datas.register_data(Data(name="mail", username="u", password="p", source="s"))
+        assert not datas.register_data(Data(name="mail", username="u", password="p", source="s"))
+        assert [name for _, name in datas.list_names()] == ["mail"]
@@ -0,0 +1,100 @@
+# -*- coding: utf-8 -*-
+"""
+__author__ = "<Adrien Mertens>"
+__version__ = "1.0"
+"""
+
+import pytest
+from models.data import Data, Datas
+from models.dataCache import DataCache
+from models.crypto import KdfParams, LazySecret
+
+@pytest.fixture
+def path(tmp_path)->str:
+    """
+    Provides the path of a temporary database.
+    :param tmp_path: A pytest fixture providing a temporary directory.
+    :return: The path of the database.
+    """
+    return str(tmp_path / "test_database.db")
+
+@pytest.fixture
+def datas_instance(path)->Datas:
+    """
+    Provides a Datas instance holding two entries, closed after the test.
+    :param path: The path of the database.
+    :return: Yields the Datas instance.
+    """
+    datas = Datas(path_db=path)
+    datas.register_data(Data(name="gmail", username="user", password="p1", source="google.com"))
+    datas.register_data(Data(name="Amazon", username="user", password="p2", source="amazon.fr"))
+    yield datas
+    datas.close()
+
+def test_reads_are_served_from_memory(datas_instance)->None:
+    """
+    Tests that an entry is read once from the database, then from memory, and that the
+    copies handed out cannot alter the cache.
+    """
+    cache = DataCache(datas_instance)
+    first = cache.get(1)
+    first.name = "altered"
+    assert cache.get(1).name == "gmail"
+    assert (cache.stats.hits, cache.stats.misses) == (1, 1)
+    assert [data.name for data in cache.get_all()] == ["gmail", "Amazon"]
+    assert cache.get(2).name == "Amazon" and cache.get(3) is None
+    assert cache.stats.misses == 2 and cache.stats.hit_ratio == 0.6
+
+def test_writes_update_the_cache(datas_instance)->None:
+    """
+    Tests that the writes made in this process update the cached entries and the sorted
+    names without going back to the database.
+    """
+    cache = DataCache(datas_instance)
+    cache.get_all()
+    assert cache.sorted_names() == [(2, "Amazon"), (1, "gmail")]
+    misses = cache.stats.misses
+
+    datas_instance.modify_data(1, Data(name="Zoho", username="user", password="p3", source="zoho.com"))
+    datas_instance.register_data(Data(name="bank", username="user", password="p4", source="bank.be"))
+    datas_instance.remove_data(2)
+
+    assert cache.get(1).name == "Zoho"
+    assert cache.get(2) is None
+    assert cache.sorted_names() == [(3, "bank"), (1, "Zoho")]
+    assert cache.stats.misses == misses and cache.stats.invalidations == 0
+
+def test_external_changes_invalidate_the_cache(datas_instance, path)->None:
+    """
+    Tests that a write made through another connection to the file, as another process
+    would, empties the cache.
+    """
+    cache = DataCache(datas_instance)
+    assert cache.get(1).name == "gmail"
+    with Datas(path_db=path) as other:
+        other.modify_data(1, Data(name="renamed", username="user", password="p1", source="google.com"))
+    assert cache.get(1).name == "renamed"
+    assert cache.stats.invalidations == 1
+
+def test_encrypted_passwords_stay_encrypted(datas_instance)->None:
+    """
+    Tests that the entries written to an encrypted vault are cached with their
+    encrypted password.
+    """
+    datas_instance.set_master_password("master", KdfParams(n=2 ** 10))
+    cache = DataCache(datas_instance)
+    datas_instance.modify_data(1, Data(name="gmail", username="user", password="new secret", source="google.com"))
+    password = cache.get(1).password
+    assert isinstance(password, LazySecret) and password.reveal() == "new secret"
+    assert cache.stats.misses == 0
+
+def test_bulk_import_empties_the_cache(datas_instance)->None:
+    """
+    Tests that the single change sent after a bulk import empties the cache, so that the
+    imported entries are read from the database.
+    """
+    cache = DataCache(datas_instance)
+    cache.get_all()
+    datas_instance.register_many([Data(name="bank", username="user", password="p4", source="bank.be")], notify=False)
+    datas_instance.notify_reloaded()
+    assert cache.sorted_names() == [(2, "Amazon"), (3, "bank"), (1, "gmail")]
@@ -0,0 +1,43 @@
+# -*- coding: utf-8 -*-
+"""
+__author__ = "<Adrien Mertens>"
+__version__ = "1.0"
+"""
+
+import pytest
+from models.data import Data
+from models.dataTable import DataTable
+
+@pytest.fixture
+def table()->DataTable:
+    """
+    Provides a table of three entries sharing two sources.
+    :return: The table.
+    """
+    return DataTable.from_rows([(1, "gmail", "google.com"), (4, "drive", "google.com"), (9, "github", None)])
+
+def test_table_is_iterable_as_data(table)->None:
+    """
+    Tests that the table behaves like a list of Data without username or password.
+    """
+    assert len(table) == 3
+    assert list(table) == [Data(name="gmail", source="google.com", id=1), Data(name="drive", source="google.com", id=4),
+                           Data(name="github", id=9)]
+    assert table[1] == Data(name="drive", source="google.com", id=4)
+    assert list(table.rows()) == [(1, "gmail", "google.com"), (4, "drive", "google.com"), (9, "github", None)]
+
+def test_sources_are_interned(table)->None:
+    """
+    Tests that each distinct source is stored once.
+    """
+    assert table.sources == ["google.com", None]
+    assert table[0].source is table[1].source
+
+def test_index_of(table)->None:
+    """
+    Tests that rows are found by id, and that ids must be appended in increasing order.
+    """
+    assert table.index_of(4) == 1
+    assert table.index_of(5) is None
+    with pytest.raises(ValueError):
+        table.append(9, "duplicate", None)
@@ -0,0 +1,76 @@
+# -*- coding: utf-8 -*-
+"""
+__author__ = "<Adrien Mertens>"
+__version__ = "1.0"
+"""
+
+from types import SimpleNamespace
+import pytest
+from controllers.controllersDatas import ControllersDatas
+from models.crypto import InvalidMasterPassword
+from models.data import Data, Datas
+from views.changeDataView import ChangeDataView
+from views.showDataView import ShowDataView
+from views.unlockView import UnlockView
+
+class FakeVar:
+    """Stands for a Tk variable, so that the callbacks of the windows run without a display."""
+    def __init__(self)->None:
+        self.value = ""
+
+    def set(self, value)->None:
+        self.value = value
+
+@pytest.fixture
+def window(monkeypatch)->SimpleNamespace:
+    """
+    Provides a stand-in for a data window, and records the error messages shown.
+    :param monkeypatch: A pytest fixture patching the message boxes.
+    :return: The stand-in, whose `errors` lists the messages and `closed` counts the closings.
+    """
+    errors = []
+    monkeypatch.setattr("ttkbootstrap.dialogs.Messagebox.show_error",
+                        lambda message, title, parent: errors.append(message))
+    window = SimpleNamespace(var_name=FakeVar(), var_username=FakeVar(), var_password=FakeVar(),
+                             var_source=FakeVar(), errors=errors, closed=0,
+                             validate_button=SimpleNamespace(configure=lambda **options: None))
+    window.close = lambda: setattr(window, "closed", window.closed + 1)
+    return window
+
+@pytest.mark.parametrize("callback", [ChangeDataView._set_old_data, ShowDataView._show_data])
+def test_data_deleted_before_the_callback_closes_the_window(window, callback)->None:
+    """
+    Tests that a window whose data is deleted between the click on the board and the
+    arrival of the data reports it and hides itself instead of failing.
+    """
+    with Datas() as datas:
+        controller = ControllersDatas(datas)
+        controller.add_data(Data(name="gmail", username="u", password="p", source="google.com"))
+        controller.delete_data(1)
+        callback(window, controller.get_one_data(1))
+    assert window.closed == 1 and len(window.errors) == 1
+    assert window.var_name.value == ""
+
+@pytest.mark.parametrize("callback", [ChangeDataView._set_old_data, ShowDataView._show_data])
+def test_data_read_fills_the_window(window, callback)->None:
+    """
+    Tests that the data read is shown in the fields of the window.
+    """
+    with Datas() as datas:
+        controller = ControllersDatas(datas)
+        controller.add_data(Data(name="gmail", username="u", password="p", source="google.com"))
+        callback(window, controller.get_one_data(1))
+    assert window.closed == 0 and not window.errors
+    assert (window.var_name.value, window.var_password.value) == ("gmail", "p")
+
+def test_wrong_master_password_keeps_the_unlock_window_open(window)->None:
+    """
+    Tests that a wrong master password checked on the worker clears the field and lets
+    the user try again, without closing the window.
+    """
+    window.var_password.set("wrong")
+    window._UnlockView__checking = True
+    window.unlocked = False
+    UnlockView._show_error(window, InvalidMasterPassword())
+    assert window.var_password.value == "" and window.errors == ["Le mot de passe maître est incorrect"]
+    assert window._UnlockView__checking is False and window.unlocked is False
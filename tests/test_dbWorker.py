@@ -0,0 +1,57 @@
+# -*- coding: utf-8 -*-
+"""
+__author__ = "<Adrien Mertens>"
+__version__ = "1.0"
+"""
+
+import threading
+import pytest
+from controllers.dbWorker import DbWorker
+
+@pytest.fixture
+def worker():
+    """
+    Provides a DbWorker, closed after the test.
+    :return: Yields the worker.
+    """
+    worker = DbWorker()
+    yield worker
+    worker.close()
+
+def test_calls_run_in_order_on_one_thread(worker)->None:
+    """
+    Tests that calls run in submission order, all on the same thread, which is not the
+    thread submitting them.
+    """
+    threads, order = set(), []
+    def call(index):
+        threads.add(threading.current_thread())
+        order.append(index)
+        return index * 2
+    futures = [worker.submit(call, index) for index in range(20)]
+    assert [future.result(timeout=5) for future in futures] == [index * 2 for index in range(20)]
+    assert order == list(range(20))
+    assert len(threads) == 1 and threading.current_thread() not in threads
+
+def test_exception_is_set_on_future(worker)->None:
+    """
+    Tests that an exception raised by a call is given to its future and does not stop
+    the worker.
+    """
+    failed = worker.submit(int, "not a number")
+    with pytest.raises(ValueError):
+        failed.result(timeout=5)
+    assert worker.submit(int, "42").result(timeout=5) == 42
+
+def test_closed_worker_refuses_calls()->None:
+    """
+    Tests that closing the worker runs the calls already queued, then refuses new ones.
+    """
+    worker = DbWorker()
+    event = threading.Event()
+    pending = worker.submit(event.wait, 5)
+    event.set()
+    worker.close()
+    assert pending.result(timeout=0) is True
+    with pytest.raises(RuntimeError):
+        worker.submit(print)
@@ -0,0 +1,60 @@
+# -*- coding: utf-8 -*-
+"""
+__author__ = "<Adrien Mertens>"
+__version__ = "1.0"
+"""
+
+import pytest
+from models.instrumentation import Instrumentation, LatencyHistogram, timed
+
+class Timed:
+    """
+    Minimal instrumented class, whose instrumentation can be switched off.
+    """
+    def __init__(self, instrumentation=None)->None:
+        self.instrumentation = instrumentation
+
+    @timed("query", with_statement=True)
+    def query(self, sql:str)->str:
+        return sql.lower()
+
+def test_histogram_percentiles()->None:
+    """
+    Tests that the percentiles of a histogram are the upper bounds of their power of two bucket.
+    """
+    histogram = LatencyHistogram()
+    assert histogram.percentile(0.5) == 0.0
+    for microseconds in (3, 3, 3, 100, 1000):
+        histogram.record(microseconds / 1e6)
+    assert histogram.count == 5
+    assert histogram.max == pytest.approx(0.001)
+    assert histogram.mean == pytest.approx(221.8e-6)
+    assert histogram.percentile(0.5) == pytest.approx(4e-6)
+    assert histogram.percentile(0.8) == pytest.approx(128e-6)
+    assert histogram.percentile(1.0) == pytest.approx(0.001)
+
+def test_slow_queries_are_logged(capsys)->None:
+    """
+    Tests that only the operations reaching the threshold are logged, and reported on stderr.
+    """
+    instrumentation = Instrumentation(slow_query_seconds=0.5)
+    instrumentation.record("fetch_one", 0.1, "SELECT 1")
+    instrumentation.record("fetch_all", 0.7, "SELECT * FROM data")
+    assert [(slow.operation, slow.statement) for slow in instrumentation.slow_queries] == [("fetch_all", "SELECT * FROM data")]
+    assert "SELECT * FROM data" in capsys.readouterr().err
+    snapshot = instrumentation.snapshot()
+    assert sorted(snapshot["operations"]) == ["fetch_all", "fetch_one"]
+    assert snapshot["operations"]["fetch_one"]["count"] == 1
+    instrumentation.reset()
+    assert instrumentation.snapshot()["operations"] == {}
+    assert instrumentation.slow_queries == []
+
+def test_timed_decorator()->None:
+    """
+    Tests that a decorated method is only measured while its instance has an instrumentation.
+    """
+    instrumentation = Instrumentation(slow_query_seconds=0)
+    assert Timed().query("SELECT") == "select"
+    assert Timed(instrumentation).query("SELECT") == "select"
+    assert instrumentation.histogram("query").count == 1
+    assert instrumentation.slow_queries[0].statement == "SELECT"
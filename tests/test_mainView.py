@@ -0,0 +1,21 @@
+# -*- coding: utf-8 -*-
+"""
+__author__ = "<Adrien Mertens>"
+__version__ = "1.0"
+"""
+
+import tkinter
+from types import SimpleNamespace
+from views.mainView import MainWindow
+
+def test_ctrl_z_in_a_text_field_does_not_restore_entries()->None:
+    """
+    Tests that Ctrl+Z typed in a text field is left to the field, while elsewhere it
+    restores the entries deleted last.
+    """
+    restored = []
+    window = SimpleNamespace(menu=SimpleNamespace(undo_delete=lambda: restored.append(True)))
+    MainWindow.undo_delete(window, SimpleNamespace(widget=tkinter.Entry.__new__(tkinter.Entry)))
+    assert restored == []
+    MainWindow.undo_delete(window, SimpleNamespace(widget=object()))
+    assert restored == [True]
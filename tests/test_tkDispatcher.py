@@ -0,0 +1,30 @@
+# -*- coding: utf-8 -*-
+"""
+__author__ = "<Adrien Mertens>"
+__version__ = "1.0"
+"""
+
+from views.tkDispatcher import TkDispatcher
+
+class FakeRoot:
+    """Stands for the root window, keeping the delays asked to `after` instead of running a main loop."""
+    def __init__(self)->None:
+        self.delays = []
+
+    def after(self, delay: int, callback)->None:
+        self.delays.append(delay)
+
+def test_poll_runs_a_bounded_number_of_callbacks()->None:
+    """
+    Tests that a burst of callbacks is run over several polls, the next poll coming
+    right away while callbacks remain, and at the usual pace afterwards.
+    """
+    root = FakeRoot()
+    dispatcher = TkDispatcher(root)
+    calls = []
+    for index in range(TkDispatcher.MAX_CALLBACKS_PER_POLL + 5):
+        dispatcher.call_soon(calls.append, index)
+    dispatcher._poll()
+    assert len(calls) == TkDispatcher.MAX_CALLBACKS_PER_POLL and root.delays[-1] == 1
+    dispatcher._poll()
+    assert len(calls) == TkDispatcher.MAX_CALLBACKS_PER_POLL + 5 and root.delays[-1] == TkDispatcher.POLL_MS
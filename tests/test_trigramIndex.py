@@ -0,0 +1,86 @@
+# -*- coding: utf-8 -*-
+"""
+__author__ = "<Adrien Mertens>"
+__version__ = "1.0"
+"""
+
+import pytest
+from models.data import Data, INSERTED, UPDATED, DELETED
+from models.trigramIndex import TrigramIndex, trigrams
+
+@pytest.fixture
+def index()->TrigramIndex:
+    """
+    Creates a pytest fixture providing a TrigramIndex filled with a few entries.
+
+    :return: A TrigramIndex instance.
+    """
+    index = TrigramIndex()
+    index.add_many([
+        (1, "gmail", "google.com"),
+        (2, "Banque", "belfius.be"),
+        (3, "github", "github.com"),
+        (4, "Outlook", None),
+    ])
+    return index
+
+def test_trigrams_are_padded_and_lowercase()->None:
+    """
+    Tests that texts are split into padded, lowercase trigrams.
+
+    :return: None
+    """
+    assert trigrams("Ab") == {"  a", " ab", "ab "}
+    assert trigrams("") == frozenset()
+    assert trigrams(None) == frozenset()
+
+def test_search_tolerates_typos(index)->None:
+    """
+    Tests that a misspelt query finds the intended entry first.
+
+    :param index: The TrigramIndex under test.
+    :type index: TrigramIndex
+    :return: None
+    """
+    results = index.search("gmial")
+    assert results[0][:2] == (1, "gmail")
+    assert index.search("outlok")[0][:2] == (4, "Outlook")
+
+def test_search_matches_source(index)->None:
+    """
+    Tests that an entry is also found through its source.
+
+    :param index: The TrigramIndex under test.
+    :type index: TrigramIndex
+    :return: None
+    """
+    assert index.search("belfius")[0][:2] == (2, "Banque")
+
+def test_search_ignores_unrelated_entries(index)->None:
+    """
+    Tests that entries sharing too few trigrams with the query are not returned.
+
+    :param index: The TrigramIndex under test.
+    :type index: TrigramIndex
+    :return: None
+    """
+    assert index.search("zzzz") == []
+    assert index.search("") == []
+
+def test_changes_update_the_index(index)->None:
+    """
+    Tests that the changes reported by Datas keep the index up to date.
+
+    :param index: The TrigramIndex under test.
+    :type index: TrigramIndex
+    :return: None
+    """
+    index.on_data_changed(INSERTED, Data(id=5, name="dropbox", source="dropbox.com"))
+    index.on_data_changed(UPDATED, Data(id=1, name="protonmail", source="proton.me"))
+    index.on_data_changed(DELETED, Data(id=3))
+
+    assert len(index) == 4
+    assert index.search("dropbx")[0][:2] == (5, "dropbox")
+    assert all(name != "gmail" for _, name, _ in index.search("gmail"))
+    assert index.search("protonmial")[0][:2] == (1, "protonmail")
+    assert all(name != "github" for _, name, _ in index.search("github"))
@@ -14,7 +14,8 @@ class AddDataView(TopLevelValidateAndCancelForUseDB):
     user interface for data input, interacts with a controller for data storage,
     and updates the visual representation of the board after an operation. It
     provides feedback to users regarding the success, duplication, or failure of
-    the data addition process using dialog boxes.
+    the data addition process using dialog boxes. It is opened with
+    :meth:`ReusableDialog.open`, which empties and shows the window built the first time.
 
     :ivar board: The board to which the new data entries will be added.
     :type board: Any
@@ -27,12 +28,25 @@ class AddDataView(TopLevelValidateAndCancelForUseDB):
         self.board = board
         self.__controller = controller
 
+    def reopen(self,controller,board)->None:
+        """
+        Empties the fields for a new entry.
+
+        :param controller: The controller storing the entry.
+        :param board: The board displaying the entries.
+        :return: None
+        """
+        self.board = board
+        self.__controller = controller
+        self.reset_fields()
+
     def command(self)->None:
         """
         Handles the addition of a new entry by validating input data, calling the controller to store
-        the data, and updating the user interface accordingly. Displays appropriate dialog messages
-        for successful, duplicate, or failed operations. Catches and processes potential validation
-        and general exceptions.
+        the data, and updating the user interface accordingly. The entry is stored in the background:
+        the window shows a busy cursor and its VALIDER button is disabled until the controller answers.
+        Displays appropriate dialog messages for successful, duplicate, or failed operations. Catches
+        and processes potential validation and general exceptions.
 
         :param self: Reference to the instance of the class where this method is called.
         :type self: Any
@@ -41,36 +55,57 @@ class AddDataView(TopLevelValidateAndCancelForUseDB):
         :rtype: None
         """
         try:
-            if self.__controller.add_data(Data(
+            future = self.__controller.submit(self.__controller.add_data, Data(
                     name=self.var_name.get(),
                     username=self.var_username.get(),
                     password=self.var_password.get(),
                     source=self.var_source.get()
-            )):
-                dialogs.Messagebox.show_info(
-                    message="L'enregistrement a bien été effectué !",
-                    title="Information",
-                    parent=self
-                )
-                self.board.refresh_data_board_from_db()
-                self.destroy()
-            else:
-                dialogs.Messagebox.show_warning(
-                    message="La donnée existe déjà !",
-                    title="Attention",
-                    parent=self
-                )
-        except ValueError as ve:
+            ))
+            self.validate_button.configure(state="disabled")
+            self.when_done(future, self._on_added, self._show_error)
+        except Exception as e:
+            self._show_error(e)
+
+    def _on_added(self, added: bool)->None:
+        """
+        Reports the outcome of the addition and hides the window once the entry is stored.
+
+        :param added: Whether the entry was stored, False when its name already exists.
+        :return: None
+        """
+        self.validate_button.configure(state="normal")
+        if added:
+            dialogs.Messagebox.show_info(
+                message="L'enregistrement a bien été effectué !",
+                title="Information",
+                parent=self
+            )
+            self.close()
+        else:
+            dialogs.Messagebox.show_warning(
+                message="La donnée existe déjà !",
+                title="Attention",
+                parent=self
+            )
+
+    def _show_error(self, error: BaseException)->None:
+        """
+        Reports an error raised while adding the entry, including in the background.
+
+        :param error: The error raised.
+        :return: None
+        """
+        self.validate_button.configure(state="normal")
+        if isinstance(error, ValueError):
             dialogs.Messagebox.show_error(
-                message=f"Une erreur de validation est survenue : {ve}",
+                message=f"Une erreur de validation est survenue : {error}",
                 title="Erreur de validation",
                 parent=self
             )
-        except Exception as e:
+        else:
             dialogs.Messagebox.show_error(
-                message=f"Une erreur inattendue est survenue : {e}",
+                message=f"Une erreur inattendue est survenue : {error}",
                 title="Erreur",
                 parent=self
             )
-            print(f"An unexpected error occurred: {e}", file=sys.stderr)
-
+            print(f"An unexpected error occurred: {error}", file=sys.stderr)
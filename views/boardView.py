@@ -3,9 +3,13 @@ Author: Adrien Mertens
 Version: 1.0
 """
 import sys
+from bisect import bisect_left
 import ttkbootstrap as ttk
 import ttkbootstrap.constants as ttkc
 import ttkbootstrap.dialogs as dialogs
+from models.data import Data, INSERTED, DELETED, RELOADED
+from views.tkDispatcher import TkDispatcher
+from views.styles import ensure_styles
 
 class BoardView(ttk.Frame):
     """
@@ -15,7 +19,20 @@ class BoardView(ttk.Frame):
     vertical scrollbar for navigation.
 
     The class utilizes a controller to manage retrieving and updating data,
-    allowing dynamic interaction with backend sources like a database.
+    allowing dynamic interaction with backend sources like a database. Once a
+    controller is set, the board listens to its changes and only touches the rows
+    that were inserted, updated or deleted.
+
+    Rows are paged in lazily: the board starts with a single page of `PAGE_SIZE`
+    rows and loads the next page, by id, when the view is scrolled near the end of
+    the rows already loaded. Opening a large vault therefore costs one page. Only
+    ids and names are read; full entries are loaded by the views that display them.
+    The board can also be restricted to the results of a search with :meth:`filter`,
+    falling back to the closest names when the search finds nothing.
+
+    Reads run on the database worker of the controller, so the main loop never waits
+    for SQLite: the board shows a busy cursor until the rows arrive, and results made
+    stale by a newer refresh are dropped.
 
     :ivar tree_frame: The Frame containing the Treeview widget and its scrollbar.
     :type tree_frame: ttk.Frame
@@ -27,6 +44,15 @@ class BoardView(ttk.Frame):
         operations, such as retrieving and updating the displayed data.
     :type __controller: object
     """
+    # Number of rows loaded at once, enough to fill the view and a scroll buffer
+    PAGE_SIZE = 100
+    # Fraction of the loaded rows scrolled past before the next page is loaded
+    PREFETCH_THRESHOLD = 0.8
+    # Maximum number of rows displayed for a search
+    SEARCH_LIMIT = 200
+    # Maximum number of rows displayed when only typo-tolerant matches are found
+    FUZZY_LIMIT = 10
+
     def __init__(self, parent)->None:
         """
         Initializes the Treeview and associated Frame, styling, headers, and rows with
@@ -44,24 +70,20 @@ class BoardView(ttk.Frame):
         super().__init__(parent)
         self.__controller = None
         self.__parent = parent
-        # Create a custom style
-        style = ttk.Style()
-
-        # Configure colors for data rows
-        style.configure("Treeview",
-                        foreground="white",  # Black text for rows
-                        font=('Helvetica', 10))  # Cell background
-
-        # Configure colors for the header
-        style.configure("Treeview.Heading",
-                        background="#4e5d6c",  # Dark gray for the header
-                        foreground="white",  # White text for the header
-                        font=('Helvetica', 10, 'bold'))
-
-        # Configure colors for different states of the Treeview
-        style.map("Treeview",
-                  background=[('selected', '#2d3e4f'),
-                              ('active', '#3a4d5e')],)
+        # Name displayed for each row, indexed by Treeview item id
+        self.__names = {}
+        # Id of the last row paged in and whether the whole table has been loaded
+        self.__last_id = 0
+        self.__fully_loaded = False
+        self.__page_pending = False
+        # Current search, empty when the whole listing is displayed
+        self.__query = ""
+        self.__refresh_pending = False
+        # Incremented by every refresh, so that the results of older reads are dropped
+        self.__generation = 0
+        self.__dispatcher = TkDispatcher.of(self)
+        # Styles of the rows, header and states, defined once for the application
+        ensure_styles(self)
 
         # Create a Frame to contain the Treeview
         self.tree_frame = ttk.Frame(self, height=250)
@@ -82,10 +104,10 @@ class BoardView(ttk.Frame):
         self.board.tag_configure('evenrow', background='#475562')  # Dark gray for even rows
         self.board.tag_configure('oddrow', background='#5d6f81')  # Light gray for odd rows
 
-        # Add a vertical scrollbar
-        scrollbar = ttk.Scrollbar(self.tree_frame, orient="vertical", command=self.board.yview)
-        self.board.configure(yscroll=scrollbar.set)
-        scrollbar.pack(side="right", fill="y")
+        # Add a vertical scrollbar, loading the next page when it nears the end
+        self.scrollbar = ttk.Scrollbar(self.tree_frame, orient="vertical", command=self.board.yview)
+        self.board.configure(yscroll=self._on_scroll)
+        self.scrollbar.pack(side="right", fill="y")
         self.board.pack(side="left", fill="both", expand=True)
 
     @property
@@ -116,31 +138,218 @@ class BoardView(ttk.Frame):
             to be a valid controller instance or value.
         :return: None
         """
+        if self.__controller is not None:
+            self.__controller.remove_listener(self._queue_data_changed)
         self.__controller = controller
+        if controller is not None:
+            controller.add_listener(self._queue_data_changed)
+
+    def _queue_data_changed(self, kind: str, data: Data) -> None:
+        """Forwards a change, reported from the database worker thread, to :meth:`on_data_changed` on the Tk thread."""
+        self.__dispatcher.call_soon(self.on_data_changed, kind, data)
+
+    @staticmethod
+    def _stripe(index: int) -> str:
+        """Returns the tag giving its background to the row displayed at `index`."""
+        return 'evenrow' if index % 2 == 0 else 'oddrow'
+
+    def _restripe(self, start: int) -> None:
+        """
+        Reapplies the even/odd tags from the row at `start` to the end of the board.
+        Rows before `start` keep their position, so their stripe is left untouched.
+
+        :param start: The index of the first row whose position may have changed.
+        :return: None
+        """
+        children = self.board.get_children()
+        for index in range(start, len(children)):
+            self.board.item(children[index], tags=(self._stripe(index),))
+
+    def on_data_changed(self, kind: str, data: Data) -> None:
+        """
+        Applies a single change reported by the controller to the board. An insertion
+        adds one row, an update rewrites one row and a deletion removes one row and
+        restripes the rows that followed it. After a bulk import, the board is refreshed.
+
+        Rows are displayed in id order. A new entry has the highest id, so its row is
+        appended once the whole table is loaded, and otherwise arrives with the last
+        page. A restored entry keeps its old id: when it falls among the rows loaded,
+        its row is inserted at its place.
+
+        :param kind: The kind of change (`INSERTED`, `UPDATED` or `DELETED`).
+        :type kind: str
+        :param data: The entry affected by the change.
+        :type data: Data
+        :return: None
+        """
+        if self.__query or kind == RELOADED:
+            # Whether the entry matches the search is only known to the database
+            self._schedule_refresh()
+            return
+        iid = str(data.id)
+        if kind == DELETED:
+            if iid in self.__names:
+                index = self.board.index(iid)
+                self.board.delete(iid)
+                del self.__names[iid]
+                self._restripe(index)
+        elif iid in self.__names:
+            if self.__names[iid] != data.name:
+                self.board.item(iid, values=(data.name,))
+                self.__names[iid] = data.name
+        elif kind == INSERTED and data.id <= self.__last_id:
+            index = bisect_left([int(child) for child in self.board.get_children()], data.id)
+            self.board.insert('', index, iid=iid, values=(data.name,), tags=(self._stripe(index),))
+            self.__names[iid] = data.name
+            self._restripe(index + 1)
+        elif kind == INSERTED and self.__fully_loaded:
+            self.board.insert('', ttkc.END, iid=iid, values=(data.name,), tags=(self._stripe(len(self.__names)),))
+            self.__names[iid] = data.name
+            self.__last_id = data.id
+
+    def _on_scroll(self, first: str, last: str) -> None:
+        """
+        Forwards the visible fraction of the board to the scrollbar and schedules the
+        loading of the next page once the view passes `PREFETCH_THRESHOLD`.
+
+        :param first: The fraction of the rows above the view.
+        :param last: The fraction of the rows up to the bottom of the view.
+        :return: None
+        """
+        self.scrollbar.set(first, last)
+        if not (self.__fully_loaded or self.__page_pending) and float(last) >= self.PREFETCH_THRESHOLD:
+            self.__page_pending = True
+            self.after_idle(self.load_next_page)
+
+    def load_next_page(self) -> None:
+        """
+        Reads the next `PAGE_SIZE` rows, after the last id loaded, in the background and
+        appends them to the board when they arrive. Does nothing once the whole table
+        has been loaded.
+
+        :return: None
+        """
+        if self.__fully_loaded or self.__controller is None:
+            self.__page_pending = False
+            return
+        self.__page_pending = True
+        generation = self.__generation
+        future = self.controller.submit(self.controller.list_names, after_id=self.__last_id, limit=self.PAGE_SIZE)
+        self.__dispatcher.when_done(future, lambda page: self._append_page(page, generation), self._show_error,
+                                    busy=self.board)
+
+    def _append_page(self, page: list, generation: int) -> None:
+        """
+        Appends a page read by :meth:`load_next_page`, unless the board has been
+        refreshed since it was requested.
+
+        :param page: The `(id, name)` pairs read.
+        :param generation: The refresh counter when the page was requested.
+        :return: None
+        """
+        self.__page_pending = False
+        if generation != self.__generation:
+            return
+        for data_id, name in page:
+            iid = str(data_id)
+            if iid not in self.__names:
+                self.board.insert('', ttkc.END, iid=iid, values=(name,),
+                                  tags=(self._stripe(len(self.__names)),))
+                self.__names[iid] = name
+        if page:
+            self.__last_id = page[-1][0]
+        self.__fully_loaded = len(page) < self.PAGE_SIZE
+
+    def _sync_rows(self, wanted: list) -> None:
+        """
+        Makes the board display exactly the `wanted` rows, in order, with as few
+        Treeview calls as possible: rows that disappeared are removed, new rows are
+        inserted at their place and renamed rows are rewritten. When the rows kept
+        are not in the same order anymore (entering or leaving a search), the board is
+        emptied and filled again.
+
+        :param wanted: The `(item id, name)` pairs to display, in display order.
+        :type wanted: list
+        :return: None
+        """
+        wanted_ids = {iid for iid, _ in wanted}
+        kept_on_board = [iid for iid in self.board.get_children() if iid in wanted_ids]
+        kept_wanted = [iid for iid, _ in wanted if iid in self.__names]
+        if kept_on_board != kept_wanted:
+            self.board.delete(*self.board.get_children())
+            self.__names.clear()
+        first_moved = len(wanted)
+
+        # Remove the rows that no longer exist
+        for iid in [iid for iid in self.__names if iid not in wanted_ids]:
+            first_moved = min(first_moved, self.board.index(iid))
+            self.board.delete(iid)
+            del self.__names[iid]
+
+        # Insert the new rows and rename the modified ones
+        for index, (iid, name) in enumerate(wanted):
+            if iid not in self.__names:
+                first_moved = min(first_moved, index)
+                self.board.insert('', index, iid=iid, values=(name,), tags=(self._stripe(index),))
+                self.__names[iid] = name
+            elif self.__names[iid] != name:
+                self.board.item(iid, values=(name,))
+                self.__names[iid] = name
+
+        self._restripe(first_moved)
+
+    def filter(self, query: str) -> None:
+        """
+        Restricts the board to the entries matching `query`, best matches first, or
+        goes back to the full listing when `query` is empty.
+
+        :param query: The words to search for.
+        :type query: str
+        :return: None
+        """
+        self.__query = query.strip()
+        self.refresh_data_board_from_db()
+
+    def _schedule_refresh(self) -> None:
+        """Refreshes the board once the pending events are handled, coalescing repeated requests."""
+        if not self.__refresh_pending:
+            self.__refresh_pending = True
+            self.after_idle(self._run_scheduled_refresh)
+
+    def _run_scheduled_refresh(self) -> None:
+        self.__refresh_pending = False
+        self.refresh_data_board_from_db()
 
     def refresh_data_board_from_db(self)->None:
         """
         Refreshes and updates the contents of the data board by synchronizing it with the
-        most recent data retrieved from the database. This method ensures that the board
-        displays up-to-date information by clearing old data, applying styling to rows based
-        on their index (even or odd), and handling any exceptions that occur during this process.
+        most recent data retrieved from the database. Only the rows already paged in are
+        read again (at least one page), or the results of the current search. The board is compared with the database so that
+        only the rows that disappeared, appeared or were renamed are touched, and the
+        even/odd styling is only reapplied from the first row whose position changed.
+        The rows are read in the background and applied when they arrive.
 
         :raises AttributeError: If there is an issue accessing attributes of the controller.
         :raises Exception: If an unexpected error occurs during the data refresh process.
         :return: None
         """
         try:
-            # Retrieve all data from the database
-            data_list = self.controller.get_all_datas()
+            self.__generation += 1
+            generation, query, controller = self.__generation, self.__query, self.controller
+            limit = max(len(self.__names), self.PAGE_SIZE)
 
-            # Clear all existing data in the Treeview
-            for item in self.board.get_children():
-                self.board.delete(item)
+            def read():
+                if query:
+                    # Show the best matches of the current search, without paging,
+                    # or the closest names when nothing matches (typo in the query)
+                    return (controller.search(query, limit=self.SEARCH_LIMIT)
+                            or controller.fuzzy_find(query, limit=self.FUZZY_LIMIT))
+                # Retrieve the rows already paged in from the database
+                return controller.list_names(after_id=0, limit=limit)
 
-            # Insert new data
-            for index, data in enumerate(data_list):
-                tag = 'evenrow' if index % 2 == 0 else 'oddrow'
-                self.board.insert('', ttkc.END, iid=data.id, values=data.name, tags=(tag,))
+            self.__dispatcher.when_done(controller.submit(read),
+                                        lambda page: self._show_rows(page, generation, limit), self._show_error,
+                                        busy=self.board)
 
         except AttributeError as ae:
             dialogs.Messagebox.show_error(
@@ -155,3 +364,31 @@ class BoardView(ttk.Frame):
                 parent=self
             )
             print(f"Une erreur inattendue est survenue : {e}", file=sys.stderr)
+
+    def _show_rows(self, page: list, generation: int, limit: int) -> None:
+        """
+        Displays the rows read by :meth:`refresh_data_board_from_db`, unless a newer
+        refresh has been requested since.
+
+        :param page: The `(id, name)` pairs read.
+        :param generation: The refresh counter when the rows were requested.
+        :param limit: The number of rows requested for the full listing.
+        :return: None
+        """
+        if generation != self.__generation:
+            return
+        if self.__query:
+            self.__fully_loaded = True
+        else:
+            self.__last_id = page[-1][0] if page else 0
+            self.__fully_loaded = len(page) < limit
+        self._sync_rows([(str(data_id), name) for data_id, name in page])
+
+    def _show_error(self, error: BaseException) -> None:
+        """Reports an error raised by a read run in the background."""
+        dialogs.Messagebox.show_error(
+            message=f"Une erreur inattendue est survenue : {error}",
+            title="Erreur",
+            parent=self
+        )
+        print(f"Une erreur inattendue est survenue : {error}", file=sys.stderr)
@@ -3,8 +3,10 @@ __author__ = "Adrien Mertens"
 __version__ = "1.0"
 """
 import sys
+from typing import Optional
 from views.topLevelValidateAndCancelForUseDB import TopLevelValidateAndCancelForUseDB
 from models.data import Data
+from models.crypto import reveal
 import ttkbootstrap.dialogs as dialogs
 
 class ChangeDataView(TopLevelValidateAndCancelForUseDB):
@@ -13,8 +15,10 @@ class ChangeDataView(TopLevelValidateAndCancelForUseDB):
         Constructor to initialize the class instance for managing and modifying data.
         This initialization involves setting up required attributes like board,
         controller, and data_id. It also retrieves and pre-sets old data values into
-        class variables to allow modification. In case of error during data retrieval,
-        displays an error message using a message box and closes the instance.
+        class variables to allow modification. The old data is read in the background and the
+        VALIDER button stays disabled until it arrives. In case of error during data retrieval,
+        displays an error message using a message box and closes the instance. The window is
+        opened with :meth:`ReusableDialog.open`, which reloads the window built the first time.
 
         :param master: The parent widget for this instance.
         :type master: Any
@@ -29,25 +33,78 @@ class ChangeDataView(TopLevelValidateAndCancelForUseDB):
         self.board = board
         self.__controller = controller
         self.__data_id = data_id
+        self.load()
+
+    def reopen(self,data_id,board,controller)->None:
+        """
+        Empties the fields and loads the data to modify.
+
+        :param data_id: The unique identifier for the data to be modified.
+        :param board: The board context relevant to this instance.
+        :param controller: The controller responsible for managing data operations.
+        :return: None
+        """
+        self.board = board
+        self.__controller = controller
+        self.__data_id = data_id
+        self.reset_fields()
+        self.load()
+
+    def load(self)->None:
+        """
+        Reads the data to modify in the background, the VALIDER button disabled until it arrives.
+
+        :return: None
+        """
         try:
-            data_old = self.__controller.get_one_data(data_id)
-            self.var_name.set(data_old.name)
-            self.var_username.set(data_old.username)
-            self.var_password.set(data_old.password)
-            self.var_source.set(data_old.source)
+            self.validate_button.configure(state="disabled")
+            future = self.__controller.submit(self.__controller.get_one_data, self.__data_id)
+            self.when_done(future, self._set_old_data, self._show_loading_error)
         except Exception as e:
+            self._show_loading_error(e)
+
+    def _set_old_data(self, data_old: Optional[Data])->None:
+        """
+        Fills the fields with the data to modify and enables the VALIDER button, or
+        hides the window if the data was deleted since it was selected.
+
+        :param data_old: The data read from the database, None if it no longer exists.
+        :return: None
+        """
+        if data_old is None:
             dialogs.Messagebox.show_error(
-                message=f"Une erreur est survenue lors de la récupération des données : {e}",
+                message="Cette donnée n'existe plus, elle a peut-être été supprimée",
                 title="Erreur",
                 parent=self
             )
-            self.destroy()
+            self.close()
+            return
+        self.var_name.set(data_old.name)
+        self.var_username.set(data_old.username)
+        self.var_password.set(reveal(data_old.password))
+        self.var_source.set(data_old.source)
+        self.validate_button.configure(state="normal")
+
+    def _show_loading_error(self, error: BaseException)->None:
+        """
+        Reports an error raised while reading the data to modify and hides the window.
+
+        :param error: The error raised.
+        :return: None
+        """
+        dialogs.Messagebox.show_error(
+            message=f"Une erreur est survenue lors de la récupération des données : {error}",
+            title="Erreur",
+            parent=self
+        )
+        self.close()
 
     def change_data(self)->None:
         """
         Attempts to update existing data within the system by invoking the appropriate
         controller function. The method gathers necessary input, validates the operation
         through the controller, and provides user feedback depending on the outcome.
+        The update runs in the background while the window shows a busy cursor.
         If the operation is successful, the data will be refreshed in the interface,
         and the current window will close. Otherwise, the user will be notified of the
         failure or any encountered errors.
@@ -57,40 +114,61 @@ class ChangeDataView(TopLevelValidateAndCancelForUseDB):
         :return: None
         """
         try:
-            if self.__controller.modif_data(
-                        data_id=self.__data_id,
-                        new_data=Data(
-                        name=self.var_name.get(),
-                        username=self.var_username.get(),
-                        password=self.var_password.get(),
-                        source=self.var_source.get()
-                    )
-            ):
-                dialogs.Messagebox.ok(
-                    message="Les informations ont bien été modifiées !",
-                    title="Information",
-                    parent=self
+            future = self.__controller.submit(
+                self.__controller.modif_data,
+                data_id=self.__data_id,
+                new_data=Data(
+                    name=self.var_name.get(),
+                    username=self.var_username.get(),
+                    password=self.var_password.get(),
+                    source=self.var_source.get()
                 )
-                self.board.refresh_data_board_from_db()
-                self.destroy()
-            else:
-                dialogs.Messagebox.show_warning(
-                    message="Les données n'ont pas été modifiées.",
-                    title="Attention",
-                    parent=self
-                )
-        except ValueError as ve:
+            )
+            self.validate_button.configure(state="disabled")
+            self.when_done(future, self._on_changed, self._show_error)
+        except Exception as e:
+            self._show_error(e)
+
+    def _on_changed(self, changed: bool)->None:
+        """
+        Reports the outcome of the modification and hides the window once it is stored.
+
+        :param changed: Whether the data was modified.
+        :return: None
+        """
+        self.validate_button.configure(state="normal")
+        if changed:
+            dialogs.Messagebox.ok(
+                message="Les informations ont bien été modifiées !",
+                title="Information",
+                parent=self
+            )
+            self.close()
+        else:
+            dialogs.Messagebox.show_warning(
+                message="Les données n'ont pas été modifiées.",
+                title="Attention",
+                parent=self
+            )
+
+    def _show_error(self, error: BaseException)->None:
+        """
+        Reports an error raised while modifying the data, including in the background.
+
+        :param error: The error raised.
+        :return: None
+        """
+        self.validate_button.configure(state="normal")
+        if isinstance(error, ValueError):
             dialogs.Messagebox.show_error(
-                message=f"Une erreur de validation est survenue : {ve}",
+                message=f"Une erreur de validation est survenue : {error}",
                 title="Erreur de validation",
                 parent=self
             )
-        except Exception as e:
+        else:
             dialogs.Messagebox.show_error(
-                message=f"Une erreur inattendue est survenue : {e}",
+                message=f"Une erreur inattendue est survenue : {error}",
                 title="Erreur",
                 parent=self
             )
-            print(f"Une erreur inattendue est survenue : {e}", file=sys.stderr)
-
-
+            print(f"Une erreur inattendue est survenue : {error}", file=sys.stderr)
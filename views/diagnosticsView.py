@@ -0,0 +1,135 @@
+"""
+__author__ = "Adrien Mertens"
+__version__ = "1.0"
+"""
+import sys
+import time
+import ttkbootstrap as ttk
+import ttkbootstrap.dialogs as dialogs
+
+
+class DiagnosticsView(ttk.Toplevel):
+    """
+    Hidden window displaying where the time of the data layer goes: the latency of each
+    query and controller operation, the slow queries and the connections opened. It is
+    opened with Ctrl+Shift+D from the main window and is not part of the menu.
+
+    Measures are only collected while the window is open: instrumentation is enabled
+    when it opens, unless it already was, and disabled again when it closes, so the
+    application runs without any measuring the rest of the time.
+    """
+    # Delay between two refreshes of the displayed measures
+    REFRESH_MS = 1000
+    # Number of slow queries displayed, the most recent first
+    SLOW_QUERIES_SHOWN = 20
+
+    def __init__(self, master, controller)->None:
+        """
+        Creates the window and enables instrumentation on the data layer of `controller`.
+
+        :param master: The parent window.
+        :param controller: The controller whose measures are displayed.
+        """
+        super().__init__(master)
+        self.title("Diagnostic")
+        self.place_window_center()
+        self.__controller = controller
+        self.__owns_instrumentation = controller.instrumentation is None
+        controller.enable_instrumentation()
+        self.var_connections = ttk.StringVar()
+        self.widgets()
+        self.protocol("WM_DELETE_WINDOW", self.close)
+        self.refresh()
+
+    def widgets(self)->None:
+        """
+        Creates the table of the operations, the list of the slow queries, the connection
+        counters and the buttons of the window.
+
+        :return: None
+        """
+        try:
+            columns = ("count", "mean", "p50", "p95", "p99", "max")
+            self.operations = ttk.Treeview(self, columns=columns, height=12)
+            self.operations.heading("#0", text="Opération")
+            self.operations.column("#0", width=220)
+            for column, text in zip(columns, ("Appels", "Moyenne (ms)", "p50 (ms)", "p95 (ms)", "p99 (ms)", "Max (ms)")):
+                self.operations.heading(column, text=text)
+                self.operations.column(column, width=90, anchor="e")
+            self.operations.pack(side="top", fill="both", expand=True, padx=10, pady=10)
+
+            ttk.Label(self, textvariable=self.var_connections).pack(side="top", fill="x", padx=10)
+
+            ttk.Label(self, text="Requêtes lentes :").pack(side="top", fill="x", padx=10, pady=(10, 0))
+            self.slow_queries = ttk.Text(self, height=8, width=100, state="disabled")
+            self.slow_queries.pack(side="top", fill="both", expand=True, padx=10, pady=5)
+
+            buttons = ttk.Frame(self)
+            buttons.pack(side="bottom", fill="x", padx=10, pady=10)
+            ttk.Button(buttons, text="RÉINITIALISER", command=self.reset).pack(side="left", expand=True, fill="x")
+            ttk.Button(buttons, text="FERMER", command=self.close).pack(side="left", expand=True, fill="x", padx=(10, 0))
+        except Exception as e:
+            dialogs.Messagebox.show_error(
+                message=f"Une erreur est survenue lors de la création des widgets : {e}",
+                title="Erreur",
+                parent=self
+            )
+            print(f"Une erreur est survenue lors de la création des widgets : {e}", file=sys.stderr)
+
+    def refresh(self)->None:
+        """
+        Displays the current measures, then schedules the next refresh.
+
+        :return: None
+        """
+        if not self.winfo_exists():
+            return
+        self.display()
+        self.after(self.REFRESH_MS, self.refresh)
+
+    def display(self)->None:
+        """
+        Displays the measures collected so far by the data layer.
+
+        :return: None
+        """
+        stats = self.__controller.stats()
+        self.operations.delete(*self.operations.get_children())
+        if not stats["enabled"]:
+            return
+        for name, summary in stats["operations"].items():
+            values = [summary["count"]] + [f"{summary[key] * 1000:.3f}" for key in ("mean", "p50", "p95", "p99", "max")]
+            self.operations.insert("", "end", text=name, values=values)
+        connections = stats["connections"]
+        self.var_connections.set(
+            f"Connexions ouvertes : {connections['opened']}, fermées : {connections['closed']}, "
+            f"dans le pool : {stats['pool']['opened']}/{stats['pool']['size']}"
+        )
+        lines = [f"{time.strftime('%H:%M:%S', time.localtime(slow['at']))}  {slow['operation']}  "
+                 f"{slow['seconds'] * 1000:.1f} ms  {slow['statement'] or ''}"
+                 for slow in reversed(stats["slow_queries"][-self.SLOW_QUERIES_SHOWN:])]
+        self.slow_queries.configure(state="normal")
+        self.slow_queries.delete("1.0", "end")
+        self.slow_queries.insert("1.0", "\n".join(lines))
+        self.slow_queries.configure(state="disabled")
+
+    def reset(self)->None:
+        """
+        Forgets the measures collected so far.
+
+        :return: None
+        """
+        instrumentation = self.__controller.instrumentation
+        if instrumentation is not None:
+            instrumentation.reset()
+        self.display()
+
+    def close(self)->None:
+        """
+        Disables instrumentation if this window enabled it, then closes the window.
+
+        :return: None
+        """
+        if self.__owns_instrumentation:
+            self.__controller.disable_instrumentation()
+        self.destroy()
@@ -0,0 +1,143 @@
+"""
+__author__ = "Adrien Mertens"
+__version__ = "1.0"
+"""
+import os
+import sys
+import threading
+import ttkbootstrap as ttk
+import ttkbootstrap.dialogs as dialogs
+from views.styles import ensure_styles
+from views.tkDispatcher import TkDispatcher
+
+
+class ImportView(ttk.Toplevel):
+    """
+    Window following the import of a CSV file exported by a browser or another password
+    manager. The import runs on a thread and a connection of its own, apart from the
+    database worker, so the other views keep reading and writing meanwhile; the window
+    displays its progress and throughput, and can stop it. The board is refreshed
+    once, when the import ends, rather than for every entry imported.
+
+    The import reports its progress from the worker thread: the last report is kept and
+    displayed every `REFRESH_MS` milliseconds, however often the import reports.
+    """
+    # Delay between two refreshes of the displayed progress
+    REFRESH_MS = 100
+
+    def __init__(self, master, controller, path: str)->None:
+        """
+        Creates the window and starts the import of `path`.
+
+        :param master: The parent window.
+        :param controller: The controller of the vault.
+        :param path: The path of the CSV file.
+        """
+        super().__init__(master)
+        ensure_styles(self)
+        self.title("Importation")
+        self.place_window_center()
+        self.__cancel = threading.Event()
+        self.__done = False
+        # Last progress reported by the import, replaced from the worker thread
+        self.__progress = None
+        self.var_file = ttk.StringVar(value=os.path.basename(path))
+        self.var_status = ttk.StringVar(value="Lecture du fichier…")
+        self.widgets()
+        self.protocol("WM_DELETE_WINDOW", self.close)
+        future = controller.submit_apart(controller.import_csv, path, progress=self._keep_progress,
+                                         cancel=self.__cancel)
+        TkDispatcher.of(self).when_done(future, self.finish, self._show_error, busy=self)
+        self.refresh()
+
+    def widgets(self)->None:
+        """
+        Creates the name of the file, the progress bar, the counters and the button of the window.
+
+        :return: None
+        """
+        try:
+            frame = ttk.Frame(self, style="AllFrame.TFrame")
+            frame.pack(side="top", fill="both", expand=True, padx=10, pady=10)
+            ttk.Label(frame, textvariable=self.var_file, style="Title.TLabel").pack(side="top", fill="x", padx=10,
+                                                                                   pady=(10, 5))
+            self.progress_bar = ttk.Progressbar(frame, maximum=100, length=360, mode="determinate")
+            self.progress_bar.pack(side="top", fill="x", padx=10, pady=5)
+            ttk.Label(frame, textvariable=self.var_status, style="Show.TLabel").pack(side="top", fill="x", padx=10,
+                                                                                    pady=(5, 10))
+            self.button = ttk.Button(self, text="ANNULER", command=self.close, style="CancelButton.TButton")
+            self.button.pack(side="bottom", fill="x", padx=10, pady=(0, 10))
+        except Exception as e:
+            dialogs.Messagebox.show_error(
+                message=f"Une erreur est survenue lors de la création des widgets : {e}",
+                title="Erreur",
+                parent=self
+            )
+            print(f"Une erreur est survenue lors de la création des widgets : {e}", file=sys.stderr)
+
+    def _keep_progress(self, stats)->None:
+        """Keeps the progress reported by the import, from the worker thread, for the next refresh."""
+        self.__progress = stats
+
+    def refresh(self)->None:
+        """
+        Displays the last progress reported, then schedules the next refresh until the import ends.
+
+        :return: None
+        """
+        if not self.winfo_exists() or self.__done:
+            return
+        if self.__progress is not None:
+            self.display(self.__progress)
+        self.after(self.REFRESH_MS, self.refresh)
+
+    def display(self, stats)->None:
+        """
+        Displays the progress of the import.
+
+        :param stats: The statistics of the import so far.
+        :return: None
+        """
+        self.progress_bar.configure(value=stats.fraction * 100)
+        self.var_status.set(
+            f"{stats.rows} lignes lues : {stats.inserted} ajoutées, {stats.duplicates} doublons, "
+            f"{stats.invalid} invalides, {stats.failed} en erreur — {stats.mb_per_second:.1f} Mo/s"
+        )
+
+    def finish(self, stats)->None:
+        """
+        Displays the outcome of the import, and turns the button into a close button.
+
+        :param stats: The statistics of the import.
+        :return: None
+        """
+        self.__done = True
+        self.display(stats)
+        if stats.cancelled:
+            self.var_status.set("Importation annulée. " + self.var_status.get())
+        self.button.configure(text="FERMER", command=self.destroy, style="ValidateButton.TButton")
+
+    def close(self)->None:
+        """
+        Stops the import if it runs, then closes the window. The entries already imported are kept.
+
+        :return: None
+        """
+        self.__cancel.set()
+        self.destroy()
+
+    def _show_error(self, error: BaseException)->None:
+        """
+        Reports an error raised by the import, such as a file without a password column.
+
+        :param error: The error raised.
+        :return: None
+        """
+        self.__done = True
+        dialogs.Messagebox.show_error(
+            message=f"Une erreur est survenue lors de l'importation : {error}",
+            title="Erreur",
+            parent=self
+        )
+        print(f"Une erreur est survenue lors de l'importation : {error}", file=sys.stderr)
+        self.destroy()
@@ -4,18 +4,22 @@ Version: 1.0
 """
 
 import sys
+import tkinter
 import ttkbootstrap as ttk
 import ttkbootstrap.dialogs as dialogs
 from views.menu import Menu
 from views.boardView import BoardView
-from controllers.controllersDatas import ControllersDatas
-from models.data import Datas
+from views.searchBar import SearchBar
+from views.unlockView import UnlockView
+from controllers.appService import AppService
 
 class MainWindow(ttk.Window):
     """
     Represents the main window of the application, managing its components, layout,
     and functionality. The class is responsible for initializing and rendering the
-    main user interface, including the treeview, menu, and their respective controllers.
+    main user interface, including the treeview, menu and search field, which all share
+    the controller of the application service. Ctrl+Z restores the entries deleted
+    last, and Ctrl+Shift+D opens the hidden diagnostics window of the data layer.
 
     The main window is centered on the screen, configured as non-resizable, and
     populated with data upon initialization. It ensures that appropriate error
@@ -28,49 +32,65 @@ class MainWindow(ttk.Window):
     :ivar menu: The menu displayed within the main application window, initializing
                 and controlling the menu interface.
     :type menu: Menu
+    :ivar search_bar: The search field filtering the treeview.
+    :type search_bar: SearchBar
     """
-    def __init__(self, title: str, datas: Datas)->None:
+    def __init__(self, title: str, service: AppService)->None:
         """
         Initializes the main application window and its components, including a
-        treeview and menu with their respective controllers. Handles initialization
+        treeview and menu sharing the controller of the application service. The window stays hidden
+        until the vault is unlocked with its master password, and closes if it is not. Handles initialization
         errors and ensures proper layout and functionality for the user interface.
         Centers the window on the screen, configures window properties such as
-        non-resizability, and sets the given title. Automatically refreshes the
-        data board on initialization by querying the database, and reports
-        any issues during this process or other stages of initialization.
+        non-resizability, and sets the given title. The data board is filled in the
+        background once the window has been drawn, so that the window appears
+        without waiting for the database; issues during this process or other
+        stages of initialization are reported.
 
         :param title: The title to be displayed on the application window.
         :type title: str
-        :param datas: An instance containing the data used to initialize
-                      the treeview and its controller.
-        :type datas: Datas
+        :param service: The application service whose controller is injected
+                        into every view.
+        :type service: AppService
         """
         try:
             super().__init__(themename="superhero")
             self.title(title)
             self.resizable(False, False)
             self.place_window_center()
-            # Initialize the treeview and its controller
+
+            # Ask for the master password before showing anything from the vault
+            self.withdraw()
+            unlock_view = UnlockView(self, service.controller)
+            self.wait_window(unlock_view)
+            if not unlock_view.unlocked:
+                self.destroy()
+                return
+            self.deiconify()
+
+            # Initialize the treeview with the shared controller
             self.treeview = BoardView(self)
-            self.treeview.controller = ControllersDatas(datas=datas)
-            self.treeview.grid(row=1, column=0, sticky='nsew', padx=10, pady=8)
-
-            # Refresh the data board from the database
-            try:
-                self.treeview.refresh_data_board_from_db()
-            except Exception as e:
-                dialogs.Messagebox.show_error(
-                    message=f"Une erreur est survenue lors du rafraîchissement des données : {e}",
-                    title="Erreur de rafraîchissement",
-                    parent=self
-                )
-                print(f"Une erreur est survenue lors du rafraîchissement des données : {e}", file=sys.stderr)
-
-            # Initialize the menu and its controller
+            self.treeview.controller = service.controller
+            self.treeview.grid(row=2, column=0, sticky='nsew', padx=10, pady=8)
+
+            # Initialize the menu with the shared controller, whose writes reach the treeview as change events
             self.menu = Menu(self, self.treeview)
-            self.menu.controller = ControllersDatas(datas=datas)
+            self.menu.controller = service.controller
             self.menu.grid(row=0, column=0, sticky='nsew', padx=10, pady=8)
 
+            # Initialize the search field filtering the treeview
+            self.search_bar = SearchBar(self, self.treeview)
+            self.search_bar.grid(row=1, column=0, sticky='nsew', padx=10)
+
+            # Undo of the last deletion, also offered by the menu, left to the text fields
+            self.bind("<Control-z>", self.undo_delete)
+
+            # Hidden shortcut opening the diagnostics of the data layer
+            self.bind("<Control-Shift-D>", lambda event: self.show_diagnostics(service))
+
+            # Fill the data board once the window has been drawn, so that it appears at once
+            self.after_idle(self.refresh_board)
+
         except Exception as e:
             dialogs.Messagebox.show_error(
                 message=f"Une erreur inattendue est survenue lors de l'initialisation de la fenêtre principale : {e}",
@@ -83,3 +103,43 @@ class MainWindow(ttk.Window):
             sys.exit(1)
 
         self.mainloop()
+
+    def undo_delete(self, event: tkinter.Event)->None:
+        """
+        Restores the entries deleted last on Ctrl+Z, unless the shortcut was typed in a
+        text field such as the search field, where it belongs to the field.
+
+        :param event: The key event.
+        :return: None
+        """
+        if isinstance(event.widget, (tkinter.Entry, tkinter.Text)):
+            return
+        self.menu.undo_delete()
+
+    def refresh_board(self)->None:
+        """
+        Loads the first rows of the data board from the database, in the background.
+        Called once the window has been drawn for the first time.
+
+        :return: None
+        """
+        try:
+            self.treeview.refresh_data_board_from_db()
+        except Exception as e:
+            dialogs.Messagebox.show_error(
+                message=f"Une erreur est survenue lors du rafraîchissement des données : {e}",
+                title="Erreur de rafraîchissement",
+                parent=self
+            )
+            print(f"Une erreur est survenue lors du rafraîchissement des données : {e}", file=sys.stderr)
+
+    def show_diagnostics(self, service: AppService)->None:
+        """
+        Opens the hidden diagnostics window, imported on first use.
+
+        :param service: The application service whose controller is measured.
+        :type service: AppService
+        :return: None
+        """
+        from views.diagnosticsView import DiagnosticsView
+        DiagnosticsView(self, service.controller)
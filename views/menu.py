@@ -4,9 +4,8 @@ Version: 1.0
 """
 import sys
 import ttkbootstrap as ttk
-from views.addDataView import AddDataView
-from views.changeDataView import ChangeDataView
-from views.showDataView import ShowDataView
+from views.tkDispatcher import TkDispatcher
+from views.styles import ensure_styles
 import ttkbootstrap.dialogs as dialogs
 
 class Menu(ttk.Frame):
@@ -20,6 +19,10 @@ class Menu(ttk.Frame):
     with a board object to manage data operations. Customizations and error handling are
     integral to its design, ensuring robustness and a smooth user experience.
 
+    The views opened by the buttons are only imported and built when first opened, so
+    that they do not slow down the start of the application, then hidden and shown again
+    instead of being rebuilt on every click.
+
     :ivar board: Represents the board object responsible for data management operations.
     :type board: Any
     :ivar __master: Refers to the parent container or window where the menu is placed.
@@ -48,28 +51,26 @@ class Menu(ttk.Frame):
         """
         Creates widget buttons with custom style and functionalities for a user interface.
 
-        This method defines a custom `ttk.Style` specifically for buttons and sets multiple
-        properties, such as background and foreground colors for the active and inactive states.
-        It configures a list of buttons with pre-defined labels and commands, packs them into
-        the user interface horizontally, and applies the custom styles. Additionally, it handles
-        exceptions to notify the user in case of widget creation errors.
+        The buttons use the `AllButton.TButton` style of the application (see
+        :func:`views.styles.ensure_styles`). This method configures a list of buttons with
+        pre-defined labels and commands, packs them into the user interface horizontally,
+        and applies the custom styles. Additionally, it handles exceptions to notify the
+        user in case of widget creation errors.
 
         :raises Exception: If an error occurs during the creation of the widgets.
         """
         try:
-            # Create a custom style for each button
-            style = ttk.Style()
-            style.configure('AllButton.TButton', borderwidth=1, relief="solid", bordercolor="#4e5d6c")
-            style.map('AllButton.TButton',
-                      background=[('active', '#ABB6C2'), ('!active', '#4e5d6c')],
-                      foreground=[('active', 'black'), ('!active', 'white')])
+            # Style of the buttons, defined once for the application
+            ensure_styles(self)
 
             # Button configurations
             buttons_config = [
                 ("AJOUTER", self.add_data),
                 ("MODIFIER", self.change_data_selected),
                 ("SUPPRIMER", self.delete_data_selected),
+                ("RESTAURER", self.undo_delete),
                 ("AFFICHER", self.show_data_selected),
+                ("IMPORTER", self.import_csv),
                 ("QUITTER", self.__master.quit)
             ]
 
@@ -86,15 +87,16 @@ class Menu(ttk.Frame):
 
     def add_data(self)->None:
         """
-        Handles the creation of an instance of the AddDataView class, linked to the specified master widget,
-        controller, and board. If an exception occurs during the process, it displays an error message through
+        Opens the AddDataView window, linked to the specified master widget, controller, and board,
+        built on first use and shown again afterwards. If an exception occurs during the process, it displays an error message through
         a dialog box and logs the error to the standard error output.
 
         :raises Exception: Captures any unexpected errors during the initialization of the AddDataView and
                            provides an error message indicating the issue.
         """
         try:
-            AddDataView(self.__master, self.__controller, self.board)
+            from views.addDataView import AddDataView
+            AddDataView.open(self.__master, controller=self.__controller, board=self.board)
         except Exception as e:
             dialogs.Messagebox.show_error(
                 message=f"Une erreur est survenue lors de l'ouverture de la vue d'ajout de données : {e}",
@@ -120,8 +122,9 @@ class Menu(ttk.Frame):
             selected_item = self.board.board.selection()
             if not selected_item:
                 raise IndexError("Aucune donnée sélectionnée")
-            ChangeDataView(master=self.__master, board=self.board, data_id=int(self.board.board.selection()[0]),
-                           controller=self.__controller)
+            from views.changeDataView import ChangeDataView
+            ChangeDataView.open(self.__master, data_id=int(self.board.board.selection()[0]), board=self.board,
+                                controller=self.__controller)
         except IndexError:
             dialogs.Messagebox.show_info(
                 message="Veuillez sélectionner un élément dans la liste",
@@ -139,9 +142,10 @@ class Menu(ttk.Frame):
 
     def delete_data_selected(self)->None:
         """
-        Deletes the currently selected data entry from a graphical list or table. This
-        function ensures that the user has selected an item and confirms their intent
-        to delete it before proceeding. If an error occurs during the process,
+        Deletes the currently selected data entries from a graphical list or table, all
+        of them in one transaction. This function ensures that the user has selected an
+        item and confirms their intent to delete it before proceeding. Deleted entries
+        can be restored with :meth:`undo_delete`. If an error occurs during the process,
         appropriate dialogs are displayed to inform the user.
 
         Raises:
@@ -164,8 +168,11 @@ class Menu(ttk.Frame):
             if confirm == "Oui":
                 selected_item = self.board.board.selection()
                 if selected_item:
-                    if self.__controller.delete_data(data_id=int(selected_item[0])):
-                        self.board.board.delete(selected_item)
+                    # The board removes the rows itself when notified of the deletions
+                    future = self.__controller.submit(self.__controller.delete_many,
+                                                      [int(item) for item in selected_item])
+                    TkDispatcher.of(self).when_done(future, lambda deleted: None, self._show_delete_error,
+                                                    busy=self.board.board)
         except IndexError:
             dialogs.Messagebox.show_info(
                 message="Veuillez sélectionner un élément dans la liste",
@@ -173,12 +180,65 @@ class Menu(ttk.Frame):
                 parent=self.__master
             )
         except Exception as e:
-            dialogs.Messagebox.show_error(
-                message=f"Une erreur est survenue lors de la suppression des données : {e}",
-                title="Erreur",
+            self._show_delete_error(e)
+
+    def _show_delete_error(self, error: BaseException)->None:
+        """
+        Reports an error raised while deleting data, including in the background.
+
+        :param error: The error raised.
+        :return: None
+        """
+        dialogs.Messagebox.show_error(
+            message=f"Une erreur est survenue lors de la suppression des données : {error}",
+            title="Erreur",
+            parent=self.__master
+        )
+        print(f"Une erreur est survenue lors de la suppression des données : {error}", file=sys.stderr)
+
+    def undo_delete(self)->None:
+        """
+        Restores the entries removed by the last deletion, in the background; the board
+        shows them again at their place as it is notified of them. Bound to Ctrl+Z in the
+        main window. Informs the user when there is nothing to restore.
+
+        :return: None
+        """
+        try:
+            future = self.__controller.submit(self.__controller.undo_last_delete)
+            TkDispatcher.of(self).when_done(future, self._on_restored, self._show_restore_error,
+                                            busy=self.board.board)
+        except Exception as e:
+            self._show_restore_error(e)
+
+    def _on_restored(self, restored: list)->None:
+        """
+        Tells the user when :meth:`undo_delete` found nothing to restore. The restored
+        entries reach the board as insertions, at their place.
+
+        :param restored: The ids of the restored entries.
+        :return: None
+        """
+        if not restored:
+            dialogs.Messagebox.show_info(
+                message="Aucune donnée supprimée à restaurer",
+                title="Attention",
                 parent=self.__master
             )
-            print(f"Une erreur est survenue lors de la suppression des données : {e}", file=sys.stderr)
+
+    def _show_restore_error(self, error: BaseException)->None:
+        """
+        Reports an error raised while restoring data, including in the background.
+
+        :param error: The error raised.
+        :return: None
+        """
+        dialogs.Messagebox.show_error(
+            message=f"Une erreur est survenue lors de la restauration des données : {error}",
+            title="Erreur",
+            parent=self.__master
+        )
+        print(f"Une erreur est survenue lors de la restauration des données : {error}", file=sys.stderr)
 
     def show_data_selected(self)->None:
         """
@@ -196,7 +256,8 @@ class Menu(ttk.Frame):
             selected_item = self.board.board.selection()
             if not selected_item:
                 raise IndexError("Aucune donnée sélectionnée")
-            ShowDataView(master=self.__master, board=self.board, controller=self.__controller)
+            from views.showDataView import ShowDataView
+            ShowDataView.open(self.__master, board=self.board, controller=self.__controller)
             self.board.board.selection_remove(selected_item)
         except IndexError:
             dialogs.Messagebox.show_info(
@@ -213,6 +274,32 @@ class Menu(ttk.Frame):
             print(f"Une erreur est survenue lors de l'ouverture de la vue d'affichage des données : {e}",
                   file=sys.stderr)
 
+    def import_csv(self)->None:
+        """
+        Asks for a CSV file exported by a browser or another password manager, then opens
+        the ImportView window, which imports it in the background and displays its progress.
+        Nothing happens if no file is chosen.
+
+        :return: None
+        """
+        try:
+            from tkinter import filedialog
+            path = filedialog.askopenfilename(
+                parent=self.__master,
+                title="Importer des mots de passe",
+                filetypes=[("Fichiers CSV", "*.csv"), ("Tous les fichiers", "*.*")]
+            )
+            if path:
+                from views.importView import ImportView
+                ImportView(self.__master, controller=self.__controller, path=path)
+        except Exception as e:
+            dialogs.Messagebox.show_error(
+                message=f"Une erreur est survenue lors de l'ouverture de la vue d'importation : {e}",
+                title="Erreur",
+                parent=self.__master
+            )
+            print(f"Une erreur est survenue lors de l'ouverture de la vue d'importation : {e}", file=sys.stderr)
+
     @property
     def controller(self)->object:
         """
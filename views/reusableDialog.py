@@ -0,0 +1,93 @@
+"""
+__author__ = "Adrien Mertens"
+__version__ = "1.0"
+"""
+from concurrent.futures import Future
+from typing import Any, Callable
+
+from views.tkDispatcher import TkDispatcher
+
+
+class ReusableDialog:
+    """
+    Mixin for the secondary windows of the application (`ttk.Toplevel` subclasses)
+    that are built once and then hidden and shown again, instead of rebuilding their
+    whole widget tree on every click.
+
+    A window is opened with :meth:`open`, which builds it the first time and calls
+    :meth:`reopen` on the instance kept by the parent window afterwards. Closing the
+    window with :meth:`close`, or from the title bar, only hides it. Results of calls
+    made while the window was shown are dropped if they arrive after it was closed
+    or opened again (see :meth:`when_done`).
+    """
+    # Number of times the window has been shown or closed
+    _session = 0
+
+    @classmethod
+    def open(cls, master, **kwargs) -> "ReusableDialog":
+        """
+        Shows the window of this class for `master`: the one already built, reset with
+        `kwargs`, or a new one built with them.
+
+        :param master: The parent window, which keeps the window once built.
+        :param kwargs: The arguments of the constructor, also given to :meth:`reopen`.
+        :return: The window shown.
+        """
+        dialogs = getattr(master, "_reusable_dialogs", None)
+        if dialogs is None:
+            dialogs = master._reusable_dialogs = {}
+        dialog = dialogs.get(cls)
+        if dialog is not None and dialog.winfo_exists():
+            dialog.show()
+            dialog.reopen(**kwargs)
+        else:
+            dialog = dialogs[cls] = cls(master, **kwargs)
+            if dialog.winfo_exists():
+                dialog.protocol("WM_DELETE_WINDOW", dialog.close)
+        return dialog
+
+    def reopen(self, **kwargs) -> None:
+        """
+        Resets the window for a new use, with the arguments given to :meth:`open`.
+        Subclasses override it to clear their fields and load their data.
+
+        :return: None
+        """
+
+    def show(self) -> None:
+        """
+        Shows the hidden window again, centered on the screen.
+
+        :return: None
+        """
+        self._session += 1
+        self.place_window_center()
+        self.deiconify()
+        self.lift()
+
+    def close(self) -> None:
+        """
+        Hides the window, ready to be shown again.
+
+        :return: None
+        """
+        self._session += 1
+        self.withdraw()
+
+    def when_done(self, future: Future, on_success: Callable[[Any], None],
+                  on_error: Callable[[BaseException], None]) -> None:
+        """
+        Like :meth:`TkDispatcher.when_done`, with the window shown as busy, but drops the
+        result when the window has been closed or opened again in the meantime.
+
+        :param future: The future of a call submitted to the database worker.
+        :param on_success: The callable receiving the result.
+        :param on_error: The callable receiving the exception.
+        :return: None
+        """
+        session = self._session
+
+        def current(callback: Callable[[Any], None]) -> Callable[[Any], None]:
+            return lambda value: callback(value) if session == self._session else None
+
+        TkDispatcher.of(self).when_done(future, current(on_success), current(on_error), busy=self)
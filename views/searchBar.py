@@ -0,0 +1,78 @@
+"""
+__author__ = "Adrien Mertens"
+__version__ = "1.0"
+"""
+import sys
+import ttkbootstrap as ttk
+import ttkbootstrap.dialogs as dialogs
+
+
+class SearchBar(ttk.Frame):
+    """
+    Represents a search field filtering the board as the user types. The search is
+    debounced: it only runs once the user has stopped typing for `DELAY_MS`
+    milliseconds, so a burst of keystrokes triggers a single query.
+
+    :ivar board: The board filtered by the search.
+    :type board: BoardView
+    :ivar var_query: The text typed in the search field.
+    :type var_query: ttk.StringVar
+    """
+    # Delay without typing before the search runs
+    DELAY_MS = 250
+    # Shorter queries match too many entries to be useful and show the whole listing
+    MIN_QUERY_LENGTH = 2
+
+    def __init__(self, master, board)->None:
+        """
+        Initializes the search field and binds it to the board it filters.
+
+        :param master: The parent container or window where the widget is placed.
+        :param board: The board filtered by the search.
+        """
+        super().__init__(master)
+        self.__master = master
+        self.board = board
+        self.var_query = ttk.StringVar()
+        self.__pending = None
+        self.widgets()
+        self.var_query.trace_add("write", self.on_query_changed)
+
+    def widgets(self)->None:
+        """
+        Creates the label and the entry of the search field.
+
+        :raises Exception: If an error occurs during the creation of the widgets.
+        """
+        try:
+            ttk.Label(self, text="Rechercher :").pack(side="left", padx=5)
+            entry = ttk.Entry(self, textvariable=self.var_query)
+            entry.pack(side="left", fill="x", expand=True, padx=5)
+            entry.bind("<Escape>", lambda event: self.var_query.set(""))
+        except Exception as e:
+            dialogs.Messagebox.show_error(
+                message=f"Une erreur est survenue lors de la création des widgets : {e}",
+                title="Erreur",
+                parent=self.__master
+            )
+            print(f"Une erreur est survenue lors de la création des widgets : {e}", file=sys.stderr)
+
+    def on_query_changed(self, *args)->None:
+        """
+        Restarts the debounce delay each time the text of the search field changes.
+
+        :return: None
+        """
+        if self.__pending is not None:
+            self.after_cancel(self.__pending)
+        self.__pending = self.after(self.DELAY_MS, self.search)
+
+    def search(self)->None:
+        """
+        Filters the board with the text of the search field.
+
+        :return: None
+        """
+        self.__pending = None
+        query = self.var_query.get().strip()
+        self.board.filter(query if len(query) >= self.MIN_QUERY_LENGTH else "")
@@ -5,14 +5,18 @@ __version__ = "1.0"
 import sys
 import ttkbootstrap as ttk
 import ttkbootstrap.dialogs as dialogs
+from models.crypto import reveal
+from views.reusableDialog import ReusableDialog
+from views.styles import ensure_styles
 
 
-class ShowDataView(ttk.Toplevel):
+class ShowDataView(ReusableDialog, ttk.Toplevel):
     def __init__(self, master, board,controller)->None:
         """
         Initializes the class instance, sets up the GUI window, initializes variables, and creates widgets.
         Attempts to set data based on the selected item in the provided data board. Handles potential
-        exceptions during data retrieval.
+        exceptions during data retrieval. The window is opened with :meth:`ReusableDialog.open`,
+        which shows the data selected in the board in the window built the first time.
 
         :param master: The parent widget or application window where this object is placed.
         :param board: The data board object which provides the selection for retrieval.
@@ -32,6 +36,28 @@ class ShowDataView(ttk.Toplevel):
         self.var_password = ttk.StringVar()
         self.var_source = ttk.StringVar()
         self.widgets()
+        self.load(board)
+
+    def reopen(self, board, controller)->None:
+        """
+        Empties the window and shows the data selected in the board.
+
+        :param board: The data board object which provides the selection for retrieval.
+        :param controller: The controller reading the data.
+        :return: None
+        """
+        self.__controller = controller
+        for var in (self.var_name, self.var_username, self.var_password, self.var_source):
+            var.set("")
+        self.load(board)
+
+    def load(self, board)->None:
+        """
+        Shows the data selected in the board, or hides the window if nothing is selected.
+
+        :param board: The data board object which provides the selection for retrieval.
+        :return: None
+        """
         try:
             self.set_data(int(board.board.selection()[0]))
         except IndexError:
@@ -40,7 +66,7 @@ class ShowDataView(ttk.Toplevel):
                 title="Erreur",
                 parent=self
             )
-            self.destroy()
+            self.close()
         except Exception as e:
             dialogs.Messagebox.show_error(
                 message=f"Une erreur est survenue lors de la récupération des données : {e}",
@@ -48,17 +74,17 @@ class ShowDataView(ttk.Toplevel):
                 parent=self
             )
             print(f"Une erreur est survenue lors de la récupération des données : {e}", file=sys.stderr)
-            self.destroy()
+            self.close()
 
 
     def widgets(self)->None:
         """
         Creates and configures GUI components for user interface interactions.
 
-        This function initializes and applies specific styles to various widgets
-        such as frames, labels, entries, and buttons, using the ttk.Style object.
-        It defines the layout structure by creating frames and placing labels,
-        entry fields, and a 'QUIT' button inside these frames. The entry fields
+        This function initializes various widgets such as frames, labels, entries,
+        and buttons, using the named styles of the application (see
+        :func:`views.styles.ensure_styles`). It defines the layout structure by creating
+        frames and placing labels, entry fields, and a 'QUIT' button inside these frames. The entry fields
         display read-only data based on the provided tkinter variable bindings.
 
         In case of any error during the widget creation or configuration process,
@@ -71,16 +97,7 @@ class ShowDataView(ttk.Toplevel):
         :return: None
         """
         try:
-            style = ttk.Style()
-            style.configure("AllFrame.TFrame", borderwidth=1, relief="solid", bordercolor="#323c46",
-                            background="#323c46")
-            style.configure("Show.TLabel", foreground="white", background="#323c46", font=('Helvetica', 10, 'bold'))
-            style.configure("Data.TLabel", foreground="white", background="#4c5966", font=('Helvetica', 10))
-
-            style.configure("CancelButton.TButton", borderwidth=1, relief="solid", bordercolor="#FF5722")
-            style.map("CancelButton.TButton",
-                      background=[('active', '#c8441a'), ('!active', '#fd531e')],
-                      foreground=[('active', 'white'), ('!active', 'white')])
+            ensure_styles(self)
 
             top_frame = ttk.Frame(self)
             top_frame.pack(side="top", padx=10, pady=10)
@@ -108,7 +125,7 @@ class ShowDataView(ttk.Toplevel):
             bottom_frame = ttk.Frame(self, style="AllFrame.TFrame")
             bottom_frame.pack(side="bottom", padx=10, pady=10, expand=True, fill="x")
             bottom_frame.columnconfigure(0, weight=1)
-            ttk.Button(bottom_frame, text="QUITTER", command=self.destroy, style="CancelButton.TButton").pack(
+            ttk.Button(bottom_frame, text="QUITTER", command=self.close, style="CancelButton.TButton").pack(
                 side="top", fill="x", expand=True)
         except Exception as e:
             dialogs.Messagebox.show_error(
@@ -121,7 +138,8 @@ class ShowDataView(ttk.Toplevel):
     def set_data(self,data_id:int)->None:
         """
         Updates the current instance with data retrieved using the provided data ID. It fetches
-        data through the internal controller and sets relevant instance variables. If an error
+        data through the internal controller, in the background while the window shows a busy
+        cursor, and sets relevant instance variables when it arrives. If an error
         occurs during data retrieval, it shows an error message dialog and logs the error to the
         standard error stream.
 
@@ -131,16 +149,43 @@ class ShowDataView(ttk.Toplevel):
         :rtype: None
         """
         try:
-            data = self.__controller.get_one_data(data_id=data_id)
-            self.var_name.set(data.name)
-            self.var_username.set(data.username)
-            self.var_password.set(data.password)
-            self.var_source.set(data.source)
-
+            future = self.__controller.submit(self.__controller.get_one_data, data_id=data_id)
+            self.when_done(future, self._show_data, self._show_error)
         except Exception as e:
+            self._show_error(e)
+
+    def _show_data(self, data)->None:
+        """
+        Displays the data read by :meth:`set_data`, or hides the window if the data was
+        deleted since it was selected.
+
+        :param data: The data read from the database, None if it no longer exists.
+        :type data: Optional[Data]
+        :return: None
+        """
+        if data is None:
             dialogs.Messagebox.show_error(
-                message=f"Une erreur est survenue lors de la récupération des données : {e}",
+                message="Cette donnée n'existe plus, elle a peut-être été supprimée",
                 title="Erreur",
                 parent=self
             )
-            print(f"Une erreur est survenue lors de la récupération des données : {e}", file=sys.stderr)
+            self.close()
+            return
+        self.var_name.set(data.name)
+        self.var_username.set(data.username)
+        self.var_password.set(reveal(data.password))
+        self.var_source.set(data.source)
+
+    def _show_error(self, error: BaseException)->None:
+        """
+        Reports an error raised while reading the data.
+
+        :param error: The error raised.
+        :return: None
+        """
+        dialogs.Messagebox.show_error(
+            message=f"Une erreur est survenue lors de la récupération des données : {error}",
+            title="Erreur",
+            parent=self
+        )
+        print(f"Une erreur est survenue lors de la récupération des données : {error}", file=sys.stderr)
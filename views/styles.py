@@ -0,0 +1,57 @@
+"""
+__author__ = "Adrien Mertens"
+__version__ = "1.0"
+"""
+import tkinter
+import ttkbootstrap as ttk
+
+
+def configure_styles(style: ttk.Style) -> None:
+    """
+    Defines every named style used by the views of the application.
+
+    :param style: The style of the application.
+    :return: None
+    """
+    # Frames and labels of the forms
+    style.configure("AllFrame.TFrame", borderwidth=1, relief="solid", bordercolor="#323c46", background="#323c46")
+    style.configure("Title.TLabel", foreground="white", background="#323c46", font=('Helvetica', 10, 'bold'))
+    style.configure("Show.TLabel", foreground="white", background="#323c46", font=('Helvetica', 10, 'bold'))
+    style.configure("Data.TLabel", foreground="white", background="#4c5966", font=('Helvetica', 10))
+    style.configure("TEntry", foreground="white", font=('Helvetica', 10))
+
+    # VALIDER and ANNULER / QUITTER buttons
+    style.configure("ValidateButton.TButton", borderwidth=1, relief="solid", bordercolor="#4CAF50")
+    style.map("ValidateButton.TButton",
+              background=[('active', '#45a049'), ('!active', '#53bf57')],
+              foreground=[('active', 'white'), ('!active', 'white')])
+    style.configure("CancelButton.TButton", borderwidth=1, relief="solid", bordercolor="#FF5722")
+    style.map("CancelButton.TButton",
+              background=[('active', '#c8441a'), ('!active', '#fd531e')],
+              foreground=[('active', 'white'), ('!active', 'white')])
+
+    # Buttons of the menu
+    style.configure('AllButton.TButton', borderwidth=1, relief="solid", bordercolor="#4e5d6c")
+    style.map('AllButton.TButton',
+              background=[('active', '#ABB6C2'), ('!active', '#4e5d6c')],
+              foreground=[('active', 'black'), ('!active', 'white')])
+
+    # Rows, header and states of the data board
+    style.configure("Treeview", foreground="white", font=('Helvetica', 10))
+    style.configure("Treeview.Heading", background="#4e5d6c", foreground="white", font=('Helvetica', 10, 'bold'))
+    style.map("Treeview", background=[('selected', '#2d3e4f'), ('active', '#3a4d5e')])
+
+
+def ensure_styles(widget: tkinter.Misc) -> None:
+    """
+    Defines the named styles of the application the first time it is called for the
+    application of `widget`, and does nothing afterwards, so that views can call it
+    every time they are built without reconfiguring the theme.
+
+    :param widget: Any widget of the application.
+    :return: None
+    """
+    root = widget._root()
+    if not getattr(root, "_styles_configured", False):
+        configure_styles(ttk.Style())
+        root._styles_configured = True
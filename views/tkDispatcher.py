@@ -0,0 +1,116 @@
+"""
+__author__ = "Adrien Mertens"
+__version__ = "1.0"
+"""
+import queue
+import sys
+import tkinter
+from concurrent.futures import Future
+from typing import Any, Callable, Optional
+
+
+class TkDispatcher:
+    """
+    Brings the results of the calls run by the database worker back to the Tk thread.
+    Tk widgets may only be touched from the thread running the main loop, so other
+    threads only queue callbacks, which the main loop runs every `POLL_MS`
+    milliseconds with `after()`.
+
+    There is one dispatcher per application, obtained with :meth:`of`.
+    """
+    # Delay between two runs of the queued callbacks, short enough to feel immediate
+    POLL_MS = 30
+    # Maximum number of callbacks run per poll, so that a burst never freezes the window
+    MAX_CALLBACKS_PER_POLL = 200
+
+    def __init__(self, root: tkinter.Tk) -> None:
+        """
+        Starts polling the queued callbacks on the main loop of `root`.
+
+        :param root: The root window of the application.
+        """
+        self.__root = root
+        self.__callbacks = queue.SimpleQueue()
+        # Number of pending calls per widget displayed as busy
+        self.__busy = {}
+        self.__root.after(self.POLL_MS, self._poll)
+
+    @classmethod
+    def of(cls, widget: tkinter.Misc) -> "TkDispatcher":
+        """
+        Returns the dispatcher of the application of `widget`, creating it on first use.
+
+        :param widget: Any widget of the application.
+        :return: The dispatcher of the application.
+        """
+        root = widget._root()
+        dispatcher = getattr(root, "_tk_dispatcher", None)
+        if dispatcher is None:
+            dispatcher = root._tk_dispatcher = cls(root)
+        return dispatcher
+
+    def call_soon(self, callback: Callable[..., Any], *args) -> None:
+        """
+        Queues `callback(*args)` to run on the Tk thread. Safe to call from any thread.
+
+        :param callback: The callable to run.
+        :return: None
+        """
+        self.__callbacks.put((callback, args))
+
+    def when_done(self, future: Future, on_success: Callable[[Any], None],
+                  on_error: Callable[[BaseException], None], busy: Optional[tkinter.Misc] = None) -> None:
+        """
+        Calls `on_success` with the result of `future`, or `on_error` with its exception,
+        on the Tk thread once the future is done. Until then `busy` shows a busy cursor.
+        Nothing is called when `busy` has been destroyed in the meantime.
+
+        :param future: The future of a call submitted to the database worker.
+        :param on_success: The callable receiving the result.
+        :param on_error: The callable receiving the exception.
+        :param busy: The widget displayed as busy while the call runs.
+        :return: None
+        """
+        if busy is not None:
+            self._set_busy(busy, 1)
+        future.add_done_callback(lambda done: self.call_soon(self._finish, done, on_success, on_error, busy))
+
+    def _finish(self, future: Future, on_success: Callable[[Any], None],
+                on_error: Callable[[BaseException], None], busy: Optional[tkinter.Misc]) -> None:
+        """Runs the callback matching the outcome of a finished future."""
+        if busy is not None:
+            if not busy.winfo_exists():
+                return
+            self._set_busy(busy, -1)
+        error = future.exception()
+        if error is None:
+            on_success(future.result())
+        else:
+            on_error(error)
+
+    def _set_busy(self, widget: tkinter.Misc, delta: int) -> None:
+        """Counts the pending calls of `widget` and shows the busy cursor while there are some."""
+        count = self.__busy.get(widget, 0) + delta
+        if count > 0:
+            self.__busy[widget] = count
+        else:
+            self.__busy.pop(widget, None)
+        widget.configure(cursor="watch" if count > 0 else "")
+
+    def _poll(self) -> None:
+        """
+        Runs up to `MAX_CALLBACKS_PER_POLL` queued callbacks, then schedules the next run:
+        right after the pending events of the window if callbacks remain, so that it keeps
+        responding while a backlog is worked through.
+        """
+        for _ in range(self.MAX_CALLBACKS_PER_POLL):
+            try:
+                callback, args = self.__callbacks.get_nowait()
+            except queue.Empty:
+                self.__root.after(self.POLL_MS, self._poll)
+                return
+            try:
+                callback(*args)
+            except Exception as e:
+                print(f"Une erreur est survenue lors du traitement d'un résultat : {e}", file=sys.stderr)
+        self.__root.after(1, self._poll)
@@ -5,14 +5,17 @@ __version__ = "1.0"
 import sys
 import ttkbootstrap as ttk
 import ttkbootstrap.dialogs as dialogs
+from views.reusableDialog import ReusableDialog
+from views.styles import ensure_styles
 
-class TopLevelValidateAndCancelForUseDB(ttk.Toplevel):
+class TopLevelValidateAndCancelForUseDB(ReusableDialog, ttk.Toplevel):
     def __init__(self,master,title:str,command_for_validateButton)->None:
         """
         Initializes a new instance of the class, setting up window configuration,
         creating and initializing variables, and preparing the widgets. Handles errors
         during initialization by displaying an error message and destroying the
-        instance.
+        instance. The window is meant to be opened with :meth:`ReusableDialog.open`:
+        ANNULER only hides it, and :meth:`reset_fields` prepares it for its next use.
 
         :param master: Parent widget for the top-level window.
         :type master: any
@@ -57,22 +60,8 @@ class TopLevelValidateAndCancelForUseDB(ttk.Toplevel):
         :return: None
         """
         try:
-            style = ttk.Style()
-            style.configure("AllFrame.TFrame", borderwidth=1, relief="solid", bordercolor="#323c46",
-                            background="#323c46")
-            style.configure("Title.TLabel", foreground="white", background="#323c46", font=('Helvetica', 10, 'bold'))
-            style.configure("TEntry", foreground="white", font=('Helvetica', 10))
-
-            # Configurer les styles pour les boutons VALIDER et ANNULER
-            style.configure("ValidateButton.TButton", borderwidth=1, relief="solid", bordercolor="#4CAF50")
-            style.map("ValidateButton.TButton",
-                      background=[('active', '#45a049'), ('!active', '#53bf57')],
-                      foreground=[('active', 'white'), ('!active', 'white')])
-
-            style.configure("CancelButton.TButton", borderwidth=1, relief="solid", bordercolor="#FF5722")
-            style.map("CancelButton.TButton",
-                      background=[('active', '#c8441a'), ('!active', '#fd531e')],
-                      foreground=[('active', 'white'), ('!active', 'white')])
+            # Styles des cadres, libellés et boutons, définis une seule fois pour l'application
+            ensure_styles(self)
 
             top_frame = ttk.Frame(self)
             top_frame.pack(side="top", padx=10, pady=10)
@@ -102,9 +91,10 @@ class TopLevelValidateAndCancelForUseDB(ttk.Toplevel):
             bottom_frame.columnconfigure(0, weight=1)
             bottom_frame.columnconfigure(1, weight=1)
 
-            ttk.Button(bottom_frame, text="VALIDER", command=self.validate,
-                                         style="ValidateButton.TButton").grid(row=0, column=0, padx=10, pady=10)
-            ttk.Button(bottom_frame, text="ANNULER", command=self.destroy,
+            self.validate_button = ttk.Button(bottom_frame, text="VALIDER", command=self.validate,
+                                              style="ValidateButton.TButton")
+            self.validate_button.grid(row=0, column=0, padx=10, pady=10)
+            ttk.Button(bottom_frame, text="ANNULER", command=self.close,
                                             style="CancelButton.TButton").grid(row=0, column=1, padx=10, pady=10)
         except Exception as e:
             dialogs.Messagebox.show_error(
@@ -114,6 +104,16 @@ class TopLevelValidateAndCancelForUseDB(ttk.Toplevel):
             )
             print(f"Une erreur est survenue lors de la création des widgets : {e}", file=sys.stderr)
 
+    def reset_fields(self)->None:
+        """
+        Empties the fields and enables the VALIDER button, before the window is used again.
+
+        :return: None
+        """
+        for var in (self.var_name, self.var_username, self.var_password, self.var_source):
+            var.set("")
+        self.validate_button.configure(state="normal")
+
     def validate(self)->None:
         """
         Validates the fields by calling the validation method and triggers further
@@ -124,7 +124,7 @@ class TopLevelValidateAndCancelForUseDB(ttk.Toplevel):
             validation process.
         """
         try:
-            if self.validate_fields():
+            if str(self.validate_button.cget("state")) != "disabled" and self.validate_fields():
                 self.__command_for_validateButton()
         except Exception as e:
             dialogs.Messagebox.show_error(
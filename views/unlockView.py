@@ -0,0 +1,155 @@
+"""
+__author__ = "Adrien Mertens"
+__version__ = "1.0"
+"""
+import sys
+import ttkbootstrap as ttk
+import ttkbootstrap.dialogs as dialogs
+from models.crypto import InvalidMasterPassword
+from views.styles import ensure_styles
+from views.tkDispatcher import TkDispatcher
+
+
+class UnlockView(ttk.Toplevel):
+    """
+    Represents the window asking for the master password before the main window opens.
+    When the vault has no master password yet, the window asks to create one, with a
+    confirmation field, and the existing passwords get encrypted with it.
+
+    :ivar unlocked: Whether the vault was unlocked before the window closed.
+    :type unlocked: bool
+    :ivar var_password: The master password typed by the user.
+    :type var_password: ttk.StringVar
+    :ivar var_confirmation: The confirmation of a new master password.
+    :type var_confirmation: ttk.StringVar
+    """
+    def __init__(self, master, controller)->None:
+        """
+        Initializes the window, in creation mode when the vault has no master password.
+
+        :param master: The parent widget for this window.
+        :type master: Any
+        :param controller: The controller used to unlock the vault.
+        :type controller: ControllersDatas
+        """
+        super().__init__(master)
+        self.title("Déverrouillage")
+        self.resizable(False, False)
+        self.place_window_center()
+        self.__controller = controller
+        self.__creation = not controller.has_master_password()
+        self.unlocked = False
+        # Whether a password is being checked, so that Return pressed twice checks it once
+        self.__checking = False
+        self.var_password = ttk.StringVar()
+        self.var_confirmation = ttk.StringVar()
+        self.widgets()
+        self.bind("<Return>", lambda event: self.validate())
+
+    def widgets(self)->None:
+        """
+        Creates the password fields and the VALIDER and QUITTER buttons.
+
+        :raises Exception: If an error occurs during the creation of the widgets.
+        :return: None
+        """
+        try:
+            ensure_styles(self)
+
+            top_frame = ttk.Frame(self)
+            top_frame.pack(side="top", padx=10, pady=10)
+
+            if self.__creation:
+                ttk.Label(top_frame, text="Choisissez le mot de passe maître qui protégera vos données.",
+                          wraplength=300).pack(side="top", pady=(0, 10))
+
+            password_frame = ttk.Frame(top_frame, style="AllFrame.TFrame")
+            password_frame.pack(side="top", expand=True, fill="x")
+            ttk.Label(password_frame, text="Mot de passe maître :", style="Title.TLabel").pack(side="left", padx=10, pady=10)
+            password_entry = ttk.Entry(password_frame, width=20, textvariable=self.var_password, show="•")
+            password_entry.pack(side="right", padx=10, pady=10)
+            password_entry.focus_set()
+
+            if self.__creation:
+                confirmation_frame = ttk.Frame(top_frame, style="AllFrame.TFrame")
+                confirmation_frame.pack(side="top", expand=True, fill="x")
+                ttk.Label(confirmation_frame, text="Confirmation :", style="Title.TLabel").pack(side="left", padx=10, pady=10)
+                ttk.Entry(confirmation_frame, width=20, textvariable=self.var_confirmation, show="•").pack(
+                    side="right", padx=10, pady=10)
+
+            bottom_frame = ttk.Frame(self, style="AllFrame.TFrame")
+            bottom_frame.pack(side="bottom", padx=10, pady=10, expand=True, fill="x")
+            bottom_frame.columnconfigure(0, weight=1)
+            bottom_frame.columnconfigure(1, weight=1)
+            ttk.Button(bottom_frame, text="VALIDER", command=self.validate,
+                       style="ValidateButton.TButton").grid(row=0, column=0, padx=10, pady=10)
+            ttk.Button(bottom_frame, text="QUITTER", command=self.destroy,
+                       style="CancelButton.TButton").grid(row=0, column=1, padx=10, pady=10)
+        except Exception as e:
+            dialogs.Messagebox.show_error(
+                message=f"Une erreur est survenue lors de la création des widgets : {e}",
+                title="Erreur",
+                parent=self
+            )
+            print(f"Une erreur est survenue lors de la création des widgets : {e}", file=sys.stderr)
+
+    def validate(self)->None:
+        """
+        Creates the master password or unlocks the vault with the typed password on the
+        database worker, since deriving the key takes a noticeable time, then closes the
+        window. A wrong or unconfirmed password keeps the window open.
+
+        :return: None
+        """
+        if self.__checking:
+            return
+        password = self.var_password.get()
+        if not password:
+            dialogs.Messagebox.show_warning(message="Le mot de passe maître est manquant", title="Attention", parent=self)
+            return
+        try:
+            controller = self.__controller
+            if self.__creation:
+                if password != self.var_confirmation.get():
+                    dialogs.Messagebox.show_warning(
+                        message="La confirmation ne correspond pas au mot de passe maître",
+                        title="Attention",
+                        parent=self
+                    )
+                    return
+                future = controller.submit(controller.set_master_password, password)
+            else:
+                future = controller.submit(controller.unlock, password)
+            self.__checking = True
+            TkDispatcher.of(self).when_done(future, self._on_unlocked, self._show_error, busy=self)
+        except Exception as e:
+            self._show_error(e)
+
+    def _on_unlocked(self, _result)->None:
+        """
+        Closes the window once the vault is unlocked.
+
+        :return: None
+        """
+        self.__checking = False
+        self.unlocked = True
+        self.destroy()
+
+    def _show_error(self, error: BaseException)->None:
+        """
+        Shows why the vault could not be unlocked, clearing a wrong password.
+
+        :param error: The exception raised while unlocking the vault.
+        :return: None
+        """
+        self.__checking = False
+        if isinstance(error, InvalidMasterPassword):
+            self.var_password.set("")
+            dialogs.Messagebox.show_error(message="Le mot de passe maître est incorrect", title="Erreur", parent=self)
+            return
+        dialogs.Messagebox.show_error(
+            message=f"Une erreur inattendue est survenue : {error}",
+            title="Erreur",
+            parent=self
+        )
+        print(f"Une erreur inattendue est survenue : {error}", file=sys.stderr)